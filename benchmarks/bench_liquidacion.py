@@ -0,0 +1,223 @@
+"""
+Benchmarks de las etapas del cálculo sobre nóminas sintéticas (``liquidacion.sinteticos``)
+y de los scripts ``pretensiones.py`` y ``pretensiones-lite.py`` sobre los datos reales.
+
+Para cada tamaño de tabla mide (mínimo de varias repeticiones, en segundos):
+- ``carga``: lectura y preprocesamiento del CSV (``datos.cargar_paystubs``).
+- ``carga_cache``: la misma carga desde la caché binaria ya escrita.
+- ``resumen_mensual``: ``mensual.resumen_mensual`` sobre toda la tabla.
+- ``ventanas``: ``ventanas.get_proportional_earnings_for_periods`` con 64 ventanas.
+- ``indice_diario``: construcción del ``IndiceDiario`` y 10.000 consultas.
+- ``validacion``: ``validacion.validar_paystubs`` de toda la tabla contra los contratos.
+- ``liquidacion``: ``calculo.calcular_pretensiones`` de un contrato.
+- ``incremental``: ``incremental.LiquidacionIncremental.agregar`` de un desprendible sobre el
+  estado de ese contrato (comparar con ``liquidacion``, que recalcula todo).
+- ``lote``: ``lote.ejecutar_lote`` de todos los empleados en el proceso actual.
+- ``bloques``: ``bloques.liquidar_por_bloques`` de todos los empleados leyendo el CSV por bloques.
+
+Los resultados se comparan con ``baseline.json``: una medición más lenta que la base por
+encima de ``--umbral`` (y por más de 10 ms) es una regresión y el proceso termina con código 1.
+Los tiempos de la base solo valen para la máquina donde se midieron: si el entorno (versiones,
+plataforma o núcleos) no coincide se advierte, y las mediciones sin base se listan aparte.
+La base se regenera con ``--guardar`` después de cambiar el motor o las etapas medidas.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_liquidacion                      # compara con la base
+    python -m benchmarks.bench_liquidacion --guardar            # reescribe la base
+    python -m benchmarks.bench_liquidacion --tamanos 100 10000000
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from liquidacion.bloques import liquidar_por_bloques
+from liquidacion.cache_paystubs import cargar_paystubs_con_cache
+from liquidacion.calculo import Contrato, calcular_pretensiones
+from liquidacion.datos import Desprendibles, cargar_paystubs, desprendibles_por_empleado
+from liquidacion.incremental import LiquidacionIncremental
+from liquidacion.indice_diario import IndiceDiario
+from liquidacion.lote import ejecutar_lote
+from liquidacion.mensual import resumen_mensual
+from liquidacion.sinteticos import generar_nomina
+from liquidacion.validacion import validar_paystubs
+from liquidacion.ventanas import a_numero_de_dia, get_proportional_earnings_for_periods
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+TAMANOS_DEFECTO = [100, 1_000, 10_000, 100_000]
+FECHA_CALCULO = datetime(2025, 5, 22)
+# Variaciones por debajo de este valor (segundos) se consideran ruido
+TOLERANCIA_ABSOLUTA = 0.01
+
+SCRIPTS = {
+    "pretensiones": ['pretensiones.py'],
+    "pretensiones_total_only": ['pretensiones.py', '--total-only'],
+    "pretensiones_lite": ['pretensiones-lite.py'],
+}
+
+
+def medir(funcion, repeticiones):
+    """Mínimo de ``repeticiones`` ejecuciones de ``funcion`` (segundos)."""
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def _fecha(dia):
+    return np.datetime64(int(dia), 'D').astype('datetime64[s]').item()
+
+
+def _ventanas_aleatorias(rng, desde, hasta, cantidad):
+    inicios = rng.integers(desde, hasta + 1, cantidad)
+    fines = np.minimum(inicios + rng.integers(0, 366, cantidad), hasta)
+    return [(_fecha(i), _fecha(f)) for i, f in zip(inicios, fines)]
+
+
+def bench_tamano(num_filas, repeticiones, carpeta):
+    """Mide todas las etapas sobre una nómina sintética de ``num_filas`` desprendibles."""
+    df_nomina, df_contratos = generar_nomina(num_filas, semilla=0)
+    ruta_csv = os.path.join(carpeta, f'nomina-{num_filas}.csv')
+    df_nomina.to_csv(ruta_csv, index=False)
+    silencio = lambda texto: None
+
+    resultados = {"carga": medir(lambda: cargar_paystubs(ruta_csv, advertir=silencio), repeticiones)}
+    cargar_paystubs_con_cache(ruta_csv, advertir=silencio) # Escribe la caché
+    resultados["carga_cache"] = medir(lambda: cargar_paystubs_con_cache(ruta_csv, advertir=silencio), repeticiones)
+
+    df_paystubs = cargar_paystubs(ruta_csv, advertir=silencio)
+    desde = int(a_numero_de_dia(df_paystubs['Period_Start_Date']).min())
+    hasta = int(a_numero_de_dia(df_paystubs['Period_End_Date']).max())
+    todo = Contrato(_fecha(desde), _fecha(hasta), 0, FECHA_CALCULO)
+    resultados["resumen_mensual"] = medir(lambda: resumen_mensual(df_paystubs, todo), repeticiones)
+
+    rng = np.random.default_rng(0)
+    ventanas = _ventanas_aleatorias(rng, desde, hasta, 64)
+    resultados["ventanas"] = medir(lambda: get_proportional_earnings_for_periods(df_paystubs, ventanas), repeticiones)
+    consultas = _ventanas_aleatorias(rng, desde, hasta, 10_000)
+    resultados["indice_diario"] = medir(
+        lambda: IndiceDiario.desde_paystubs(df_paystubs).get_proportional_earnings_for_periods(consultas), repeticiones)
+
+    df_paystubs['employee_id'] = df_paystubs['employee_id'].astype(str)
+    por_empleado = desprendibles_por_empleado(df_paystubs)
+    contratos = [Contrato(fila.fecha_inicio.to_pydatetime(), fila.fecha_fin.to_pydatetime(),
+                          int(fila.salario_base), FECHA_CALCULO, fila.employee_id)
+                 for fila in df_contratos.itertuples(index=False)]
+    trabajos = [(contrato, por_empleado[contrato.employee_id]) for contrato in contratos]
+    por_id = {contrato.employee_id: contrato for contrato in contratos}
+    resultados["validacion"] = medir(lambda: validar_paystubs(df_paystubs, contratos=por_id, advertir=silencio),
+                                     repeticiones)
+    resultados["liquidacion"] = medir(lambda: calcular_pretensiones(*trabajos[0]), repeticiones)
+    incremental = LiquidacionIncremental(trabajos[0][0])
+    incremental.agregar(trabajos[0][1], advertir=silencio)
+    ultimo = Desprendibles(*(arreglo[-1:] for arreglo in trabajos[0][1]))
+    resultados["incremental"] = medir(lambda: incremental.agregar(ultimo, advertir=silencio), repeticiones)
+    resultados["lote"] = medir(lambda: ejecutar_lote(trabajos, procesos=1), repeticiones)
+    resultados["bloques"] = medir(lambda: liquidar_por_bloques(contratos, ruta_csv, advertir=silencio), repeticiones)
+    return resultados
+
+
+def bench_scripts(repeticiones):
+    """Tiempo de pared de cada script (arranque en frío incluido) sobre ``paystubs-summary.csv``."""
+    resultados = {}
+    for nombre, argumentos in SCRIPTS.items():
+        comando = [sys.executable, *argumentos]
+        resultados[nombre] = medir(lambda: subprocess.run(comando, cwd=RAIZ, check=True, stdout=subprocess.DEVNULL),
+                                   repeticiones)
+    return resultados
+
+
+def entorno():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def sin_base(resultados, base):
+    """Mediciones de ``resultados`` que no están en la base, como ``grupo/medida``."""
+    return [f"{grupo}/{medida}" for grupo, medidas in resultados.items() for medida in medidas
+            if medida not in base.get(grupo, {})]
+
+
+def comparar(resultados, base, umbral):
+    """Devuelve las regresiones como ``(grupo, medida, base, actual)``."""
+    regresiones = []
+    for grupo, medidas in resultados.items():
+        for medida, actual in medidas.items():
+            anterior = base.get(grupo, {}).get(medida)
+            if anterior is not None and actual > anterior * umbral and actual - anterior > TOLERANCIA_ABSOLUTA:
+                regresiones.append((grupo, medida, anterior, actual))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del cálculo de liquidaciones.")
+    parser.add_argument('--tamanos', nargs='+', type=int, default=TAMANOS_DEFECTO,
+                        help="Número de desprendibles de cada nómina sintética")
+    parser.add_argument('--repeticiones', type=int, default=5, help="Repeticiones por medición (se toma el mínimo)")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Archivo JSON de la base")
+    parser.add_argument('--guardar', action='store_true', help="Guardar los resultados como nueva base")
+    parser.add_argument('--umbral', type=float, default=1.5, help="Factor de lentitud que cuenta como regresión")
+    parser.add_argument('--sin-scripts', action='store_true', help="No medir pretensiones.py ni pretensiones-lite.py")
+    args = parser.parse_args(argv)
+
+    resultados = {}
+    with tempfile.TemporaryDirectory() as carpeta:
+        for num_filas in args.tamanos:
+            resultados[f"filas_{num_filas}"] = bench_tamano(num_filas, args.repeticiones, carpeta)
+    if not args.sin_scripts:
+        resultados["scripts"] = bench_scripts(args.repeticiones)
+
+    for grupo, medidas in resultados.items():
+        print(f"--- {grupo} ---")
+        for medida, segundos in medidas.items():
+            print(f"  {medida:<25} {segundos * 1000:>12.2f} ms")
+
+    if args.guardar:
+        with open(args.baseline, 'w', encoding='utf-8') as archivo:
+            json.dump({"entorno": entorno(), "resultados": resultados}, archivo, indent=2)
+            archivo.write("\n")
+        print(f"Base guardada en '{args.baseline}'.")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No existe la base '{args.baseline}'. Ejecute con --guardar para crearla.")
+        return 0
+    with open(args.baseline, encoding='utf-8') as archivo:
+        contenido = json.load(archivo)
+    base = contenido["resultados"]
+    actual = entorno()
+    diferencias = [f"{clave}: {valor} -> {actual.get(clave)}" for clave, valor in contenido.get("entorno", {}).items()
+                   if valor != actual.get(clave)]
+    if diferencias:
+        print(f"Advertencia: La base se midió en otro entorno ({'; '.join(diferencias)}); "
+              "los tiempos no son comparables.")
+    faltantes = sin_base(resultados, base)
+    if faltantes:
+        print(f"Sin base (no se comparan): {', '.join(faltantes)}.")
+    regresiones = comparar(resultados, base, args.umbral)
+    for grupo, medida, anterior, actual in regresiones:
+        print(f"REGRESIÓN {grupo}/{medida}: {anterior * 1000:.2f} ms -> {actual * 1000:.2f} ms "
+              f"({actual / anterior:.2f}x)")
+    if not regresiones:
+        print("Sin regresiones respecto a la base.")
+    return 1 if regresiones else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
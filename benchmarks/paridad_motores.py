@@ -0,0 +1,544 @@
+"""
+Arnés diferencial: compara cada motor de cálculo con una referencia independiente, partida
+por partida, sobre nóminas sintéticas aleatorias (``liquidacion.sinteticos``), y los scripts
+``pretensiones.py`` y ``pretensiones-lite.py`` entre sí sobre los datos reales.
+
+Motores (todos deben dar el mismo valor al peso que la referencia):
+- ``fila_a_fila`` (referencia): recorre los desprendibles de cada ventana uno por uno con
+  fracciones exactas, como ``get_proportional_earnings_for_period`` del script original, y
+  evalúa las fórmulas de liquidación ventana por ventana sin ``IndiceDiario``,
+  ``AcumuladorPeriodos`` ni ``calculo.valores_liquidacion``.
+- ``escalar``: ``calculo.calcular_pretensiones`` contrato por contrato.
+- ``lote``: ``lote.ejecutar_lote`` en ``--procesos-lote`` procesos.
+- ``bloques``: ``bloques.liquidar_por_bloques`` leyendo el CSV por bloques.
+- ``incremental``: ``incremental.LiquidacionIncremental`` con los desprendibles en tres
+  entregas y la fecha de cálculo movida un mes hacia adelante.
+- ``escenarios``: ``escenarios.barrido_escenarios`` con el escenario del contrato.
+- ``curvas``: ``curvas.curva_pretensiones`` en la fecha de cálculo del contrato.
+- ``servicio``: ``servicio.ServicioPretensiones`` (sin HTTP), con sus cachés.
+
+Cada conjunto de datos se genera con su propia semilla (con periodos quincenales,
+mensuales e irregulares de 1 a 60 días) y se perturba al azar (desprendibles faltantes o
+duplicados, periodos partidos en dos parciales, salarios de diciembre en 0, terminación
+antes del último desprendible y fechas de cálculo dispersas, nunca antes de la
+terminación) para recorrer los caminos poco frecuentes. Los
+conjuntos se reparten entre ``--procesos`` procesos. Se compara cada columna de
+``calculo.resumen_pretensiones`` (las que produce cada motor) y se informan las
+discrepancias y el rendimiento (contratos por segundo) de cada motor lado a lado.
+
+Los scripts aplican reglas distintas a propósito: ``pretensiones-lite.py`` cuenta la mora
+en liquidación desde 15 días después de la terminación, calcula la sanción de cesantías con
+el salario contractual en lugar del de diciembre según los desprendibles, tiene fijos los
+periodos de este contrato (solo ``primas[2:]``, la proporcional, como no pagada) y usa otra
+fecha de cálculo. Sus diferencias se informan partida por partida junto con la causa, a la
+misma fecha de cálculo, y no cuentan como fallo.
+
+El proceso termina con código 1 si algún motor difiere de la referencia.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.paridad_motores --conjuntos 8 --filas 20000 --procesos 4
+    python -m benchmarks.paridad_motores --motores escalar lote bloques --sin-scripts
+"""
+import argparse
+import contextlib
+import io
+import math
+import os
+import runpy
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+
+from liquidacion.bloques import liquidar_por_bloques
+from liquidacion.cache_paystubs import cargar_desprendibles_con_cache
+from liquidacion.calculo import (Contrato, anio_sancion_cesantias, calcular_pretensiones, periodos_liquidacion,
+                                 pretensiones_desde_totales, resumen_pretensiones)
+from liquidacion.curvas import curva_pretensiones
+from liquidacion.datos import (EMPLOYEE_COL, Desprendibles, desprendibles_por_empleado,
+                               preprocesar_paystubs)
+from liquidacion.dinero import CENTAVOS_POR_PESO
+from liquidacion.ingesta_pdf import AMOUNT_COLUMNS
+from liquidacion.escenarios import barrido_escenarios
+from liquidacion.incremental import LiquidacionIncremental
+from liquidacion.lote import ejecutar_lote
+from liquidacion.parametros import (DIAS_ANIO, DIAS_MES, DIAS_VACACIONES, SMMLV, TASA_INTERESES_CESANTIAS,
+                                    TOPE_AUXILIO_SMMLV)
+from liquidacion.servicio import ServicioPretensiones
+from liquidacion.sinteticos import generar_nomina
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REFERENCIA = 'fila_a_fila'
+# Columnas de ``resumen_pretensiones`` que se comparan (las que no son datos del contrato)
+COLUMNAS_PARTIDAS = [
+    'primas_pagadas', 'prima_no_pagada', 'cesantias', 'intereses_cesantias', 'vacaciones',
+    'total_liquidacion_no_pagada', 'indemnizacion_mora_liquidacion', 'dias_mora_liquidacion',
+    'salario_diario_mora_liquidacion', 'sancion_mora_cesantias', 'anio_sancion_cesantias', 'dias_mora_cesantias',
+    'salario_diario_sancion_cesantias', 'indemnizacion_despido', 'total_indemnizaciones', 'total_pretensiones',
+]
+# Discrepancias de ejemplo que se guardan por (motor, columna)
+MAX_EJEMPLOS = 5
+
+
+def _silencio(texto):
+    pass
+
+
+# ============================
+# Conjuntos de datos
+# ============================
+
+def _texto_fechas(fechas):
+    return (fechas.dt.month.astype(str) + '/' + fechas.dt.day.astype(str) + '/' + fechas.dt.year.astype(str)).to_numpy()
+
+
+def _partir_periodos(df_nomina, rng, probabilidad):
+    """
+    Parte al azar desprendibles de más de un día en dos periodos parciales seguidos (como una
+    licencia a mitad de quincena), repartiendo cada monto en proporción a los días.
+    """
+    inicios = pd.to_datetime(df_nomina['pay_period_starts'], format='%m/%d/%Y').to_numpy()
+    fines = pd.to_datetime(df_nomina['pay_period_ends'], format='%m/%d/%Y').to_numpy()
+    dias = (fines - inicios).astype('timedelta64[D]').astype(np.int64) + 1
+    partido = (dias > 1) & (rng.random(len(df_nomina)) < probabilidad)
+    veces = np.where(partido, 2, 1)
+    # Cada periodo partido ocupa dos filas seguidas en la posición del original
+    df_nomina = df_nomina.iloc[np.repeat(np.arange(len(df_nomina)), veces)].reset_index(drop=True)
+    primera = (np.cumsum(veces) - veces)[partido]
+    segunda = primera + 1
+    dias_primera = rng.integers(1, dias[partido])
+    corte = pd.Series(inicios[partido] + dias_primera.astype('timedelta64[D]'))
+    df_nomina.loc[primera, 'pay_period_ends'] = _texto_fechas(corte - pd.Timedelta(days=1))
+    df_nomina.loc[segunda, 'pay_period_starts'] = _texto_fechas(corte)
+    for col in AMOUNT_COLUMNS:
+        montos = df_nomina[col].to_numpy()[primera]
+        parte = np.round(montos * dias_primera / dias[partido]).astype(np.int64)
+        df_nomina.loc[primera, col] = parte
+        df_nomina.loc[segunda, col] = montos - parte
+    return df_nomina
+
+
+def generar_caso(semilla, num_filas, carpeta):
+    """
+    Nómina sintética perturbada de la ``semilla``, escrita como CSV en ``carpeta``. Devuelve
+    ``(contratos, por_empleado, ruta_csv)``.
+    """
+    rng = np.random.default_rng(semilla)
+    df_nomina, df_contratos = generar_nomina(num_filas, semilla=semilla)
+
+    # Desprendibles faltantes (huecos) y duplicados
+    filas = len(df_nomina)
+    conservar = rng.random(filas) >= 0.02
+    duplicar = np.flatnonzero(conservar & (rng.random(filas) < 0.01))
+    df_nomina = pd.concat([df_nomina[conservar], df_nomina.iloc[duplicar]], ignore_index=True)
+    df_nomina = _partir_periodos(df_nomina, rng, 0.02)
+    # Salario base en 0 en algunos desprendibles y en todo diciembre de algunos empleados
+    # (licencia no remunerada), que obliga a usar el promedio de cesantías en la sanción
+    df_nomina.loc[rng.random(len(df_nomina)) < 0.01, 'base_salary'] = 0
+    sin_diciembre = df_contratos[EMPLOYEE_COL][rng.random(len(df_contratos)) < 0.1]
+    en_diciembre = df_nomina['pay_period_starts'].str.startswith('12/')
+    df_nomina.loc[en_diciembre & df_nomina[EMPLOYEE_COL].isin(sin_diciembre), 'base_salary'] = 0
+
+    fechas_inicio = pd.to_datetime(df_contratos['fecha_inicio'])
+    fechas_fin = pd.to_datetime(df_contratos['fecha_fin'])
+    # Algunos contratos terminan antes de su último desprendible
+    recorte = pd.to_timedelta(np.where(rng.random(len(df_contratos)) < 0.1, rng.integers(1, 90, len(df_contratos)), 0),
+                              unit='D')
+    fechas_fin = np.maximum(fechas_fin - recorte, fechas_inicio)
+    # La fecha de cálculo nunca es anterior a la terminación
+    dias_calculo = rng.integers(0, 3 * 365, len(df_contratos))
+
+    ruta_csv = os.path.join(carpeta, f'nomina-{semilla}.csv')
+    df_nomina.to_csv(ruta_csv, index=False)
+    df_paystubs = preprocesar_paystubs(pd.read_csv(ruta_csv, dtype={EMPLOYEE_COL: str}), advertir=_silencio)
+    por_empleado = desprendibles_por_empleado(df_paystubs)
+    contratos = [Contrato(inicio.to_pydatetime(), fin.to_pydatetime(), int(salario),
+                          (fin + timedelta(days=int(dias))).to_pydatetime(), empleado)
+                 for empleado, inicio, fin, salario, dias in zip(df_contratos[EMPLOYEE_COL], fechas_inicio, fechas_fin,
+                                                                 df_contratos['salario_base'], dias_calculo)]
+    return contratos, por_empleado, ruta_csv
+
+
+# ============================
+# Motores
+# ============================
+# Cada motor recibe ``(contratos, por_empleado, ruta_csv, opciones)`` y devuelve una fila
+# (diccionario con columnas de ``COLUMNAS_PARTIDAS``) por contrato, en el mismo orden.
+
+def _vacios():
+    vacio = np.zeros(0, dtype=np.int64)
+    return Desprendibles(vacio, vacio, vacio, vacio, vacio)
+
+
+# ----------------------------
+# Referencia fila por fila
+# ----------------------------
+# Independiente de ``IndiceDiario``, ``AcumuladorPeriodos`` y ``valores_liquidacion``: recorre
+# los desprendibles de cada ventana uno por uno, como ``get_proportional_earnings_for_period``
+# del script original, pero con fracciones exactas en lugar de floats, y aplica las fórmulas
+# de liquidación con los puntos de redondeo documentados en ``dinero`` usando solo ``round``
+# de Python (mitad al par) y la mitad hacia arriba al peso. De ``calculo`` solo comparte los
+# periodos de cada prestación y las sanciones, que no dependen de los totales por ventana.
+
+_EPOCA = date(1970, 1, 1)
+
+
+def _numero_de_dia(fecha):
+    return (fecha.date() if isinstance(fecha, datetime) else fecha).toordinal() - _EPOCA.toordinal()
+
+
+def _centavos(valor):
+    """Fracción de pesos a centavos, mitad al par (``round`` de Python sobre ``Fraction``)."""
+    return round(Fraction(valor) * CENTAVOS_POR_PESO)
+
+
+def _a_pesos(centavos):
+    """Centavos a pesos, mitad hacia arriba."""
+    return math.floor(Fraction(centavos, CENTAVOS_POR_PESO) + Fraction(1, 2))
+
+
+def ganancias_periodo_fila_a_fila(filas, inicio, fin):
+    """
+    Totales pro rata exactos (``Fraction`` en pesos) de base, extras y auxilio de la ventana
+    ``(inicio, fin)`` (números de día), recorriendo ``filas`` ``(inicio, fin, base, extras,
+    aux)`` como el ``get_proportional_earnings_for_period`` original.
+    """
+    total_base = total_extras = total_aux = Fraction(0)
+    for ps_inicio, ps_fin, base, extras, aux in filas:
+        solape_inicio, solape_fin = max(inicio, ps_inicio), min(fin, ps_fin)
+        if solape_inicio <= solape_fin:
+            dias_solape = solape_fin - solape_inicio + 1
+            dias_desprendible = ps_fin - ps_inicio + 1
+            if dias_desprendible <= 0:
+                continue
+            proporcion = Fraction(dias_solape, dias_desprendible)
+            total_base += base * proporcion
+            total_extras += extras * proporcion
+            total_aux += aux * proporcion
+    return total_base, total_extras, total_aux
+
+
+def _dias_comerciales(inicio, fin):
+    """Días de ``(inicio, fin)`` con meses de 30 días y el último día del mes como el 30."""
+    inicio, fin = _EPOCA + timedelta(days=inicio), _EPOCA + timedelta(days=fin)
+    dia_inicio = min(inicio.day, DIAS_MES)
+    dia_fin = DIAS_MES if (fin + timedelta(days=1)).month != fin.month else min(fin.day, DIAS_MES)
+    meses = (fin.year - inicio.year) * 12 + fin.month - inicio.month
+    return max(meses * DIAS_MES + dia_fin - dia_inicio + 1, 0)
+
+
+def _auxilio_elegible(base, inicio, fin):
+    """Salario base mensual (por días calendario o comerciales) de hasta dos mínimos al cierre."""
+    if not SMMLV.cubre(fin):
+        return True
+    tope = SMMLV.vigente(fin) * TOPE_AUXILIO_SMMLV * CENTAVOS_POR_PESO
+    dias = max(fin - inicio + 1, 1), max(_dias_comerciales(inicio, fin), 1)
+    return any(Fraction(base * DIAS_MES, d) <= tope for d in dias)
+
+
+def valores_ventana(filas, inicio, fin, incluir_extras=True, incluir_aux=True):
+    """
+    Totales en centavos y valores en pesos (prima o cesantías, intereses y vacaciones) de una
+    ventana, con la misma forma que una posición de ``totales_centavos``/``valores_liquidacion``.
+    """
+    base, extras, aux = (_centavos(total) for total in ganancias_periodo_fila_a_fila(filas, inicio, fin))
+    dias = max(fin - inicio + 1, 0)
+    if incluir_aux and not _auxilio_elegible(base, inicio, fin):
+        aux = 0
+    total = base + (extras if incluir_extras else 0) + (aux if incluir_aux else 0)
+    # (Promedio mensual) * días / 360, sin redondear el promedio por separado
+    prestacion = round(Fraction(total * DIAS_MES * dias, max(dias, 1) * DIAS_ANIO))
+    tasa = Fraction(str(TASA_INTERESES_CESANTIAS.vigente(fin)))
+    intereses = round(prestacion * tasa * Fraction(dias, DIAS_ANIO))
+    vacaciones = round(Fraction(base * DIAS_MES * dias, max(dias, 1) * DIAS_VACACIONES))
+    totales = {"base": base, "extras": extras, "aux": aux, "dias": dias}
+    valores = {"prestacion": _a_pesos(prestacion), "intereses": _a_pesos(intereses),
+               "vacaciones": _a_pesos(vacaciones)}
+    return totales, valores
+
+
+def pretensiones_fila_a_fila(contrato, desprendibles):
+    """``calcular_pretensiones`` con los totales y valores de ``valores_ventana``."""
+    filas = list(zip(*(columna.tolist() for columna in desprendibles)))
+    primas, cesantias, ventanas = periodos_liquidacion(contrato)
+    por_ventana = [valores_ventana(filas, _numero_de_dia(inicio), _numero_de_dia(fin)) for inicio, fin in ventanas]
+    totales = {clave: np.array([t[clave] for t, _ in por_ventana], dtype=np.int64)
+               for clave in ("base", "extras", "aux", "dias")}
+    valores = {clave: np.array([v[clave] for _, v in por_ventana], dtype=np.int64)
+               for clave in ("prestacion", "intereses", "vacaciones")}
+    anio = anio_sancion_cesantias(contrato)
+    diciembre = (0, False)
+    if anio is not None:
+        en_diciembre = [base for inicio, _, base, _, _ in filas
+                        if (_EPOCA + timedelta(days=inicio)).timetuple()[:2] == (anio, 12)]
+        diciembre = (sum(en_diciembre), bool(en_diciembre))
+    return pretensiones_desde_totales(contrato, primas, cesantias, totales, diciembre, valores=valores)
+
+
+def motor_fila_a_fila(contratos, por_empleado, ruta_csv, opciones):
+    return [resumen_pretensiones(c, pretensiones_fila_a_fila(c, por_empleado.get(c.employee_id) or _vacios()))
+            for c in contratos]
+
+
+def motor_escalar(contratos, por_empleado, ruta_csv, opciones):
+    return [resumen_pretensiones(c, calcular_pretensiones(c, por_empleado.get(c.employee_id) or _vacios()))
+            for c in contratos]
+
+
+def motor_lote(contratos, por_empleado, ruta_csv, opciones):
+    trabajos = [(c, por_empleado.get(c.employee_id) or _vacios()) for c in contratos]
+    filas, _ = ejecutar_lote(trabajos, procesos=opciones["procesos_lote"])
+    return filas
+
+
+def motor_bloques(contratos, por_empleado, ruta_csv, opciones):
+    resultados, _ = liquidar_por_bloques(contratos, ruta_csv, filas_por_bloque=opciones["filas_por_bloque"],
+                                         advertir=_silencio)
+    return [resumen_pretensiones(c, r) for c, r in zip(contratos, resultados)]
+
+
+def motor_incremental(contratos, por_empleado, ruta_csv, opciones):
+    filas = []
+    for contrato in contratos:
+        desprendibles = por_empleado.get(contrato.employee_id) or _vacios()
+        liquidacion = LiquidacionIncremental(Contrato(contrato.fecha_inicio, contrato.fecha_fin, contrato.salario_base,
+                                                      contrato.fecha_calculo - timedelta(days=30),
+                                                      contrato.employee_id))
+        for parte in np.array_split(np.arange(len(desprendibles.inicios)), 3):
+            liquidacion.agregar(Desprendibles(*(arreglo[parte] for arreglo in desprendibles)), advertir=_silencio)
+        liquidacion.mover_fecha_calculo(contrato.fecha_calculo)
+        filas.append(resumen_pretensiones(liquidacion.contrato, liquidacion.resultado))
+    return filas
+
+
+def motor_escenarios(contratos, por_empleado, ruta_csv, opciones):
+    filas = []
+    for contrato in contratos:
+        df_escenario = barrido_escenarios(contrato.fecha_inicio, por_empleado.get(contrato.employee_id) or _vacios(),
+                                          [contrato.fecha_fin], [contrato.salario_base], [contrato.fecha_calculo],
+                                          advertir=_silencio)
+        filas.append(df_escenario.iloc[0].to_dict())
+    return filas
+
+
+def motor_curvas(contratos, por_empleado, ruta_csv, opciones):
+    filas = []
+    for contrato in contratos:
+        df_curva = curva_pretensiones(contrato, por_empleado.get(contrato.employee_id) or _vacios(),
+                                      [contrato.fecha_calculo], advertir=_silencio)
+        filas.append(df_curva.iloc[0].to_dict())
+    return filas
+
+
+def motor_servicio(contratos, por_empleado, ruta_csv, opciones):
+    servicio = ServicioPretensiones(ruta_csv, advertir=_silencio)
+    filas = []
+    for contrato in contratos:
+        respuesta = servicio.calcular({"inicio": contrato.fecha_inicio.strftime('%Y-%m-%d'),
+                                       "fin": contrato.fecha_fin.strftime('%Y-%m-%d'),
+                                       "salario": contrato.salario_base, "employee_id": contrato.employee_id,
+                                       "fecha_calculo": contrato.fecha_calculo.strftime('%Y-%m-%d')})
+        filas.append(resumen_pretensiones(contrato, respuesta))
+    return filas
+
+
+MOTORES = {
+    "fila_a_fila": motor_fila_a_fila,
+    "escalar": motor_escalar,
+    "lote": motor_lote,
+    "bloques": motor_bloques,
+    "incremental": motor_incremental,
+    "escenarios": motor_escenarios,
+    "curvas": motor_curvas,
+    "servicio": motor_servicio,
+}
+
+
+# ============================
+# Comparación
+# ============================
+
+def _valor(valor):
+    """Valor comparable: enteros de Python y ``None`` para los vacíos (NaN, NA)."""
+    if valor is None or (not isinstance(valor, str) and pd.isna(valor)):
+        return None
+    return int(valor)
+
+
+def comparar_filas(referencia, filas, contratos, semilla):
+    """Discrepancias ``{columna: (cantidad, ejemplos)}`` de ``filas`` frente a ``referencia``."""
+    discrepancias = {}
+    for contrato, fila_referencia, fila in zip(contratos, referencia, filas):
+        for columna in COLUMNAS_PARTIDAS:
+            if columna not in fila:
+                continue
+            esperado, obtenido = _valor(fila_referencia[columna]), _valor(fila[columna])
+            if esperado != obtenido:
+                cantidad, ejemplos = discrepancias.get(columna, (0, []))
+                if len(ejemplos) < MAX_EJEMPLOS:
+                    ejemplos.append({"semilla": semilla, "employee_id": contrato.employee_id,
+                                     "referencia": esperado, "motor": obtenido})
+                discrepancias[columna] = (cantidad + 1, ejemplos)
+    if len(filas) != len(referencia):
+        discrepancias["filas"] = (abs(len(filas) - len(referencia)), [])
+    return discrepancias
+
+
+def evaluar_conjunto(trabajo):
+    """Genera un conjunto, ejecuta los motores y los compara con la referencia (proceso de trabajo)."""
+    semilla, num_filas, motores, opciones = trabajo
+    with tempfile.TemporaryDirectory() as carpeta:
+        contratos, por_empleado, ruta_csv = generar_caso(semilla, num_filas, carpeta)
+        salida = {"contratos": len(contratos), "motores": {}}
+        referencia = None
+        for nombre in [REFERENCIA, *(m for m in motores if m != REFERENCIA)]:
+            inicio = time.perf_counter()
+            filas = MOTORES[nombre](contratos, por_empleado, ruta_csv, opciones)
+            segundos = time.perf_counter() - inicio
+            if referencia is None:
+                referencia = filas
+            salida["motores"][nombre] = {"segundos": segundos,
+                                         "discrepancias": comparar_filas(referencia, filas, contratos, semilla)}
+    return salida
+
+
+def combinar(salidas):
+    """Suma los tiempos y las discrepancias de todos los conjuntos por motor."""
+    contratos = sum(s["contratos"] for s in salidas)
+    motores = {}
+    for salida in salidas:
+        for nombre, medida in salida["motores"].items():
+            total = motores.setdefault(nombre, {"segundos": 0.0, "discrepancias": {}})
+            total["segundos"] += medida["segundos"]
+            for columna, (cantidad, ejemplos) in medida["discrepancias"].items():
+                acumulado = total["discrepancias"].setdefault(columna, [0, []])
+                acumulado[0] += cantidad
+                acumulado[1].extend(ejemplos[:MAX_EJEMPLOS - len(acumulado[1])])
+    return contratos, motores
+
+
+def tabla_motores(contratos, motores):
+    referencia = motores[REFERENCIA]["segundos"]
+    lineas = [f"{'Motor':<14}{'Contratos':>10}{'Segundos':>11}{'Contratos/s':>13}{'vs ref.':>12}"
+              f"{'Discrepancias':>15}"]
+    for nombre, medida in motores.items():
+        segundos = medida["segundos"]
+        discrepancias = sum(cantidad for cantidad, _ in medida["discrepancias"].values())
+        lineas.append(f"{nombre:<14}{contratos:>10}{segundos:>11.3f}{contratos / max(segundos, 1e-9):>13.1f}"
+                      f"{referencia / max(segundos, 1e-9):>11.2f}x{discrepancias:>15}")
+    for nombre, medida in motores.items():
+        for columna, (cantidad, ejemplos) in medida["discrepancias"].items():
+            lineas.append(f"DISCREPANCIA {nombre}/{columna}: {cantidad} contrato(s)")
+            lineas.extend(f"  semilla {e['semilla']} {e['employee_id']}: referencia {e['referencia']}, "
+                          f"motor {e['motor']}" for e in ejemplos)
+    return "\n".join(lineas)
+
+
+# ============================
+# pretensiones.py frente a pretensiones-lite.py
+# ============================
+
+# Causa conocida de cada diferencia entre los scripts
+CAUSAS_LITE = {
+    "indemnizacion_mora_liquidacion": "lite cuenta la mora desde la terminación + 15 días",
+    "sancion_mora_cesantias": "lite usa el salario contractual; el completo, el de diciembre según los desprendibles",
+    "prima_no_pagada": "lite tiene fijos los semestres de este contrato y suma primas[2:]",
+}
+
+
+def comparar_scripts():
+    """
+    Partidas de ``pretensiones.py`` (vía ``calcular_pretensiones`` con su contrato) y de
+    ``pretensiones-lite.py`` (ejecutado en este proceso) a la fecha de cálculo del lite.
+    Devuelve ``(filas, fecha_lite, fecha_completo)``.
+    """
+    directorio = os.getcwd()
+    os.chdir(RAIZ)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            lite = runpy.run_path(os.path.join(RAIZ, 'pretensiones-lite.py'))
+        completo = runpy.run_path(os.path.join(RAIZ, 'pretensiones.py'), run_name='pretensiones')
+        desprendibles = cargar_desprendibles_con_cache(completo["PAYSTUBS_CSV_FILE"], advertir=_silencio)
+    finally:
+        os.chdir(directorio)
+
+    contrato = Contrato(completo["FECHA_INICIO_CONTRATO"], completo["FECHA_FIN_CONTRATO"],
+                        completo["SALARIO_BASE_CONTRACTUAL"], lite["fecha_actual"])
+    fila = resumen_pretensiones(contrato, calcular_pretensiones(contrato, desprendibles))
+    valores_lite = {
+        "prima_no_pagada": sum(lite["primas"][2:]),
+        "cesantias": sum(lite["cesantias"]),
+        "intereses_cesantias": sum(lite["intereses"]),
+        "vacaciones": lite["vacaciones"],
+        "indemnizacion_mora_liquidacion": lite["indem_mora_liquidacion"],
+        "sancion_mora_cesantias": lite["sancion_cesantias"],
+        "indemnizacion_despido": lite["indem_despido"],
+        "total_pretensiones": lite["monto_total"],
+    }
+    filas = [{"partida": partida, "completo": int(fila[partida]), "lite": int(valor),
+              "diferencia": int(valor) - int(fila[partida]), "causa": CAUSAS_LITE.get(partida, "")}
+             for partida, valor in valores_lite.items()]
+    return filas, lite["fecha_actual"], completo["FECHA_ACTUAL_CALCULO"]
+
+
+def tabla_scripts(filas, fecha_lite, fecha_completo):
+    lineas = [f"--- pretensiones.py frente a pretensiones-lite.py (ambos al {fecha_lite:%Y-%m-%d}; "
+              f"pretensiones.py usa por defecto el {fecha_completo:%Y-%m-%d}) ---",
+              f"{'Partida':<34}{'Completo':>14}{'Lite':>14}{'Diferencia':>14}  Causa"]
+    for fila in filas:
+        causa = fila["causa"] if fila["diferencia"] else ""
+        if fila["partida"] == "total_pretensiones" and fila["diferencia"]:
+            causa = "suma de las anteriores"
+        lineas.append(f"{fila['partida']:<34}{fila['completo']:>14,}{fila['lite']:>14,}{fila['diferencia']:>+14,}"
+                      f"  {causa}")
+    return "\n".join(lineas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Paridad de los motores de cálculo con la referencia fila a fila.")
+    parser.add_argument('--conjuntos', type=int, default=4,
+                        help="Conjuntos de datos sintéticos (una semilla cada uno)")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla del primer conjunto")
+    parser.add_argument('--filas', type=int, default=10_000, help="Desprendibles por conjunto")
+    parser.add_argument('--motores', nargs='+', choices=list(MOTORES), default=list(MOTORES),
+                        help="Motores a comparar (la referencia fila a fila siempre se ejecuta)")
+    parser.add_argument('--procesos', type=int, default=None,
+                        help="Procesos que reparten los conjuntos (por defecto, núcleos)")
+    parser.add_argument('--procesos-lote', type=int, default=2, help="Procesos del motor 'lote'")
+    parser.add_argument('--filas-por-bloque', type=int, default=997, help="Filas por bloque del motor 'bloques'")
+    parser.add_argument('--sin-scripts', action='store_true',
+                        help="No comparar pretensiones.py con pretensiones-lite.py")
+    args = parser.parse_args(argv)
+
+    opciones = {"procesos_lote": args.procesos_lote, "filas_por_bloque": args.filas_por_bloque}
+    trabajos = [(args.semilla + i, args.filas, args.motores, opciones) for i in range(args.conjuntos)]
+    procesos = min(args.procesos or os.cpu_count() or 1, len(trabajos))
+    if procesos <= 1:
+        salidas = [evaluar_conjunto(trabajo) for trabajo in trabajos]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            salidas = list(executor.map(evaluar_conjunto, trabajos))
+
+    contratos, motores = combinar(salidas)
+    print(f"--- {args.conjuntos} conjunto(s) de {args.filas} desprendibles, {contratos} contratos "
+          f"(semillas {args.semilla} a {args.semilla + args.conjuntos - 1}) ---")
+    print(tabla_motores(contratos, motores))
+    fallas = sum(cantidad for medida in motores.values() for cantidad, _ in medida["discrepancias"].values())
+
+    if not args.sin_scripts:
+        print()
+        print(tabla_scripts(*comparar_scripts()))
+
+    print()
+    print("Todos los motores coinciden con la referencia." if not fallas
+          else f"{fallas} discrepancia(s) frente a la referencia.")
+    return 1 if fallas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
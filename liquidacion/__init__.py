@@ -0,0 +1,6 @@
+"""
+Librería de cálculo de liquidaciones laborales a partir de desprendibles de nómina.
+
+Los módulos se importan por separado (``from liquidacion import ventanas``) para que
+cargar el paquete no arrastre pandas ni NumPy hasta que realmente se necesiten.
+"""
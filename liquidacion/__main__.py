@@ -0,0 +1,5 @@
+import sys
+
+from liquidacion.cli import main
+
+sys.exit(main())
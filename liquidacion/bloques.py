@@ -0,0 +1,442 @@
+"""
+Ingesta por bloques de exportaciones de nómina más grandes que la memoria.
+
+El CSV se lee con ``pd.read_csv(chunksize=...)``; cada bloque se normaliza con
+``datos.preprocesar_paystubs`` y alimenta acumuladores incrementales, después de lo cual
+se descarta. Ninguna estructura crece con el número de filas del archivo:
+
+- ``AcumuladorPeriodos``: totales pro rata de las ventanas de liquidación (primas,
+  cesantías, vacaciones) de cada contrato del manifiesto. Las ventanas se conocen de
+  antemano, así que cada desprendible suma ``monto * días de solape`` (entero exacto) en
+  la ventana correspondiente, agrupado por la duración del desprendible. Al final cada
+  total exacto se redondea al centavo (ver ``dinero``), de modo que el resultado no
+  depende del tamaño del bloque y coincide con el cálculo en memoria.
+- ``AcumuladorDiciembre``: salario base de diciembre por empleado y año (sanción de
+  cesantías).
+- ``AcumuladorMensual``: sumas mensuales por empleado para el resumen financiero.
+- ``AcumuladorValidacion``: la línea de tiempo de los desprendibles de cada empleado del
+  manifiesto, barrida bloque a bloque desde su último fin, y los totales que no cuadran;
+  de cada hallazgo solo guarda la cantidad y los primeros ejemplos.
+
+La memoria depende del número de contratos y de meses, no del tamaño del archivo.
+
+Uso:
+    python -m liquidacion.bloques manifiesto.csv --paystubs nomina.csv --salida resultados.csv \\
+        --mensual resumen-mensual.csv --filas-por-bloque 200000
+"""
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from liquidacion.calculo import (anio_sancion_cesantias, periodos_liquidacion, pretensiones_desde_totales,
+                                 resumen_pretensiones, valores_liquidacion, ventanas_de_prima)
+from liquidacion.datos import EMPLOYEE_COL, preprocesar_paystubs
+from liquidacion.dinero import centavos_desde_fracciones
+from liquidacion.lote import leer_manifiesto
+from liquidacion.mensual import (TASA_PENSION_EMPLEADOR, TASA_PENSION_TOTAL, agregar_por_mes, clave_mes,
+                                 tabla_mensual)
+from liquidacion.perfil import contar_consulta
+from liquidacion.validacion import MAX_EJEMPLOS, advertencias_hallazgos, revisar_montos
+from liquidacion.ventanas import a_numero_de_dia
+
+FILAS_POR_BLOQUE = 200_000
+# Código de los desprendibles de empleados que no están en el manifiesto
+SIN_CONTRATO = -1
+
+
+def leer_por_bloques(ruta_csv, filas_por_bloque=FILAS_POR_BLOQUE, advertir=print):
+    """
+    Itera sobre el CSV en bloques de ``filas_por_bloque`` filas ya preprocesados. Cada
+    advertencia distinta del preprocesamiento se emite una sola vez.
+    """
+    emitidas = set()
+
+    def advertir_una_vez(texto):
+        if texto not in emitidas:
+            emitidas.add(texto)
+            advertir(texto)
+
+    with pd.read_csv(ruta_csv, chunksize=filas_por_bloque, dtype={EMPLOYEE_COL: str}) as lector:
+        for bloque in lector:
+            yield preprocesar_paystubs(bloque, advertir=advertir_una_vez)
+
+
+class AcumuladorPeriodos:
+    """
+    Totales pro rata exactos de ventanas fijas ``(codigo, inicio, fin)``, alimentados con
+    bloques de desprendibles. ``codigos`` identifica al empleado de cada ventana.
+    """
+
+    def __init__(self, codigos, inicios, fines):
+        self.codigos = np.asarray(codigos, dtype=np.int64)
+        self.inicios = np.asarray(inicios, dtype=np.int64)
+        self.fines = np.asarray(fines, dtype=np.int64)
+        # Ventanas ordenadas por código para ubicar las de cada empleado con searchsorted
+        self._orden = np.argsort(self.codigos, kind='stable')
+        self._codigos_ordenados = self.codigos[self._orden]
+        # numeradores[columna, ventana, j] = suma de monto * días de solape de los
+        # desprendibles que duran duraciones[j] días (solo las duraciones vistas)
+        self.duraciones = np.zeros(0, dtype=np.int64)
+        self.numeradores = np.zeros((3, self.codigos.size, 0), dtype=np.int64)
+
+    def agregar(self, codigos, ps_inicios, ps_fines, base, extras, aux):
+        """
+        Suma la contribución de un bloque de desprendibles (arreglos paralelos). Devuelve los
+        índices ordenados de las ventanas que cambiaron.
+        """
+        codigos = np.asarray(codigos, dtype=np.int64)
+        ps_inicios = np.asarray(ps_inicios, dtype=np.int64)
+        ps_fines = np.asarray(ps_fines, dtype=np.int64)
+        montos = np.stack([np.asarray(base, dtype=np.int64), np.asarray(extras, dtype=np.int64),
+                           np.asarray(aux, dtype=np.int64)])
+
+        # Pares (desprendible, ventana del mismo empleado)
+        desde = np.searchsorted(self._codigos_ordenados, codigos, side='left')
+        cantidad = np.searchsorted(self._codigos_ordenados, codigos, side='right') - desde
+        desprendible = np.repeat(np.arange(codigos.size), cantidad)
+        posicion = np.arange(desprendible.size) - np.repeat(np.cumsum(cantidad) - cantidad, cantidad)
+        ventana = self._orden[np.repeat(desde, cantidad) + posicion]
+
+        duracion = ps_fines[desprendible] - ps_inicios[desprendible] + 1
+        solape = (np.minimum(self.fines[ventana], ps_fines[desprendible]) -
+                  np.maximum(self.inicios[ventana], ps_inicios[desprendible]) + 1)
+        validos = (solape > 0) & (duracion > 0)
+        desprendible, ventana, duracion, solape = (desprendible[validos], ventana[validos],
+                                                   duracion[validos], solape[validos])
+        if duracion.size == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        nuevas = np.setdiff1d(duracion, self.duraciones)
+        if nuevas.size:
+            ampliados = np.zeros(self.numeradores.shape[:2] + (self.duraciones.size + nuevas.size,), dtype=np.int64)
+            ampliados[:, :, :self.duraciones.size] = self.numeradores
+            self.numeradores = ampliados
+            self.duraciones = np.concatenate([self.duraciones, nuevas])
+        # Posición de cada duración en self.duraciones (que no está ordenado)
+        orden = np.argsort(self.duraciones)
+        columna = orden[np.searchsorted(self.duraciones[orden], duracion)]
+        celda = ventana * self.duraciones.size + columna
+        for i in range(3):
+            np.add.at(self.numeradores[i].reshape(-1), celda, montos[i][desprendible] * solape)
+        return np.unique(ventana)
+
+    def totales_centavos(self, ventanas=None):
+        """
+        Totales por ventana en centavos, con el diccionario de ``IndiceDiario.totales_centavos``,
+        redondeados desde la suma exacta de los grupos de duración (ver
+        ``dinero.centavos_desde_fracciones``). ``ventanas`` (índices) limita el cálculo a esas
+        ventanas, en ese orden.
+        """
+        seleccion = slice(None) if ventanas is None else np.asarray(ventanas, dtype=np.int64)
+        inicios, fines = self.inicios[seleccion], self.fines[seleccion]
+        contar_consulta(inicios.size)
+        centavos = centavos_desde_fracciones(self.numeradores[:, seleccion], self.duraciones)
+        return {"base": centavos[0], "extras": centavos[1], "aux": centavos[2],
+                "dias": np.maximum(fines - inicios + 1, 0), "inicios": inicios, "fines": fines}
+
+
+class AcumuladorDiciembre:
+    """Suma del salario base de los desprendibles que inician en diciembre, por empleado y año."""
+
+    def __init__(self):
+        self._sumas = {}
+
+    def agregar(self, codigos, ps_inicios, base):
+        fechas = np.asarray(ps_inicios, dtype=np.int64).astype('datetime64[D]')
+        meses = fechas.astype('datetime64[M]').astype(np.int64)
+        en_diciembre = meses % 12 == 11
+        if not en_diciembre.any():
+            return
+        df_diciembre = pd.DataFrame({"codigo": np.asarray(codigos)[en_diciembre],
+                                     "anio": meses[en_diciembre] // 12 + 1970,
+                                     "base": np.asarray(base, dtype=np.int64)[en_diciembre]})
+        for (codigo, anio), suma in df_diciembre.groupby(['codigo', 'anio'])['base'].sum().items():
+            self._sumas[(codigo, anio)] = self._sumas.get((codigo, anio), 0) + int(suma)
+
+    def salario(self, codigo, anio):
+        """Igual que ``calculo.salario_diciembre``: ``(suma, hay_desprendibles)``."""
+        if (codigo, anio) in self._sumas:
+            return self._sumas[(codigo, anio)], True
+        return 0, False
+
+
+class AcumuladorMensual:
+    """
+    Sumas de salario base, extras y auxilio por código de empleado y mes, ambos como claves
+    enteras (ver ``mensual.agregar_por_mes``).
+    """
+
+    def __init__(self):
+        self._sumas = None
+        self._parciales = []
+        self._filas_parciales = 0
+
+    def agregar(self, codigos, ps_inicios, base, extras, aux):
+        parcial = agregar_por_mes(codigos, clave_mes(ps_inicios), np.stack([base, extras, aux]))
+        self._parciales.append(parcial)
+        self._filas_parciales += parcial[0].size
+        # Se consolida cuando los parciales superan a lo ya consolidado, para que el costo
+        # total sea lineal en el número de bloques
+        if self._filas_parciales > (0 if self._sumas is None else self._sumas[0].size):
+            self._consolidar()
+
+    def _consolidar(self):
+        if self._parciales:
+            partes = self._parciales if self._sumas is None else [self._sumas, *self._parciales]
+            self._sumas = agregar_por_mes(np.concatenate([p[0] for p in partes]),
+                                          np.concatenate([p[1] for p in partes]),
+                                          np.concatenate([p[2] for p in partes], axis=1))
+            self._parciales, self._filas_parciales = [], 0
+
+    def resumen(self, empleados, tasa_pension=TASA_PENSION_EMPLEADOR):
+        """
+        Reporte mensual por empleado (ver ``mensual.tabla_mensual``); ``empleados[i]`` es el
+        ``employee_id`` del código ``i``.
+        """
+        self._consolidar()
+        codigos, meses, sumas = self._sumas if self._sumas is not None else agregar_por_mes([], [], [])
+        return tabla_mensual(meses, sumas, tasa_pension, np.asarray(empleados, dtype=object)[codigos])
+
+
+class AcumuladorValidacion:
+    """
+    Validación bloque a bloque de la línea de tiempo (como ``validacion.revisar_periodos``) y
+    de los totales (``validacion.revisar_montos``) de los desprendibles de los empleados del
+    manifiesto. ``contratos`` da el contrato de cada código (o ``None`` para no revisar la
+    cobertura). Por empleado solo se guardan el fin acumulado y el último desprendible, y
+    de cada tipo de hallazgo la cantidad, el total y los primeros ejemplos.
+
+    Cada bloque se barre ordenado por (empleado, inicio, fin) a continuación de lo ya visto
+    de cada empleado. Si las filas de un empleado vienen en orden de fechas (lo normal en
+    una exportación, aunque se intercalen empleados) las advertencias son las mismas de
+    ``validacion``; una fila que llega después de otra posterior del mismo empleado se
+    advierte como solapada y no rellena el hueco que ya se contó.
+    """
+
+    def __init__(self, num_codigos, contratos=None):
+        self.con_contrato = contratos is not None
+        if self.con_contrato:
+            self._contrato_inicios = a_numero_de_dia([contrato.fecha_inicio for contrato in contratos])
+            self._contrato_fines = a_numero_de_dia([contrato.fecha_fin for contrato in contratos])
+        self._visto = np.zeros(num_codigos, dtype=bool)
+        self._fin_acumulado = np.zeros(num_codigos, dtype=np.int64)
+        self._ultimo_inicio = np.zeros(num_codigos, dtype=np.int64)
+        self._ultimo_fin = np.zeros(num_codigos, dtype=np.int64)
+        # {tipo: (cantidad, total, ejemplos)}, ver ``validacion.resumir_hallazgos``
+        self._hallazgos = {}
+        self._filas_leidas = 0
+
+    def _registrar(self, tipo, numeros, inicios, fines, valores=None):
+        if numeros.size == 0:
+            return
+        valores = np.zeros(numeros.size, dtype=np.int64) if valores is None else valores
+        cantidad, total, ejemplos = self._hallazgos.get(tipo, (0, 0, []))
+        # Los bloques llegan en orden de fila: los primeros ejemplos son los del primer bloque
+        orden = np.argsort(numeros, kind='stable')[:MAX_EJEMPLOS - len(ejemplos)]
+        ejemplos = ejemplos + list(zip(numeros[orden].tolist(), inicios[orden].tolist(), fines[orden].tolist(),
+                                       valores[orden].tolist()))
+        self._hallazgos[tipo] = (cantidad + numeros.size, total + int(valores.sum()), ejemplos)
+
+    def agregar(self, bloque, codigos, ps_inicios, ps_fines, con_contrato):
+        posiciones = np.flatnonzero(con_contrato)
+        if posiciones.size:
+            self._barrer(codigos[posiciones], ps_inicios[posiciones], ps_fines[posiciones],
+                         posiciones + self._filas_leidas)
+        for tipo, (filas, diferencias) in revisar_montos(bloque).items():
+            conservar = con_contrato[filas]
+            filas = filas[conservar]
+            self._registrar(tipo, filas + self._filas_leidas, ps_inicios[filas], ps_fines[filas],
+                            diferencias[conservar])
+        self._filas_leidas += len(con_contrato)
+
+    def _barrer(self, codigos, inicios, fines, numeros):
+        orden = np.lexsort((fines, inicios, codigos))
+        codigos, inicios, fines, numeros = codigos[orden], inicios[orden], fines[orden], numeros[orden]
+        primero = np.r_[True, codigos[1:] != codigos[:-1]]
+        ultimo = np.r_[primero[1:], True]
+        # Primera fila del bloque de un empleado ya visto: continúa desde lo guardado
+        continua = primero & self._visto[codigos]
+        nuevo = primero & ~continua
+
+        # Máximo acumulado de los fines por empleado, como en ``validacion.revisar_periodos``
+        valores = np.where(continua, np.maximum(fines, self._fin_acumulado[codigos]), fines)
+        grupo = np.cumsum(primero) - 1
+        base = min(int(inicios.min()), int(valores.min())) - 1
+        salto = int(valores.max()) - base + 1
+        fin_acumulado = np.maximum.accumulate(valores - base + grupo * salto) - grupo * salto + base
+        fin_previo = np.where(continua, self._fin_acumulado[codigos], np.r_[base, fin_acumulado[:-1]])
+        inicio_anterior = np.where(continua, self._ultimo_inicio[codigos], np.r_[base, inicios[:-1]])
+        fin_anterior = np.where(continua, self._ultimo_fin[codigos], np.r_[base, fines[:-1]])
+
+        if self.con_contrato:
+            contrato_inicio = self._contrato_inicios[codigos]
+            contrato_fin = self._contrato_fines[codigos]
+            fin_previo = np.where(nuevo, contrato_inicio - 1, fin_previo)
+            desde = np.maximum(fin_previo + 1, contrato_inicio)
+            dias_hueco = np.maximum(np.minimum(inicios - 1, contrato_fin) - desde + 1, 0)
+            dias_fuera = (np.maximum(np.minimum(fines, contrato_inicio - 1) - inicios + 1, 0) +
+                          np.maximum(fines - np.maximum(inicios, contrato_fin + 1) + 1, 0))
+            fuera = dias_fuera > 0
+            self._registrar("fuera_contrato", numeros[fuera], inicios[fuera], fines[fuera], dias_fuera[fuera])
+        else:
+            dias_hueco = np.where(nuevo, 0, np.maximum(inicios - fin_previo - 1, 0))
+        duplicado = ~nuevo & (inicios == inicio_anterior) & (fines == fin_anterior)
+        solapado = ~nuevo & ~duplicado & (inicios <= fin_previo)
+        hueco = dias_hueco > 0
+        self._registrar("duplicados", numeros[duplicado], inicios[duplicado], fines[duplicado])
+        self._registrar("solapados", numeros[solapado], inicios[solapado], fines[solapado])
+        self._registrar("huecos", numeros[hueco], inicios[hueco], fines[hueco], dias_hueco[hueco])
+
+        # Estado de cada empleado: fin acumulado y el mayor (inicio, fin) visto
+        codigos, inicios, fines = codigos[ultimo], inicios[ultimo], fines[ultimo]
+        mayor = (~self._visto[codigos] | (inicios > self._ultimo_inicio[codigos]) |
+                 ((inicios == self._ultimo_inicio[codigos]) & (fines >= self._ultimo_fin[codigos])))
+        self._ultimo_inicio[codigos[mayor]] = inicios[mayor]
+        self._ultimo_fin[codigos[mayor]] = fines[mayor]
+        self._fin_acumulado[codigos] = fin_acumulado[ultimo]
+        self._visto[codigos] = True
+
+    def validar(self, nombres=None, advertir=print):
+        """
+        Advertencias de ``validacion.validar_paystubs`` sobre todo lo acumulado; ``nombres``
+        es el ``employee_id`` de cada código.
+        """
+        hallazgos = dict(self._hallazgos)
+        if self.con_contrato:
+            # Empleados cuyo último desprendible termina antes que el contrato
+            codigos = np.flatnonzero(self._visto)
+            dias_final = np.maximum(self._contrato_fines[codigos] -
+                                    np.maximum(self._fin_acumulado[codigos], self._contrato_inicios[codigos] - 1), 0)
+            codigos, dias_final = codigos[dias_final > 0], dias_final[dias_final > 0]
+            hallazgos["sin_cubrir_al_final"] = (codigos.size, int(dias_final.sum()),
+                                                list(zip(codigos[:MAX_EJEMPLOS].tolist(),
+                                                         dias_final[:MAX_EJEMPLOS].tolist())))
+        advertencias = advertencias_hallazgos(hallazgos, nombres)
+        for texto in advertencias:
+            advertir(texto)
+        return advertencias
+
+
+def liquidar_por_bloques(contratos, ruta_csv, filas_por_bloque=FILAS_POR_BLOQUE, advertir=print,
+                         tasa_pension=TASA_PENSION_EMPLEADOR):
+    """
+    Liquida los ``contratos`` (``calculo.Contrato``) leyendo ``ruta_csv`` por bloques. Si el
+    CSV tiene ``employee_id`` cada contrato usa las filas de su empleado; si no, todas.
+    Devuelve ``(resultados, df_mensual)``: un resultado de ``calculo.calcular_pretensiones``
+    por contrato, en orden, y el resumen mensual de los empleados del manifiesto (sin
+    ``employee_id`` en el CSV, uno solo con ``employee_id`` vacío) con el aporte a pensión
+    a ``tasa_pension``. Los desprendibles se validan como en ``lote`` (ver ``validacion``)
+    y las advertencias se pasan a ``advertir`` antes de calcular.
+    """
+    codigos_empleado = {}
+    for contrato in contratos:
+        codigos_empleado.setdefault(contrato.employee_id, len(codigos_empleado))
+
+    planes, codigos, inicios, fines, es_prima = [], [], [], [], []
+    for contrato in contratos:
+        primas, cesantias, ventanas = periodos_liquidacion(contrato)
+        es_prima.extend(ventanas_de_prima(primas, cesantias))
+        planes.append((primas, cesantias, len(inicios), len(ventanas)))
+        codigos.extend([codigos_empleado[contrato.employee_id]] * len(ventanas))
+        inicios.extend(inicio for inicio, _ in ventanas)
+        fines.extend(fin for _, fin in ventanas)
+    periodos = AcumuladorPeriodos(codigos, a_numero_de_dia(inicios), a_numero_de_dia(fines))
+    diciembre = AcumuladorDiciembre()
+    mensual = AcumuladorMensual()
+    validacion = None
+
+    por_empleado = None
+    for bloque in leer_por_bloques(ruta_csv, filas_por_bloque, advertir):
+        if por_empleado is None:
+            por_empleado = EMPLOYEE_COL in bloque.columns
+            if not por_empleado and len(codigos_empleado) > 1:
+                advertir(f"Advertencia: '{ruta_csv}' no tiene columna '{EMPLOYEE_COL}'; "
+                         "todos los contratos usan todos los desprendibles.")
+            # Cada empleado contra su contrato; un CSV sin employee_id de un solo contrato, contra ese
+            if por_empleado:
+                contrato_de = {contrato.employee_id: contrato for contrato in contratos}
+                vigentes = [contrato_de[empleado] for empleado in codigos_empleado]
+            else:
+                vigentes = [contratos[0]] if len(codigos_empleado) == 1 else None
+            validacion = AcumuladorValidacion(len(codigos_empleado), vigentes)
+        if por_empleado:
+            codigos_bloque = (bloque[EMPLOYEE_COL].astype(str).map(codigos_empleado)
+                              .fillna(SIN_CONTRATO).to_numpy(dtype=np.int64))
+        else:
+            codigos_bloque = np.zeros(len(bloque), dtype=np.int64)
+
+        ps_inicios = a_numero_de_dia(bloque['Period_Start_Date'])
+        ps_fines = a_numero_de_dia(bloque['Period_End_Date'])
+        base = bloque['base_salary'].to_numpy(dtype=np.int64)
+        extras = bloque['total_extras'].to_numpy(dtype=np.int64)
+        aux = bloque['aux_transp'].to_numpy(dtype=np.int64)
+        if not por_empleado:
+            # Un solo conjunto de desprendibles para todos los contratos
+            for codigo in range(len(codigos_empleado)):
+                periodos.agregar(np.full(len(bloque), codigo), ps_inicios, ps_fines, base, extras, aux)
+                diciembre.agregar(np.full(len(bloque), codigo), ps_inicios, base)
+        else:
+            periodos.agregar(codigos_bloque, ps_inicios, ps_fines, base, extras, aux)
+            diciembre.agregar(codigos_bloque, ps_inicios, base)
+        # Solo los empleados del manifiesto, para que la memoria no crezca con el archivo
+        con_contrato = codigos_bloque != SIN_CONTRATO
+        mensual.agregar(codigos_bloque[con_contrato], ps_inicios[con_contrato], base[con_contrato],
+                        extras[con_contrato], aux[con_contrato])
+        validacion.agregar(bloque, codigos_bloque, ps_inicios, ps_fines, con_contrato)
+
+    if validacion is not None:
+        validacion.validar(list(codigos_empleado) if por_empleado else None, advertir)
+
+    totales = periodos.totales_centavos()
+    # Las fórmulas de liquidación se evalúan una sola vez sobre las ventanas de todos los contratos
+    valores = valores_liquidacion(totales, es_prima=es_prima)
+    resultados = []
+    for contrato, (primas, cesantias, desde, cantidad) in zip(contratos, planes):
+        anio = anio_sancion_cesantias(contrato)
+        salario_dic = (diciembre.salario(codigos_empleado[contrato.employee_id], anio)
+                       if anio is not None else (0, False))
+        resultados.append(pretensiones_desde_totales(
+            contrato, primas, cesantias, {clave: arreglo[desde:desde + cantidad] for clave, arreglo in totales.items()},
+            salario_dic, valores={clave: arreglo[desde:desde + cantidad] for clave, arreglo in valores.items()}))
+    empleados = list(codigos_empleado) if por_empleado else [""]
+    return resultados, mensual.resumen(empleados, tasa_pension)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Liquidación por lotes leyendo la nómina por bloques.")
+    parser.add_argument('manifiesto', help="CSV con una fila por contrato")
+    parser.add_argument('--paystubs', required=True, help="Tabla de nómina (con o sin columna employee_id)")
+    parser.add_argument('--salida', default='resultados-lote.csv', help="CSV de resultados consolidados")
+    parser.add_argument('--mensual', default=None, help="CSV opcional con el resumen mensual por empleado")
+    parser.add_argument('--tasa-pension', type=float, choices=[TASA_PENSION_EMPLEADOR, TASA_PENSION_TOTAL],
+                        default=TASA_PENSION_EMPLEADOR,
+                        help="Tasa del aporte a pensión de referencia: 0.12 (empleador) o 0.16 (total)")
+    parser.add_argument('--filas-por-bloque', type=int, default=FILAS_POR_BLOQUE, help="Filas leídas por bloque")
+    parser.add_argument('--fecha-calculo', default=datetime.now().strftime('%Y-%m-%d'),
+                        help="Fecha de cálculo para filas sin 'fecha_calculo' (AAAA-MM-DD)")
+    args = parser.parse_args(argv)
+
+    manifiesto = leer_manifiesto(args.manifiesto, datetime.strptime(args.fecha_calculo, '%Y-%m-%d'))
+    if any(paystubs_file for _, paystubs_file in manifiesto):
+        print("Advertencia: La columna 'paystubs_file' del manifiesto se ignora; "
+              f"todos los contratos se liquidan con '{args.paystubs}'.")
+    contratos = [contrato for contrato, _ in manifiesto]
+    resultados, df_mensual = liquidar_por_bloques(contratos, args.paystubs, args.filas_por_bloque,
+                                                  tasa_pension=args.tasa_pension)
+    for contrato, resultado in zip(contratos, resultados):
+        for texto in resultado["advertencias"]:
+            print(f"[{contrato.employee_id}] {texto}")
+
+    df_resultados = pd.DataFrame([resumen_pretensiones(c, r) for c, r in zip(contratos, resultados)])
+    if not df_resultados.empty:
+        df_resultados['anio_sancion_cesantias'] = df_resultados['anio_sancion_cesantias'].astype('Int64')
+    df_resultados.to_csv(args.salida, index=False)
+    if args.mensual:
+        df_mensual.to_csv(args.mensual, index=False)
+    print(f"{len(resultados)} contratos liquidados. Resultados en '{args.salida}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Caché binaria columnar de los desprendibles ya preprocesados.
+
+El primer uso de un CSV lo lee y preprocesa con ``datos.preprocesar_paystubs`` y guarda
+cada columna como un arreglo ``.npy``: fechas como números de día int64, montos en pesos
+int64 y columnas de texto como códigos int64 con sus categorías en ``meta.json``. Las
+ejecuciones siguientes cargan esos arreglos con ``mmap_mode='r'`` y omiten por completo
+``read_csv``, ``to_datetime`` y ``to_numeric`` mientras el CSV no cambie.
+
+Cada CSV tiene su carpeta de caché, nombrada con el nombre del archivo y un hash de su ruta
+absoluta, de modo que dos CSV con el mismo nombre en carpetas distintas no comparten caché
+aunque usen la misma ``carpeta_cache``. La caché se invalida por ruta, tamaño y fecha de
+modificación del CSV; si la fecha cambia pero el hash SHA-256 del contenido es el mismo
+(p. ej. el archivo solo se copió encima), se reutiliza.
+
+pandas se importa solo dentro de las funciones que lo necesitan: con la caché vigente,
+``cargar_desprendibles_con_cache`` no lo importa.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from liquidacion.datos import Desprendibles, preprocesar_paystubs
+from liquidacion.perfil import anotar_filas, etapa
+from liquidacion.ventanas import a_numero_de_dia
+
+# Cambiar este valor invalida las cachés escritas con un formato anterior
+VERSION_CACHE = 1
+CACHE_DIR_NAME = '.paystubs-cache'
+DATE_COLUMNS = ['Period_Start_Date', 'Period_End_Date']
+# Columnas derivadas que se reconstruyen al cargar en lugar de guardarse
+DERIVED_COLUMNS = ['year_month_period']
+
+
+def _hash_archivo(ruta):
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def _carpeta_cache(ruta_csv, carpeta_cache=None):
+    ruta_absoluta = os.path.abspath(ruta_csv)
+    carpeta_cache = carpeta_cache or os.path.join(os.path.dirname(ruta_absoluta), CACHE_DIR_NAME)
+    huella_ruta = hashlib.sha256(ruta_absoluta.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(carpeta_cache, f'{os.path.basename(ruta_csv)}-{huella_ruta}')
+
+
+def _leer_meta(carpeta):
+    try:
+        with open(os.path.join(carpeta, 'meta.json'), encoding='utf-8') as archivo:
+            meta = json.load(archivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    return meta if meta.get('version') == VERSION_CACHE else None
+
+
+def _escribir_meta(carpeta, meta):
+    # Archivo temporal y reemplazo atómico: un lector nunca ve un meta.json a medio escribir
+    ruta = os.path.join(carpeta, 'meta.json')
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(meta, archivo, ensure_ascii=False, indent=1)
+    os.replace(temporal, ruta)
+
+
+def guardar_cache(df_paystubs, carpeta, origen, advertencias=()):
+    """
+    Escribe ``df_paystubs`` (ya preprocesado) en ``carpeta``. ``origen`` describe el CSV
+    fuente (tamaño, mtime y hash). La escritura es atómica: se arma en una carpeta temporal
+    y luego se reemplaza la anterior.
+    """
+    import pandas as pd
+
+    temporal = carpeta + '.tmp'
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    columnas = {}
+    for col in df_paystubs.columns:
+        if col in DERIVED_COLUMNS:
+            continue
+        serie = df_paystubs[col]
+        if col in DATE_COLUMNS:
+            valores, tipo, categorias = a_numero_de_dia(serie), 'fecha', None
+        elif pd.api.types.is_integer_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+            valores, tipo, categorias = serie.to_numpy(dtype=np.int64), 'entero', None
+        elif pd.api.types.is_float_dtype(serie):
+            valores, tipo, categorias = serie.to_numpy(dtype=np.float64), 'decimal', None
+        else:
+            codigos, uniques = pd.factorize(serie.astype('string'), use_na_sentinel=True)
+            valores, tipo = codigos.astype(np.int64), 'texto'
+            categorias = [str(valor) for valor in uniques]
+        np.save(os.path.join(temporal, f'{len(columnas)}.npy'), valores)
+        columnas[col] = {"archivo": f'{len(columnas)}.npy', "tipo": tipo, "categorias": categorias}
+
+    meta = {"version": VERSION_CACHE, "origen": origen, "filas": len(df_paystubs),
+            "columnas": columnas, "advertencias": list(advertencias)}
+    _escribir_meta(temporal, meta)
+
+    shutil.rmtree(carpeta, ignore_errors=True)
+    os.replace(temporal, carpeta)
+
+
+def leer_cache(carpeta, meta=None):
+    """Reconstruye el DataFrame preprocesado desde los arreglos memory-mapped de ``carpeta``."""
+    import pandas as pd
+
+    meta = meta or _leer_meta(carpeta)
+    datos = {}
+    for col, info in meta["columnas"].items():
+        valores = np.load(os.path.join(carpeta, info["archivo"]), mmap_mode='r')
+        if info["tipo"] == 'fecha':
+            datos[col] = pd.to_datetime(valores, unit='D')
+        elif info["tipo"] == 'texto':
+            categorias = np.array(info["categorias"] + [None], dtype=object)
+            datos[col] = categorias[valores] # El código -1 (nulo) apunta al None final
+        else:
+            datos[col] = valores
+    df_paystubs = pd.DataFrame(datos)
+    df_paystubs['year_month_period'] = df_paystubs['Period_Start_Date'].dt.to_period('M')
+    return df_paystubs
+
+
+def _cache_vigente(ruta_csv, carpeta):
+    """
+    Devuelve ``(meta, hash_csv)``: ``meta`` es el de la caché si corresponde al CSV actual
+    (o ``None``) y ``hash_csv`` el hash del CSV si fue necesario calcularlo.
+    Propaga ``FileNotFoundError`` si el CSV no existe.
+    """
+    estado = os.stat(ruta_csv)
+    meta = _leer_meta(carpeta)
+    if meta is None:
+        return None, None
+    origen = meta["origen"]
+    if origen["ruta"] != os.path.abspath(ruta_csv) or origen["tamano"] != estado.st_size:
+        return None, None
+    if origen["mtime_ns"] == estado.st_mtime_ns:
+        return meta, None
+    # Cambió la fecha pero quizá no el contenido: se compara el hash
+    hash_csv = _hash_archivo(ruta_csv)
+    if hash_csv != origen["sha256"]:
+        return None, hash_csv
+    meta["origen"]["mtime_ns"] = estado.st_mtime_ns
+    _escribir_meta(carpeta, meta)
+    return meta, hash_csv
+
+
+def cargar_paystubs_con_cache(ruta_csv, advertir=print, carpeta_cache=None):
+    """
+    Equivalente a ``datos.cargar_paystubs`` que reutiliza la caché binaria cuando el CSV no
+    ha cambiado. Las advertencias del preprocesamiento original se repiten al leer la caché.
+    Propaga ``FileNotFoundError`` si el CSV no existe.
+    """
+    import pandas as pd
+
+    carpeta = _carpeta_cache(ruta_csv, carpeta_cache)
+    meta, hash_csv = _cache_vigente(ruta_csv, carpeta)
+    if meta is not None:
+        for texto in meta["advertencias"]:
+            advertir(texto)
+        with etapa('lectura_cache'):
+            df_paystubs = leer_cache(carpeta, meta)
+            anotar_filas(len(df_paystubs))
+        return df_paystubs
+
+    estado = os.stat(ruta_csv)
+    advertencias = []
+
+    def registrar(texto):
+        advertencias.append(texto)
+        advertir(texto)
+
+    with etapa('lectura_csv'):
+        df_paystubs = pd.read_csv(ruta_csv)
+    df_paystubs = preprocesar_paystubs(df_paystubs, advertir=registrar)
+    origen = {"ruta": os.path.abspath(ruta_csv), "tamano": estado.st_size,
+              "mtime_ns": estado.st_mtime_ns, "sha256": hash_csv or _hash_archivo(ruta_csv)}
+    try:
+        with etapa('escritura_cache'):
+            guardar_cache(df_paystubs.reset_index(drop=True), carpeta, origen, advertencias)
+    except OSError as error:
+        advertir(f"Advertencia: No se pudo escribir la caché de desprendibles en '{carpeta}': {error}")
+    return df_paystubs
+
+
+def cargar_desprendibles_con_cache(ruta_csv, advertir=print, carpeta_cache=None):
+    """
+    Devuelve directamente los ``datos.Desprendibles`` de un CSV. Si la caché está vigente
+    solo se leen los cinco arreglos necesarios con NumPy, sin importar pandas; si no, se
+    preprocesa el CSV (y se escribe la caché) con ``cargar_paystubs_con_cache``.
+    """
+    carpeta = _carpeta_cache(ruta_csv, carpeta_cache)
+    meta, _ = _cache_vigente(ruta_csv, carpeta)
+    if meta is None:
+        return Desprendibles.desde_dataframe(cargar_paystubs_con_cache(ruta_csv, advertir, carpeta_cache))
+
+    for texto in meta["advertencias"]:
+        advertir(texto)
+    columnas = meta["columnas"]
+
+    def arreglo(col):
+        return np.load(os.path.join(carpeta, columnas[col]["archivo"]), mmap_mode='r').astype(np.int64)
+
+    with etapa('lectura_cache'):
+        desprendibles = Desprendibles(arreglo('Period_Start_Date'), arreglo('Period_End_Date'),
+                                      arreglo('base_salary'), arreglo('total_extras'), arreglo('aux_transp'))
+        anotar_filas(len(desprendibles.inicios))
+    return desprendibles
@@ -0,0 +1,476 @@
+"""
+Cálculo de liquidación, indemnizaciones y total de pretensiones para un contrato.
+
+Reproduce las reglas de ``pretensiones.py`` generalizadas a cualquier contrato:
+- Prima de servicios por semestre calendario (ene-jun, jul-dic) recortado al contrato;
+  las primas de semestres anteriores al de terminación se consideran pagadas.
+- Cesantías e intereses por año calendario recortado al contrato, todos no pagados.
+- Vacaciones compensadas sobre todo el contrato.
+- Mora en liquidación (Art. 65 CST) desde la fecha de terminación.
+- Sanción por no consignación de cesantías (Ley 50/90 Art. 99) del primer año cerrado,
+  desde el 15 de febrero siguiente, con el salario base de diciembre de ese año.
+- Indemnización por despido con el salario contractual.
+
+Solo depende de NumPy: las funciones reciben ``datos.Desprendibles`` y no DataFrames, para
+poder ejecutarse en procesos de trabajo sin pandas. Los montos intermedios son centavos
+enteros (ver ``dinero``) y cada partida se redondea al peso una sola vez.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+
+from liquidacion.dinero import CENTAVOS_POR_PESO, a_pesos, aplicar_tasa, pesos_a_centavos, prorrata
+from liquidacion.indice_diario import IndiceDiario
+from liquidacion.parametros import (DIAS_ANIO, DIAS_MES, DIAS_VACACIONES, SMMLV, TASA_INTERESES_CESANTIAS,
+                                    auxilio_elegible, promedio_mensual, salario_con_minimo)
+from liquidacion.perfil import anotar_filas, etapa
+from liquidacion.ventanas import a_numero_de_dia
+
+ESTADO_PAGADA = "Pagada"
+ESTADO_NO_PAGADA = "No Pagada"
+
+
+@dataclass(frozen=True)
+class Contrato:
+    """Parámetros de un contrato a liquidar."""
+    fecha_inicio: datetime
+    fecha_fin: datetime
+    salario_base: int
+    fecha_calculo: datetime
+    employee_id: str = ""
+
+    @property
+    def salario_diario(self):
+        return self.salario_base / 30 # Para cálculos basados en 30 días por mes
+
+
+def calcular_dias_laborados(fecha_inicio, fecha_fin):
+    """Número de días calendario entre dos fechas (inclusive); 0 si el periodo está vacío."""
+    if fecha_inicio > fecha_fin:
+        return 0
+    return (fecha_fin - fecha_inicio).days + 1
+
+
+# ============================
+# Periodos de cada prestación
+# ============================
+
+def periodos_prima(contrato):
+    """Semestres calendario (ene-jun, jul-dic) del contrato, recortados a sus fechas."""
+    periodos = []
+    for anio in range(contrato.fecha_inicio.year, contrato.fecha_fin.year + 1):
+        for semestre, (inicio, fin) in enumerate(((datetime(anio, 1, 1), datetime(anio, 6, 30)),
+                                                  (datetime(anio, 7, 1), datetime(anio, 12, 31))), start=1):
+            inicio, fin = max(inicio, contrato.fecha_inicio), min(fin, contrato.fecha_fin)
+            if inicio <= fin:
+                periodos.append((anio, semestre, inicio, fin))
+    return periodos
+
+
+def periodos_cesantias(contrato):
+    """Años calendario del contrato, recortados a sus fechas."""
+    return [
+        (anio, max(datetime(anio, 1, 1), contrato.fecha_inicio), min(datetime(anio, 12, 31), contrato.fecha_fin))
+        for anio in range(contrato.fecha_inicio.year, contrato.fecha_fin.year + 1)
+    ]
+
+
+# ============================
+# Fórmulas de prestaciones (base 360 días)
+# ============================
+# Reciben los totales pro rata en centavos de ``IndiceDiario.totales_centavos`` (arreglos
+# por ventana o escalares) y devuelven el valor exacto redondeado al centavo; el promedio
+# mensual (total * 30 / días) no se redondea por separado.
+
+def _total_base_prestacion(totales, incluir_extras=True, incluir_aux=True):
+    # Salario (con o sin extras) + Auxilio de transporte (si aplica) del periodo
+    total = totales['base'] + totales['extras'] if incluir_extras else totales['base']
+    return total + totales['aux'] if incluir_aux else total
+
+
+def excluir_auxilio_no_elegible(totales, inicios, fines):
+    """
+    Copia de ``totales`` sin el auxilio de transporte de las ventanas ``(inicio, fin)`` cuyo
+    salario base supera el tope legal vigente al cierre (ver ``parametros.auxilio_elegible``):
+    ese auxilio, si se pagó, no es factor de prestaciones.
+    """
+    elegible = auxilio_elegible(totales['base'], inicios, fines)
+    return {**totales, 'aux': np.where(elegible, totales['aux'], 0)}
+
+
+def calcular_prima(totales, incluir_extras=True, incluir_aux=True):
+    # (Salario promedio mensual + Auxilio de transporte promedio mensual) * Días trabajados en el semestre / 360
+    dias = totales['dias']
+    return prorrata(_total_base_prestacion(totales, incluir_extras, incluir_aux) * DIAS_MES, dias,
+                    np.maximum(dias, 1) * DIAS_ANIO)
+
+
+def calcular_cesantias(totales, incluir_extras=True, incluir_aux=True):
+    # (Salario promedio mensual + Auxilio de transporte promedio mensual) * Días trabajados en el periodo / 360
+    dias = totales['dias']
+    return prorrata(_total_base_prestacion(totales, incluir_extras, incluir_aux) * DIAS_MES, dias,
+                    np.maximum(dias, 1) * DIAS_ANIO)
+
+
+def calcular_intereses_cesantias(cesantias, dias, tasa):
+    # (Valor Cesantías * Días trabajados en el periodo * 0.12) / 360; la tasa sale de
+    # parametros.TASA_INTERESES_CESANTIAS
+    return aplicar_tasa(cesantias, tasa, dias, DIAS_ANIO)
+
+
+def calcular_vacaciones(totales):
+    # (Salario base promedio mensual (sin extras ni auxilio transp.) * Días trabajados) / 720
+    dias = totales['dias']
+    return prorrata(totales['base'] * DIAS_MES, dias, np.maximum(dias, 1) * DIAS_VACACIONES)
+
+
+# ============================
+# Indemnizaciones y sanciones
+# ============================
+# Los salarios entran y los valores salen en centavos. Ningún salario de sanción baja del
+# mínimo vigente (ver ``parametros.SMMLV``).
+
+def salario_mora_liquidacion(contrato, salario=None):
+    """
+    Salario mensual en centavos de la mora en liquidación: el contractual (o ``salario`` en
+    pesos, escalar o arreglo) sin bajar del mínimo vigente a la terminación.
+    """
+    salario = pesos_a_centavos(contrato.salario_base if salario is None else salario)
+    return salario_con_minimo(salario, int(a_numero_de_dia(contrato.fecha_fin)))
+
+
+def calcular_mora_liquidacion(contrato, fecha_calculo=None, salario_mensual=None):
+    """
+    Indemnización por mora en el pago de la liquidación (Art. 65 CST): un día de salario
+    contractual por cada día transcurrido desde la terminación. ``salario_mensual`` es el de
+    ``salario_mora_liquidacion``, si ya se calculó. Devuelve ``(valor, dias)``.
+    """
+    fecha_calculo = fecha_calculo or contrato.fecha_calculo
+    fecha_limite = contrato.fecha_fin
+    dias = (fecha_calculo - fecha_limite).days if fecha_calculo > fecha_limite else 0
+    if salario_mensual is None:
+        salario_mensual = salario_mora_liquidacion(contrato)
+    return int(prorrata(salario_mensual, dias, DIAS_MES)), dias
+
+
+def anio_sancion_cesantias(contrato):
+    """Primer año de cesantías cerrado antes de la terminación, o ``None`` si no hay."""
+    if contrato.fecha_inicio.year < contrato.fecha_fin.year:
+        return contrato.fecha_inicio.year
+    return None
+
+
+def fecha_limite_consignacion(anio):
+    """Fecha legal máxima para consignar las cesantías del año ``anio``."""
+    return datetime(anio + 1, 2, 15)
+
+
+def salario_diciembre(desprendibles, anio):
+    """Suma del salario base de los desprendibles cuyo periodo inicia en diciembre de ``anio``."""
+    meses = desprendibles.inicios.astype('datetime64[D]').astype('datetime64[M]')
+    en_diciembre = meses == np.datetime64(f'{anio}-12', 'M')
+    return int(desprendibles.base[en_diciembre].sum()), bool(en_diciembre.any())
+
+
+def aplicar_minimo_sancion(contrato, salario_mensual):
+    """``salario_mensual`` (centavos, escalar o arreglo) sin bajar del mínimo del año sancionado."""
+    anio = anio_sancion_cesantias(contrato)
+    if anio is None:
+        return salario_mensual
+    return salario_con_minimo(salario_mensual, int(a_numero_de_dia(datetime(anio, 12, 31))))
+
+
+def calcular_sancion_cesantias(contrato, salario_mensual, fecha_calculo=None):
+    """
+    Sanción por no consignación de cesantías (Ley 50/90 Art. 99): un día de salario por cada
+    día de retraso desde el 15 de febrero siguiente al primer año cerrado.
+    ``salario_mensual`` va en centavos. Devuelve ``(valor, dias, salario_diario)``.
+    """
+    fecha_calculo = fecha_calculo or contrato.fecha_calculo
+    anio = anio_sancion_cesantias(contrato)
+    salario_diario = int(prorrata(salario_mensual, 1, DIAS_MES))
+    if anio is None:
+        return 0, 0, salario_diario
+    fecha_limite = fecha_limite_consignacion(anio)
+    dias = max(0, (fecha_calculo - fecha_limite).days)
+    return int(prorrata(salario_mensual, dias, DIAS_MES)), dias, salario_diario
+
+
+def calcular_indemnizacion_despido(contrato):
+    """Indemnización por despido: salario contractual / 360 por día de servicio."""
+    dias_servicio = calcular_dias_laborados(contrato.fecha_inicio, contrato.fecha_fin)
+    return int(prorrata(pesos_a_centavos(contrato.salario_base), dias_servicio, DIAS_ANIO))
+
+
+# ============================
+# Pipeline completo
+# ============================
+
+def periodos_liquidacion(contrato):
+    """
+    Periodos de prima, cesantías y vacaciones del contrato. Devuelve ``(primas, cesantias,
+    ventanas)``, donde ``ventanas`` lista todos los ``(inicio, fin)`` en ese orden (primas,
+    cesantías y al final vacaciones) para consultarlos en un solo lote.
+    """
+    primas = periodos_prima(contrato)
+    cesantias = periodos_cesantias(contrato)
+    ventanas = ([(inicio, fin) for _, _, inicio, fin in primas] +
+                [(inicio, fin) for _, inicio, fin in cesantias] +
+                [(contrato.fecha_inicio, contrato.fecha_fin)])
+    return primas, cesantias, ventanas
+
+
+def ventanas_de_prima(primas, cesantias):
+    """Máscara de las ``ventanas`` de ``periodos_liquidacion`` que son de prima."""
+    return np.arange(len(primas) + len(cesantias) + 1) < len(primas)
+
+
+def valores_liquidacion(totales, incluir_extras=True, incluir_aux=True, es_prima=None):
+    """
+    Valores en pesos de las fórmulas de liquidación para cada ventana de ``totales`` (ver
+    ``IndiceDiario.totales_centavos``): ``prestacion`` (prima o cesantías, que comparten la
+    fórmula), ``intereses`` sobre esa prestación como cesantías y ``vacaciones``.
+    ``incluir_extras``/``incluir_aux`` controlan si las extras y el auxilio de transporte
+    entran en la base de prima y cesantías; el auxilio solo entra en las ventanas cuyo
+    salario base promedio da derecho a él según ``parametros.auxilio_elegible``.
+    ``es_prima`` (ver ``ventanas_de_prima``) separa las ventanas de prima de las de cesantías
+    para medirlas como etapas distintas del perfil; sin ella todas se miden como cesantías.
+
+    Cada fórmula se evalúa en una sola operación sobre todas las ventanas, que pueden ser de
+    uno o de muchos contratos (``bloques`` y ``escenarios`` la llaman una vez por lote).
+    """
+    if incluir_aux:
+        with etapa('auxilio_transporte'):
+            totales = excluir_auxilio_no_elegible(totales, totales['inicios'], totales['fines'])
+    if es_prima is None:
+        with etapa('cesantias'):
+            prestacion = calcular_cesantias(totales, incluir_extras, incluir_aux)
+    else:
+        es_prima = np.asarray(es_prima, dtype=bool)
+        prestacion = np.empty_like(totales['base'])
+        with etapa('prima'):
+            anotar_filas(np.count_nonzero(es_prima))
+            prestacion[es_prima] = calcular_prima(_ventanas(totales, es_prima), incluir_extras, incluir_aux)
+        with etapa('cesantias'):
+            anotar_filas(np.count_nonzero(~es_prima))
+            prestacion[~es_prima] = calcular_cesantias(_ventanas(totales, ~es_prima), incluir_extras, incluir_aux)
+    with etapa('intereses_cesantias'):
+        intereses = calcular_intereses_cesantias(prestacion, totales['dias'],
+                                                 TASA_INTERESES_CESANTIAS.en(totales['fines']))
+    with etapa('vacaciones'):
+        vacaciones = calcular_vacaciones(totales)
+    prestacion, intereses, vacaciones = a_pesos(np.stack([prestacion, intereses, vacaciones]))
+    return {"prestacion": prestacion, "intereses": intereses, "vacaciones": vacaciones}
+
+
+def _ventanas(totales, seleccion):
+    """Los ``totales`` de las ventanas marcadas en ``seleccion``."""
+    return {clave: arreglo[seleccion] for clave, arreglo in totales.items()}
+
+
+def calcular_partidas_liquidacion(contrato, primas, cesantias, totales, incluir_extras=True, incluir_aux=True,
+                                  valores=None):
+    """
+    Partidas de liquidación (valores redondeados a pesos) a partir de los periodos de
+    ``periodos_liquidacion`` y los ``totales`` en centavos de sus ventanas (ver
+    ``IndiceDiario.totales_centavos``, en el mismo orden y con sus fechas).
+    ``valores`` son los de ``valores_liquidacion`` para esas mismas ventanas, si ya se
+    calcularon; si no, se calculan con ``incluir_extras`` e ``incluir_aux``.
+    Devuelve ``(partidas, totales_cesantias_por_anio)``, este último con el total base y
+    los días de cada año de cesantías (``{anio: {'base': centavos, 'dias': dias}}``).
+    """
+    if valores is None:
+        valores = valores_liquidacion(totales, incluir_extras, incluir_aux, ventanas_de_prima(primas, cesantias))
+    num_primas, num_cesantias = len(primas), len(cesantias)
+    num_prestaciones = num_primas + num_cesantias
+    prestaciones = valores["prestacion"][:num_prestaciones].tolist()
+    valores_prima = prestaciones[:num_primas]
+    valores_cesantias = prestaciones[num_primas:]
+    valores_intereses = valores["intereses"][num_primas:num_prestaciones].tolist()
+    valor_vacaciones = int(valores["vacaciones"][num_prestaciones])
+    bases_cesantias = totales['base'][num_primas:num_prestaciones].tolist()
+    dias_cesantias = totales['dias'][num_primas:num_prestaciones].tolist()
+
+    partidas = []
+    for i, ((anio, semestre, inicio, fin), valor) in enumerate(zip(primas, valores_prima)):
+        ultima = i == num_primas - 1
+        nombre = (f"Prima Proporcional {anio}" if ultima
+                  else f"Prima {'1er' if semestre == 1 else '2do'} Semestre {anio}")
+        partidas.append({
+            "Concepto": f"{nombre} ({inicio.strftime('%b %d')} - {fin.strftime('%b %d')})",
+            "Tipo": "prima",
+            "Valor": valor,
+            "Estado": ESTADO_NO_PAGADA if ultima else ESTADO_PAGADA,
+        })
+
+    totales_cesantias_por_anio = {}
+    for i, (anio, inicio, fin) in enumerate(cesantias):
+        proporcional = " Proporcionales" if i == num_cesantias - 1 else ""
+        totales_cesantias_por_anio[anio] = {'base': bases_cesantias[i], 'dias': dias_cesantias[i]}
+        partidas.append({
+            "Concepto": f"Cesantías{proporcional} {anio} ({inicio.strftime('%b %d')} - {fin.strftime('%b %d')})",
+            "Tipo": "cesantias",
+            "Valor": valores_cesantias[i],
+            "Estado": ESTADO_NO_PAGADA,
+        })
+        partidas.append({
+            "Concepto": f"Intereses sobre Cesantías{proporcional} {anio}",
+            "Tipo": "intereses_cesantias",
+            "Valor": valores_intereses[i],
+            "Estado": ESTADO_NO_PAGADA,
+        })
+
+    partidas.append({
+        "Concepto": (f"Vacaciones Compensadas ({contrato.fecha_inicio.strftime('%b %d, %Y')} - "
+                     f"{contrato.fecha_fin.strftime('%b %d, %Y')})"),
+        "Tipo": "vacaciones",
+        "Valor": valor_vacaciones,
+        "Estado": ESTADO_NO_PAGADA,
+    })
+    return partidas, totales_cesantias_por_anio
+
+
+def total_no_pagado(partidas):
+    return sum(p["Valor"] for p in partidas if p["Estado"] == ESTADO_NO_PAGADA)
+
+
+def salario_mensual_sancion_cesantias(contrato, diciembre, totales_cesantias_por_anio):
+    """
+    Salario mensual base de la sanción de cesantías, en centavos: último salario vigente al
+    31 de diciembre del año sancionado según los desprendibles. ``diciembre`` es el
+    ``(suma, hay_desprendibles)`` de ``salario_diciembre`` para ese año. Si es 0 se usa el
+    salario base promedio de cesantías de ese año y, en último caso, ``None`` para indicar
+    que corresponde el salario contractual.
+    Devuelve ``(salario, advertencias)``; el salario es 0 si no hay año sancionado.
+    """
+    anio = anio_sancion_cesantias(contrato)
+    if anio is None:
+        return 0, []
+    advertencias = []
+    salario, hay_diciembre = diciembre
+    salario = int(pesos_a_centavos(salario))
+    if salario == 0 and hay_diciembre:
+        totales_anio = totales_cesantias_por_anio[anio]
+        salario = int(promedio_mensual(totales_anio['base'], totales_anio['dias']))
+        advertencias.append(f"Advertencia: Salario base de Dic {anio} es 0 en paystubs. "
+                            f"Usando promedio de cesantías {anio}: {salario / CENTAVOS_POR_PESO:.0f}")
+    if salario == 0:
+        return None, advertencias
+    return salario, advertencias
+
+
+def calcular_pretensiones(contrato, desprendibles, indice=None, incluir_extras=True, incluir_aux=True):
+    """
+    Ejecuta liquidación + indemnizaciones + total para un contrato.
+
+    ``desprendibles`` es un ``datos.Desprendibles``; ``indice`` permite reutilizar un
+    ``IndiceDiario`` ya construido sobre esos mismos desprendibles.
+    Devuelve un diccionario con las partidas de liquidación (valores redondeados a pesos),
+    el detalle de indemnizaciones, los totales y las advertencias generadas.
+    """
+    if indice is None:
+        with etapa('indice_diario'):
+            indice = IndiceDiario(*desprendibles)
+            anotar_filas(len(desprendibles.inicios))
+
+    primas, cesantias, ventanas = periodos_liquidacion(contrato)
+    with etapa('totales_ventanas'):
+        totales = indice.totales_centavos(a_numero_de_dia([inicio for inicio, _ in ventanas]),
+                                          a_numero_de_dia([fin for _, fin in ventanas]))
+        anotar_filas(len(ventanas))
+    anio = anio_sancion_cesantias(contrato)
+    diciembre = salario_diciembre(desprendibles, anio) if anio is not None else (0, False)
+    return pretensiones_desde_totales(contrato, primas, cesantias, totales, diciembre, incluir_extras, incluir_aux)
+
+
+def pretensiones_desde_totales(contrato, primas, cesantias, totales, diciembre, incluir_extras=True,
+                               incluir_aux=True, valores=None):
+    """
+    Parte de ``calcular_pretensiones`` que no lee desprendibles: recibe los periodos de
+    ``periodos_liquidacion``, los ``totales`` en centavos de sus ventanas (y opcionalmente
+    sus ``valores_liquidacion``) y el ``diciembre`` de ``salario_diciembre`` del año
+    sancionado. Devuelve el mismo diccionario.
+    """
+    # --- Liquidación ---
+    with etapa('liquidacion'):
+        partidas, totales_cesantias_por_anio = calcular_partidas_liquidacion(
+            contrato, primas, cesantias, totales, incluir_extras, incluir_aux, valores)
+        total_liquidacion_no_pagada = total_no_pagado(partidas)
+
+    # --- Indemnizaciones y sanciones ---
+    with etapa('sanciones'):
+        salario_mora = int(salario_mora_liquidacion(contrato))
+        indemnizacion_mora, dias_mora_liquidacion = calcular_mora_liquidacion(contrato, salario_mensual=salario_mora)
+
+        salario_mensual_sancion, advertencias = \
+            salario_mensual_sancion_cesantias(contrato, diciembre, totales_cesantias_por_anio)
+        if salario_mensual_sancion is None:
+            salario_mensual_sancion = int(pesos_a_centavos(contrato.salario_base)) # Fallback al salario contractual
+            advertencias.append(f"Advertencia: No se pudo determinar el salario de Dic "
+                                f"{anio_sancion_cesantias(contrato)}. "
+                                f"Usando salario contractual: {contrato.salario_base:.0f}")
+        salario_mensual_sancion = int(aplicar_minimo_sancion(contrato, salario_mensual_sancion))
+        if not SMMLV.cubre(a_numero_de_dia(contrato.fecha_inicio)):
+            primera = SMMLV.desde[0].astype('datetime64[D]')
+            advertencias.append(f"Advertencia: No hay salario mínimo registrado antes del {primera}. "
+                                "En esas fechas no se aplican el mínimo ni el tope del auxilio de transporte.")
+        sancion_cesantias, dias_mora_cesantias, salario_diario_sancion = \
+            calcular_sancion_cesantias(contrato, salario_mensual_sancion)
+
+        indemnizacion_despido = calcular_indemnizacion_despido(contrato)
+
+    indemnizaciones = {
+        "indemnizacion_mora_liquidacion": int(a_pesos(indemnizacion_mora)),
+        "dias_mora_liquidacion": dias_mora_liquidacion,
+        "salario_diario_mora_liquidacion": int(a_pesos(prorrata(salario_mora, 1, DIAS_MES))),
+        "sancion_mora_cesantias": int(a_pesos(sancion_cesantias)),
+        "anio_sancion_cesantias": anio_sancion_cesantias(contrato),
+        "dias_mora_cesantias": dias_mora_cesantias,
+        "salario_diario_sancion_cesantias": int(a_pesos(salario_diario_sancion)),
+        "indemnizacion_despido": int(a_pesos(indemnizacion_despido)),
+    }
+    total_indemnizaciones = (indemnizaciones["indemnizacion_mora_liquidacion"] +
+                             indemnizaciones["sancion_mora_cesantias"] +
+                             indemnizaciones["indemnizacion_despido"])
+
+    return {
+        "liquidacion": partidas,
+        "total_liquidacion_no_pagada": total_liquidacion_no_pagada,
+        "indemnizaciones": indemnizaciones,
+        "total_indemnizaciones": total_indemnizaciones,
+        "total_pretensiones": total_liquidacion_no_pagada + total_indemnizaciones,
+        # En centavos, para recalcular la sanción a otras fechas (ver liquidacion.curvas)
+        "salario_mensual_sancion_centavos": salario_mensual_sancion,
+        "advertencias": advertencias,
+    }
+
+
+def resumen_pretensiones(contrato, resultado):
+    """
+    Aplana el resultado de ``calcular_pretensiones`` en una fila con columnas fijas por tipo
+    de partida, apta para una tabla consolidada de muchos trabajadores.
+    """
+    fila = {
+        "employee_id": contrato.employee_id,
+        "fecha_inicio": contrato.fecha_inicio.strftime('%Y-%m-%d'),
+        "fecha_fin": contrato.fecha_fin.strftime('%Y-%m-%d'),
+        "fecha_calculo": contrato.fecha_calculo.strftime('%Y-%m-%d'),
+        "salario_base": contrato.salario_base,
+        "primas_pagadas": 0,
+        "prima_no_pagada": 0,
+        "cesantias": 0,
+        "intereses_cesantias": 0,
+        "vacaciones": 0,
+    }
+    for partida in resultado["liquidacion"]:
+        if partida["Tipo"] == "prima":
+            clave = "primas_pagadas" if partida["Estado"] == ESTADO_PAGADA else "prima_no_pagada"
+        else:
+            clave = partida["Tipo"]
+        fila[clave] += partida["Valor"]
+    fila["total_liquidacion_no_pagada"] = resultado["total_liquidacion_no_pagada"]
+    fila.update(resultado["indemnizaciones"])
+    fila["total_indemnizaciones"] = resultado["total_indemnizaciones"]
+    fila["total_pretensiones"] = resultado["total_pretensiones"]
+    return fila
@@ -0,0 +1,114 @@
+"""
+Línea de comandos del cálculo de pretensiones de un contrato.
+
+Los módulos pesados se importan solo cuando se necesitan: con ``--total-only`` y la caché
+de desprendibles vigente se calcula el total sin importar pandas.
+
+Con ``--profile`` se mide cada etapa (ver ``liquidacion.perfil``) y al final se escribe
+en stderr una tabla o, con ``--profile json``, el mismo resultado en JSON.
+
+Uso:
+    python -m liquidacion --inicio 2023-04-17 --fin 2024-02-17 --salario 2100000 \\
+        --fecha-calculo 2025-05-22 --paystubs paystubs-summary.csv [--total-only] [--profile]
+"""
+import argparse
+import sys
+from datetime import datetime
+
+from liquidacion import perfil
+
+
+def _fecha(texto):
+    return datetime.strptime(texto, '%Y-%m-%d')
+
+
+def _advertir_stderr(texto):
+    print(texto, file=sys.stderr)
+
+
+def main(argv=None, contrato_defecto=None, paystubs_defecto='paystubs-summary.csv'):
+    """
+    Ejecuta el cálculo e imprime el reporte completo (o solo el total con ``--total-only``).
+    ``contrato_defecto`` (un ``calculo.Contrato``) hace opcionales los parámetros del
+    contrato. Devuelve el código de salida.
+    """
+    requerido = contrato_defecto is None
+    parser = argparse.ArgumentParser(description="Liquidación, indemnizaciones y total de pretensiones.")
+    parser.add_argument('--inicio', type=_fecha, required=requerido, help="Fecha de inicio del contrato (AAAA-MM-DD)")
+    parser.add_argument('--fin', type=_fecha, required=requerido, help="Fecha de terminación del contrato (AAAA-MM-DD)")
+    parser.add_argument('--salario', type=int, required=requerido, help="Salario base contractual mensual")
+    parser.add_argument('--fecha-calculo', type=_fecha, default=None,
+                        help="Fecha a la que se calculan las sanciones (por defecto, hoy)")
+    parser.add_argument('--paystubs', default=paystubs_defecto, help="CSV de desprendibles")
+    parser.add_argument('--tasa-pension', type=float, choices=[0.12, 0.16], default=0.12,
+                        help="Tasa del aporte a pensión de referencia en el resumen mensual: "
+                             "0.12 (empleador) o 0.16 (total)")
+    parser.add_argument('--total-only', action='store_true', help="Imprimir solo el monto total de las pretensiones")
+    parser.add_argument('--profile', nargs='?', const='tabla', choices=['tabla', 'json'], default=None,
+                        help="Medir tiempo, filas y memoria de cada etapa y escribirlos en stderr "
+                             "como tabla (por defecto) o JSON")
+    args = parser.parse_args(argv)
+
+    if args.profile is None:
+        return _ejecutar(args, contrato_defecto)
+    perfil.activar()
+    try:
+        return _ejecutar(args, contrato_defecto)
+    finally:
+        medicion = perfil.desactivar()
+        print(medicion.como_json() if args.profile == 'json' else medicion.como_tabla(), file=sys.stderr)
+
+
+def _ejecutar(args, contrato_defecto):
+    from liquidacion.calculo import Contrato, calcular_pretensiones
+
+    defecto = contrato_defecto or Contrato(None, None, None, datetime.now())
+    contrato = Contrato(
+        fecha_inicio=args.inicio or defecto.fecha_inicio,
+        fecha_fin=args.fin or defecto.fecha_fin,
+        salario_base=args.salario if args.salario is not None else defecto.salario_base,
+        fecha_calculo=args.fecha_calculo or defecto.fecha_calculo,
+        employee_id=defecto.employee_id,
+    )
+
+    # Con --total-only la salida estándar es solo la línea del total: las advertencias van a stderr
+    advertir = _advertir_stderr if args.total_only else print
+    try:
+        with perfil.etapa('carga'):
+            if args.total_only:
+                # Solo NumPy: lee los arreglos de la caché sin construir el DataFrame
+                from liquidacion.cache_paystubs import cargar_desprendibles_con_cache
+                desprendibles = cargar_desprendibles_con_cache(args.paystubs, advertir=advertir)
+            else:
+                from liquidacion.cache_paystubs import cargar_paystubs_con_cache
+                df_paystubs = cargar_paystubs_con_cache(args.paystubs)
+    except FileNotFoundError:
+        print(f"Error: El archivo '{args.paystubs}' no fue encontrado. Por favor, verifique la ruta.")
+        return 1
+
+    # Validación de la línea de tiempo (y de los totales, si hay DataFrame) antes de calcular
+    from liquidacion.validacion import validar_desprendibles, validar_paystubs
+
+    with perfil.etapa('validacion'):
+        if args.total_only:
+            validar_desprendibles(desprendibles, contrato, advertir=advertir)
+        else:
+            validar_paystubs(df_paystubs, contrato=contrato)
+
+    if args.total_only:
+        with perfil.etapa('calculo'):
+            resultado = calcular_pretensiones(contrato, desprendibles)
+        print(f"Monto total de las pretensiones: {resultado['total_pretensiones']:,}")
+        return 0
+
+    from liquidacion.datos import Desprendibles
+    from liquidacion.mensual import resumen_mensual
+    from liquidacion.reportes import reporte_completo
+
+    with perfil.etapa('calculo'):
+        resultado = calcular_pretensiones(contrato, Desprendibles.desde_dataframe(df_paystubs))
+    df_mensual = resumen_mensual(df_paystubs, contrato, tasa_pension=args.tasa_pension)
+    texto = reporte_completo(contrato, resultado, df_mensual)
+    with perfil.etapa('impresion'):
+        print(texto)
+    return 0
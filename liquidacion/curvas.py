@@ -0,0 +1,126 @@
+"""
+Curvas de acumulación de sanciones y del total de pretensiones en función de la fecha de cálculo.
+
+La liquidación (primas, cesantías, intereses, vacaciones) y la indemnización por despido no
+dependen de la fecha de cálculo; solo la mora en liquidación (Art. 65 CST) y la sanción por
+no consignación de cesantías (Ley 50/90 Art. 99) crecen día a día. Por eso la liquidación se
+calcula una sola vez y las sanciones se evalúan para todo el arreglo de fechas en una sola
+operación vectorizada con NumPy.
+
+Uso:
+    python -m liquidacion.curvas --inicio 2023-04-17 --fin 2024-02-17 --salario 2100000 \\
+        --fechas 2025-09-15 --dias 730 --salida curva.csv
+"""
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from liquidacion.cache_paystubs import cargar_paystubs_con_cache
+from liquidacion.calculo import (Contrato, anio_sancion_cesantias, calcular_pretensiones,
+                                 fecha_limite_consignacion, salario_mora_liquidacion)
+from liquidacion.datos import Desprendibles
+from liquidacion.dinero import a_pesos, prorrata
+from liquidacion.parametros import DIAS_MES
+from liquidacion.validacion import validar_desprendibles, validar_montos
+from liquidacion.ventanas import a_numero_de_dia
+
+
+def acumulacion_sanciones(contrato, salario_mensual_sancion, dias_calculo):
+    """
+    Evalúa las sanciones para un arreglo de fechas de cálculo expresadas en números de día,
+    con ``salario_mensual_sancion`` en centavos.
+    Devuelve un diccionario de arreglos con los días de mora y los valores redondeados a pesos,
+    con las mismas reglas que ``calculo.calcular_mora_liquidacion`` y
+    ``calculo.calcular_sancion_cesantias``.
+    """
+    dias_calculo = np.asarray(dias_calculo, dtype=np.int64)
+
+    dias_mora_liquidacion = np.maximum(dias_calculo - a_numero_de_dia(contrato.fecha_fin), 0)
+    indemnizacion_mora = a_pesos(prorrata(salario_mora_liquidacion(contrato), dias_mora_liquidacion, DIAS_MES))
+
+    anio = anio_sancion_cesantias(contrato)
+    if anio is None:
+        dias_mora_cesantias = np.zeros_like(dias_calculo)
+    else:
+        fecha_limite = a_numero_de_dia(fecha_limite_consignacion(anio))
+        dias_mora_cesantias = np.maximum(dias_calculo - fecha_limite, 0)
+    sancion_cesantias = a_pesos(prorrata(salario_mensual_sancion, dias_mora_cesantias, DIAS_MES))
+
+    return {
+        "dias_mora_liquidacion": dias_mora_liquidacion,
+        "indemnizacion_mora_liquidacion": indemnizacion_mora,
+        "dias_mora_cesantias": dias_mora_cesantias,
+        "sancion_mora_cesantias": sancion_cesantias,
+    }
+
+
+def curva_pretensiones(contrato, desprendibles, fechas_calculo, advertir=print):
+    """
+    Total de pretensiones para cada fecha de ``fechas_calculo`` (cualquier secuencia de
+    fechas). Devuelve un DataFrame indexado por ``fecha_calculo`` con los días de mora, las
+    sanciones, los totales de liquidación e indemnizaciones y el total de pretensiones.
+    La línea de tiempo de ``desprendibles`` se valida antes (ver ``validacion``) y las
+    advertencias se pasan a ``advertir``.
+    """
+    validar_desprendibles(desprendibles, contrato, advertir)
+    resultado = calcular_pretensiones(contrato, desprendibles)
+    fechas = pd.DatetimeIndex(pd.to_datetime(fechas_calculo), name='fecha_calculo')
+    sanciones = acumulacion_sanciones(contrato, resultado["salario_mensual_sancion_centavos"],
+                                      a_numero_de_dia(fechas))
+
+    indemnizacion_despido = resultado["indemnizaciones"]["indemnizacion_despido"]
+    df_curva = pd.DataFrame(sanciones, index=fechas)
+    df_curva["indemnizacion_despido"] = indemnizacion_despido
+    df_curva["total_indemnizaciones"] = (df_curva["indemnizacion_mora_liquidacion"] +
+                                         df_curva["sancion_mora_cesantias"] + indemnizacion_despido)
+    df_curva["total_liquidacion_no_pagada"] = resultado["total_liquidacion_no_pagada"]
+    df_curva["total_pretensiones"] = df_curva["total_liquidacion_no_pagada"] + df_curva["total_indemnizaciones"]
+    return df_curva
+
+
+def fechas_de_curva(desde, dias, fechas_adicionales=()):
+    """Fechas diarias desde ``desde`` durante ``dias`` días, más fechas puntuales (p. ej. audiencias)."""
+    fechas = pd.date_range(desde, periods=dias + 1, freq='D')
+    if fechas_adicionales:
+        fechas = fechas.union(pd.DatetimeIndex(pd.to_datetime(list(fechas_adicionales))))
+    return fechas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Curva del total de pretensiones por fecha de cálculo.")
+    parser.add_argument('--inicio', required=True, help="Fecha de inicio del contrato (AAAA-MM-DD)")
+    parser.add_argument('--fin', required=True, help="Fecha de terminación del contrato (AAAA-MM-DD)")
+    parser.add_argument('--salario', type=int, required=True, help="Salario base contractual mensual")
+    parser.add_argument('--paystubs', default='paystubs-summary.csv', help="CSV de desprendibles")
+    parser.add_argument('--desde', default=datetime.now().strftime('%Y-%m-%d'),
+                        help="Primera fecha de la curva (por defecto, hoy)")
+    parser.add_argument('--dias', type=int, default=730, help="Días a evaluar desde --desde")
+    parser.add_argument('--fechas', nargs='*', default=(), help="Fechas adicionales, p. ej. audiencias")
+    parser.add_argument('--salida', default=None, help="CSV de salida (por defecto, se imprime un resumen)")
+    args = parser.parse_args(argv)
+
+    fecha_desde = datetime.strptime(args.desde, '%Y-%m-%d')
+    contrato = Contrato(
+        fecha_inicio=datetime.strptime(args.inicio, '%Y-%m-%d'),
+        fecha_fin=datetime.strptime(args.fin, '%Y-%m-%d'),
+        salario_base=args.salario,
+        fecha_calculo=fecha_desde,
+    )
+    df_paystubs = cargar_paystubs_con_cache(args.paystubs)
+    validar_montos(df_paystubs)
+    desprendibles = Desprendibles.desde_dataframe(df_paystubs)
+    df_curva = curva_pretensiones(contrato, desprendibles, fechas_de_curva(fecha_desde, args.dias, args.fechas))
+
+    if args.salida:
+        df_curva.to_csv(args.salida, date_format='%Y-%m-%d')
+        print(f"{len(df_curva)} fechas evaluadas. Resultados en '{args.salida}'.")
+    else:
+        puntos = (df_curva.index.isin(pd.to_datetime([fecha_desde, *args.fechas])) |
+                  (df_curva.index == df_curva.index[-1]))
+        print(df_curva.loc[puntos].to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Carga y preprocesamiento de los desprendibles de nómina.
+
+Reúne los pasos que los scripts hacían a nivel de módulo (fechas, columnas numéricas,
+total de extras) y la conversión a arreglos NumPy compactos que usan los motores de cálculo.
+pandas se importa dentro de las funciones que lo usan, para que ``Desprendibles`` pueda
+importarse sin ese costo.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from liquidacion.perfil import anotar_filas, etapa
+from liquidacion.ventanas import a_numero_de_dia
+
+# Columnas de ingresos adicionales (extras)
+EXTRAS_COLS = ['sunday_bonus', 'holiday_bonus', 'night_bonus', 'day_overtime', 'night_overtime']
+NUMERIC_COLS = EXTRAS_COLS + ['base_salary', 'aux_transp']
+
+# Columna opcional que identifica al trabajador en tablas de nómina con varios empleados
+EMPLOYEE_COL = 'employee_id'
+
+
+def preprocesar_paystubs(df_paystubs, advertir=print):
+    """
+    Normaliza un DataFrame leído del CSV de desprendibles: convierte las fechas de periodo,
+    descarta filas con fechas inválidas, fuerza las columnas numéricas a enteros (NaN -> 0)
+    y calcula ``total_extras`` y ``year_month_period``. Modifica y devuelve ``df_paystubs``.
+    """
+    import pandas as pd
+
+    with etapa('preprocesamiento'):
+        anotar_filas(len(df_paystubs))
+        df_paystubs['Period_Start_Date'] = pd.to_datetime(df_paystubs['pay_period_starts'], errors='coerce')
+        df_paystubs['Period_End_Date'] = pd.to_datetime(df_paystubs['pay_period_ends'], errors='coerce')
+
+        if df_paystubs['Period_Start_Date'].isnull().any() or df_paystubs['Period_End_Date'].isnull().any():
+            advertir("Advertencia: Algunas fechas en 'pay_period_starts' o 'pay_period_ends' "
+                     "no pudieron ser convertidas.")
+            df_paystubs.dropna(subset=['Period_Start_Date', 'Period_End_Date'], inplace=True)
+
+        df_paystubs['year_month_period'] = df_paystubs['Period_Start_Date'].dt.to_period('M')
+
+        for col in NUMERIC_COLS:
+            if col in df_paystubs.columns:
+                df_paystubs[col] = pd.to_numeric(df_paystubs[col], errors='coerce').fillna(0).astype(int)
+            else:
+                advertir(f"Advertencia: La columna '{col}' no se encuentra en el CSV. Se asumirá como 0.")
+                df_paystubs[col] = 0
+
+        df_paystubs['total_extras'] = df_paystubs[EXTRAS_COLS].sum(axis=1)
+    return df_paystubs
+
+
+def cargar_paystubs(ruta_csv, advertir=print):
+    """Lee y preprocesa un CSV de desprendibles. Propaga ``FileNotFoundError``."""
+    import pandas as pd
+
+    with etapa('lectura_csv'):
+        df_paystubs = pd.read_csv(ruta_csv)
+    return preprocesar_paystubs(df_paystubs, advertir=advertir)
+
+
+class Desprendibles(NamedTuple):
+    """
+    Desprendibles de un trabajador como arreglos int64 paralelos: fechas en números de día
+    (ver ``ventanas.a_numero_de_dia``) y montos en pesos. Es la representación que se envía
+    a los procesos de cálculo, sin depender de pandas.
+    """
+    inicios: np.ndarray
+    fines: np.ndarray
+    base: np.ndarray
+    extras: np.ndarray
+    aux: np.ndarray
+
+    @classmethod
+    def desde_dataframe(cls, df_paystubs):
+        return cls(
+            a_numero_de_dia(df_paystubs['Period_Start_Date']),
+            a_numero_de_dia(df_paystubs['Period_End_Date']),
+            df_paystubs['base_salary'].to_numpy(dtype=np.int64),
+            df_paystubs['total_extras'].to_numpy(dtype=np.int64),
+            df_paystubs['aux_transp'].to_numpy(dtype=np.int64),
+        )
+
+
+def desprendibles_por_empleado(df_paystubs):
+    """
+    Agrupa una tabla de nómina con varios empleados (columna ``employee_id``) y devuelve un
+    diccionario ``{employee_id: Desprendibles}``, conservando el orden original de las filas.
+    """
+    return {
+        str(empleado): Desprendibles.desde_dataframe(grupo)
+        for empleado, grupo in df_paystubs.groupby(EMPLOYEE_COL, sort=False)
+    }
@@ -0,0 +1,126 @@
+"""
+Aritmética monetaria exacta con enteros.
+
+Los montos se manejan como arreglos int64 de centavos y las fracciones (días de solape /
+días del periodo, días / 360, tasas) se aplican con división entera redondeada, nunca con
+float64. Así el resultado no depende del orden de las sumas ni del motor (escalar, por
+lotes, por bloques o en varios procesos) y todos dan el mismo valor al centavo.
+
+Puntos de redondeo:
+1. Totales pro rata de cada ventana: del valor exacto al centavo, mitad al par.
+2. Promedios mensuales y salarios diarios que se reportan: al centavo, mitad al par.
+3. Cada partida e indemnización: de su valor exacto en centavos al peso, mitad hacia
+   arriba (``a_pesos``). Las partidas se suman ya redondeadas, como en el reporte.
+
+Solo depende de NumPy; todas las funciones aceptan escalares o arreglos.
+"""
+from math import lcm
+
+import numpy as np
+
+CENTAVOS_POR_PESO = 100
+PUNTOS_BASICOS = 10_000
+
+_MAXIMO_INT64 = int(np.iinfo(np.int64).max)
+# Mayor magnitud que se puede multiplicar por CENTAVOS_POR_PESO sin desbordar int64
+LIMITE_CENTAVOS = _MAXIMO_INT64 // CENTAVOS_POR_PESO
+
+
+def dividir_redondeando(numerador, denominador, mitad_arriba=False):
+    """
+    Cociente entero de ``numerador / denominador`` (denominador positivo) redondeado al
+    entero más cercano: los empates van al par o, con ``mitad_arriba``, hacia arriba.
+    Con enteros de Python se calcula sin NumPy (mismo resultado, sin el costo por llamada).
+    """
+    # Con enteros, 2 * resto + 1 > denominador equivale a 2 * resto >= denominador: sumar la
+    # paridad del cociente sube los empates solo cuando el cociente es impar
+    if type(numerador) is int and type(denominador) is int:
+        cociente, resto = divmod(numerador, denominador)
+        return cociente + int(2 * resto + (1 if mitad_arriba else cociente & 1) > denominador)
+    cociente, resto = np.divmod(np.asarray(numerador, dtype=np.int64), np.asarray(denominador, dtype=np.int64))
+    return cociente + (2 * resto + (1 if mitad_arriba else cociente & 1) > denominador)
+
+
+def prorrata(centavos, numerador, denominador):
+    """
+    ``centavos * numerador / denominador`` redondeado al centavo (mitad al par), con un solo
+    redondeo al final. Lanza ``OverflowError`` si el producto no cabe en int64.
+    """
+    if type(centavos) is int and type(numerador) is int and type(denominador) is int:
+        maximo = abs(centavos * numerador)
+    else:
+        centavos = np.asarray(centavos, dtype=np.int64)
+        maximo = int(np.abs(centavos).max(initial=0))
+        if type(numerador) is int:
+            maximo *= abs(numerador)
+        else:
+            numerador = np.asarray(numerador, dtype=np.int64)
+            maximo *= int(np.abs(numerador).max(initial=0))
+    if maximo > _MAXIMO_INT64:
+        raise OverflowError(f"El producto {maximo} no cabe en int64.")
+    return dividir_redondeando(centavos * numerador, denominador)
+
+
+def aplicar_tasa(centavos, tasa, numerador=1, denominador=1):
+    """
+    ``centavos * tasa * numerador / denominador`` redondeado al centavo. ``tasa`` (escalar o
+    arreglo) se toma en puntos básicos exactos, como se expresan las tasas legales.
+    """
+    escalada = np.asarray(tasa, dtype=np.float64) * PUNTOS_BASICOS
+    puntos = np.rint(escalada)
+    if np.abs(puntos - escalada).max(initial=0) > 1e-6:
+        raise ValueError(f"La tasa {tasa} tiene más precisión que un punto básico.")
+    puntos = int(puntos) if puntos.ndim == 0 else puntos.astype(np.int64)
+    return prorrata(centavos, numerador * puntos, denominador * PUNTOS_BASICOS)
+
+
+def pesos_a_centavos(pesos):
+    """Montos enteros en pesos (escalar o arreglo) a centavos int64."""
+    if isinstance(pesos, int):
+        return pesos * CENTAVOS_POR_PESO
+    pesos = np.asarray(pesos)
+    if pesos.dtype.kind == 'f':
+        if not np.array_equal(pesos, np.round(pesos)):
+            raise ValueError("Los montos en pesos deben ser enteros; use centavos_desde_float.")
+        pesos = pesos.astype(np.int64)
+    return pesos.astype(np.int64) * CENTAVOS_POR_PESO
+
+
+def centavos_desde_fraccion(numerador, denominador):
+    """Monto exacto ``numerador / denominador`` pesos (enteros) redondeado al centavo."""
+    return dividir_redondeando(np.asarray(numerador, dtype=np.int64) * CENTAVOS_POR_PESO, denominador)
+
+
+def centavos_desde_fracciones(numeradores, denominadores):
+    """
+    Suma exacta de ``numeradores[..., j] / denominadores[j]`` pesos (enteros), redondeada al
+    centavo, mitad al par. Cada término aporta su cociente entero y su resto; solo los restos
+    (menores que su denominador) se llevan al mínimo común múltiplo de los denominadores, y
+    si ese múltiplo por el número de términos no cabe en int64 la suma de los restos se hace
+    con enteros de Python, igual de exacta.
+    """
+    numeradores = np.asarray(numeradores, dtype=np.int64)
+    denominadores = np.asarray(denominadores, dtype=np.int64)
+    comun = lcm(*denominadores.tolist()) if denominadores.size else 1
+    cocientes, restos = np.divmod(numeradores * CENTAVOS_POR_PESO, denominadores)
+    cocientes = cocientes.sum(axis=-1)
+    if 2 * comun * max(denominadores.size, 1) <= _MAXIMO_INT64:
+        # El empate se decide con la paridad del cociente total, no la de la suma de restos
+        extra, resto = np.divmod((restos * (comun // denominadores)).sum(axis=-1), comun)
+        cocientes = cocientes + extra
+        return cocientes + (2 * resto + (cocientes & 1) > comun)
+    factores = [comun // denominador for denominador in denominadores.tolist()]
+    return np.array([dividir_redondeando(cociente * comun + sum(r * f for r, f in zip(fila, factores)), comun)
+                     for cociente, fila in zip(cocientes.reshape(-1).tolist(),
+                                               restos.reshape(-1, denominadores.size).tolist())],
+                    dtype=np.int64).reshape(cocientes.shape)
+
+
+def centavos_desde_float(pesos):
+    """Montos en pesos con decimales (float64) redondeados al centavo, mitad al par."""
+    return np.rint(np.asarray(pesos, dtype=np.float64) * CENTAVOS_POR_PESO).astype(np.int64)
+
+
+def a_pesos(centavos):
+    """Redondeo legal al peso: al más cercano, mitad hacia arriba."""
+    return dividir_redondeando(centavos, CENTAVOS_POR_PESO, mitad_arriba=True)
@@ -0,0 +1,191 @@
+"""
+Barrido de escenarios (análisis de sensibilidad) sobre los parámetros del contrato.
+
+Evalúa todas las combinaciones de fecha de terminación, salario base contractual, fecha de
+cálculo y opciones de inclusión (extras y auxilio de transporte en la base de prima y
+cesantías), y devuelve una tabla ordenada con una fila por escenario.
+
+Lo costoso se comparte entre escenarios:
+- El ``IndiceDiario`` se construye una vez por proceso de trabajo.
+- Las ventanas de prima, cesantías y vacaciones de todas las fechas de terminación se
+  consultan en un solo lote.
+- La liquidación depende solo de la fecha de terminación y de las opciones de inclusión;
+  el salario contractual y la fecha de cálculo solo afectan las indemnizaciones, que se
+  evalúan con broadcasting de NumPy sobre la grilla (salario x fecha de cálculo).
+
+Las fechas de terminación se reparten entre procesos con ``ProcessPoolExecutor``.
+
+Uso:
+    python -m liquidacion.escenarios --inicio 2023-04-17 --fines 2024-02-17 2024-03-31 \\
+        --salarios 2100000 2300000 --fechas-calculo 2025-05-22 2025-12-31 --extras ambos
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import product
+
+import numpy as np
+import pandas as pd
+
+from liquidacion.cache_paystubs import cargar_paystubs_con_cache
+from liquidacion.calculo import (Contrato, anio_sancion_cesantias, aplicar_minimo_sancion,
+                                 calcular_dias_laborados, calcular_partidas_liquidacion,
+                                 fecha_limite_consignacion, periodos_liquidacion, salario_diciembre,
+                                 salario_mensual_sancion_cesantias, salario_mora_liquidacion,
+                                 total_no_pagado, valores_liquidacion, ventanas_de_prima)
+from liquidacion.datos import Desprendibles
+from liquidacion.dinero import a_pesos, pesos_a_centavos, prorrata
+from liquidacion.indice_diario import IndiceDiario
+from liquidacion.parametros import DIAS_ANIO, DIAS_MES
+from liquidacion.validacion import validar_desprendibles, validar_montos
+from liquidacion.ventanas import a_numero_de_dia
+
+COLUMNAS_RESULTADO = ['fecha_fin', 'salario_base', 'fecha_calculo', 'incluir_extras', 'incluir_aux',
+                      'total_liquidacion_no_pagada', 'indemnizacion_mora_liquidacion',
+                      'sancion_mora_cesantias', 'indemnizacion_despido', 'total_indemnizaciones',
+                      'total_pretensiones']
+
+
+def _evaluar_bloque(trabajo):
+    """Evalúa todos los escenarios de un bloque de fechas de terminación (proceso de trabajo)."""
+    fecha_inicio, desprendibles, fechas_fin, salarios, dias_calculo, combinaciones = trabajo
+    indice = IndiceDiario(*desprendibles)
+    salarios = np.asarray(salarios, dtype=np.int64)
+    salarios_centavos = pesos_a_centavos(salarios)
+    dias_calculo = np.asarray(dias_calculo, dtype=np.int64)
+
+    # Todas las ventanas de todas las fechas de terminación en una sola consulta
+    planes, ventanas, es_prima = [], [], []
+    for fecha_fin in fechas_fin:
+        contrato = Contrato(fecha_inicio, fecha_fin, 0, fecha_fin)
+        primas, cesantias, ventanas_contrato = periodos_liquidacion(contrato)
+        planes.append((contrato, primas, cesantias, len(ventanas), len(ventanas_contrato)))
+        ventanas.extend(ventanas_contrato)
+        es_prima.extend(ventanas_de_prima(primas, cesantias))
+    totales = indice.totales_centavos(a_numero_de_dia([inicio for inicio, _ in ventanas]),
+                                      a_numero_de_dia([fin for _, fin in ventanas]))
+
+    valores_por_combinacion = [valores_liquidacion(totales, incluir_extras, incluir_aux, es_prima)
+                               for incluir_extras, incluir_aux in combinaciones]
+
+    forma = (len(combinaciones), salarios.size, dias_calculo.size)
+    bloques = []
+    for contrato, primas, cesantias, desde, cantidad in planes:
+        totales_contrato = {clave: arreglo[desde:desde + cantidad] for clave, arreglo in totales.items()}
+        totales_liquidacion = []
+        for valores in valores_por_combinacion:
+            partidas, totales_cesantias_por_anio = calcular_partidas_liquidacion(
+                contrato, primas, cesantias, totales_contrato,
+                valores={clave: arreglo[desde:desde + cantidad] for clave, arreglo in valores.items()})
+            totales_liquidacion.append(total_no_pagado(partidas))
+        total_liquidacion = np.asarray(totales_liquidacion, dtype=np.int64)[:, None, None]
+
+        # Mora en liquidación (Art. 65 CST): grilla salario x fecha de cálculo
+        dias_mora = np.maximum(dias_calculo - a_numero_de_dia(contrato.fecha_fin), 0)
+        mora = a_pesos(prorrata(salario_mora_liquidacion(contrato, salarios)[:, None], dias_mora[None, :], DIAS_MES))
+
+        # Sanción por no consignación de cesantías (Ley 50/90 Art. 99)
+        anio = anio_sancion_cesantias(contrato)
+        if anio is None:
+            sancion = np.zeros((salarios.size, dias_calculo.size), dtype=np.int64)
+        else:
+            salario_sancion, _ = salario_mensual_sancion_cesantias(
+                contrato, salario_diciembre(desprendibles, anio), totales_cesantias_por_anio)
+            # Sin salario de diciembre en los desprendibles se usa el salario contractual de cada escenario
+            salario_sancion = aplicar_minimo_sancion(contrato, salarios_centavos if salario_sancion is None
+                                                     else np.full(salarios.size, salario_sancion, dtype=np.int64))
+            dias_sancion = np.maximum(dias_calculo - a_numero_de_dia(fecha_limite_consignacion(anio)), 0)
+            sancion = a_pesos(prorrata(salario_sancion[:, None], dias_sancion[None, :], DIAS_MES))
+
+        dias_servicio = calcular_dias_laborados(contrato.fecha_inicio, contrato.fecha_fin)
+        despido = a_pesos(prorrata(salarios_centavos, dias_servicio, DIAS_ANIO))[:, None]
+
+        total_indemnizaciones = mora + sancion + despido
+        bloques.append({
+            "fecha_fin": np.full(int(np.prod(forma)), a_numero_de_dia(contrato.fecha_fin), dtype=np.int64),
+            "salario_base": np.broadcast_to(salarios[None, :, None], forma).ravel(),
+            "fecha_calculo": np.broadcast_to(dias_calculo[None, None, :], forma).ravel(),
+            "incluir_extras": np.broadcast_to(np.array([c[0] for c in combinaciones])[:, None, None], forma).ravel(),
+            "incluir_aux": np.broadcast_to(np.array([c[1] for c in combinaciones])[:, None, None], forma).ravel(),
+            "total_liquidacion_no_pagada": np.broadcast_to(total_liquidacion, forma).ravel(),
+            "indemnizacion_mora_liquidacion": np.broadcast_to(mora, forma).ravel(),
+            "sancion_mora_cesantias": np.broadcast_to(sancion, forma).ravel(),
+            "indemnizacion_despido": np.broadcast_to(despido, forma).ravel(),
+            "total_indemnizaciones": np.broadcast_to(total_indemnizaciones, forma).ravel(),
+            "total_pretensiones": (total_liquidacion + total_indemnizaciones[None, :, :]).ravel(),
+        })
+    return {col: np.concatenate([b[col] for b in bloques]) for col in COLUMNAS_RESULTADO} if bloques else None
+
+
+def barrido_escenarios(fecha_inicio, desprendibles, fechas_fin, salarios, fechas_calculo,
+                       incluir_extras=(True,), incluir_aux=(True,), procesos=1, advertir=print):
+    """
+    Evalúa el producto cartesiano de ``fechas_fin`` x ``salarios`` x ``fechas_calculo`` x
+    ``incluir_extras`` x ``incluir_aux`` para un contrato que inicia en ``fecha_inicio``.
+    ``desprendibles`` es un ``datos.Desprendibles``. Devuelve un DataFrame con una fila por
+    escenario y valores enteros en pesos.
+
+    La línea de tiempo de ``desprendibles`` se valida una vez (ver ``validacion``) contra el
+    contrato más largo del barrido, hasta la última de ``fechas_fin``; las advertencias se
+    pasan a ``advertir``.
+    """
+    fechas_fin = [pd.Timestamp(f).to_pydatetime() for f in fechas_fin]
+    if fechas_fin:
+        validar_desprendibles(desprendibles, Contrato(fecha_inicio, max(fechas_fin), 0, max(fechas_fin)), advertir)
+    dias_calculo = a_numero_de_dia(pd.to_datetime(list(fechas_calculo)))
+    combinaciones = list(product(incluir_extras, incluir_aux))
+
+    procesos = procesos or os.cpu_count() or 1
+    num_bloques = min(len(fechas_fin), procesos * 4) if procesos > 1 else 1
+    trabajos = [(fecha_inicio, desprendibles, fechas_fin[i::num_bloques], salarios, dias_calculo, combinaciones)
+                for i in range(num_bloques)]
+
+    if procesos == 1 or len(trabajos) <= 1:
+        resultados = [_evaluar_bloque(trabajo) for trabajo in trabajos]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            resultados = list(executor.map(_evaluar_bloque, trabajos))
+    resultados = [r for r in resultados if r is not None]
+    if not resultados:
+        return pd.DataFrame(columns=COLUMNAS_RESULTADO)
+
+    df_escenarios = pd.DataFrame({col: np.concatenate([r[col] for r in resultados]) for col in COLUMNAS_RESULTADO})
+    for col in ('fecha_fin', 'fecha_calculo'):
+        df_escenarios[col] = df_escenarios[col].to_numpy().astype('datetime64[D]')
+    df_escenarios['salario_base'] = df_escenarios['salario_base'].astype(np.int64)
+    return df_escenarios.sort_values(COLUMNAS_RESULTADO[:5], ignore_index=True)
+
+
+def _opciones(valor):
+    return {'si': (True,), 'no': (False,), 'ambos': (True, False)}[valor]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Barrido de escenarios sobre los parámetros del contrato.")
+    parser.add_argument('--inicio', required=True, help="Fecha de inicio del contrato (AAAA-MM-DD)")
+    parser.add_argument('--fines', nargs='+', required=True, help="Fechas de terminación a evaluar")
+    parser.add_argument('--salarios', nargs='+', type=int, required=True, help="Salarios base contractuales")
+    parser.add_argument('--fechas-calculo', nargs='+', required=True, help="Fechas de cálculo a evaluar")
+    parser.add_argument('--extras', choices=['si', 'no', 'ambos'], default='si',
+                        help="Incluir las extras en la base de prima y cesantías")
+    parser.add_argument('--aux', choices=['si', 'no', 'ambos'], default='si',
+                        help="Incluir el auxilio de transporte en la base de prima y cesantías")
+    parser.add_argument('--paystubs', default='paystubs-summary.csv', help="CSV de desprendibles")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos (por defecto, núcleos)")
+    parser.add_argument('--salida', default='escenarios.csv', help="CSV de resultados")
+    args = parser.parse_args(argv)
+
+    df_paystubs = cargar_paystubs_con_cache(args.paystubs)
+    validar_montos(df_paystubs)
+    desprendibles = Desprendibles.desde_dataframe(df_paystubs)
+    df_escenarios = barrido_escenarios(
+        datetime.strptime(args.inicio, '%Y-%m-%d'), desprendibles,
+        [datetime.strptime(f, '%Y-%m-%d') for f in args.fines], args.salarios, args.fechas_calculo,
+        _opciones(args.extras), _opciones(args.aux), procesos=args.procesos)
+    df_escenarios.to_csv(args.salida, index=False, date_format='%Y-%m-%d')
+    print(f"{len(df_escenarios)} escenarios evaluados. Resultados en '{args.salida}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Exportación estructurada de los resultados en CSV, JSON Lines o XLSX, trabajador por trabajador.
+
+Los reportes de ``reportes`` son texto para leer; para liquidar miles de trabajadores se
+necesitan tablas que otro programa pueda cargar. Cada trabajador aporta filas a cinco tablas,
+con montos enteros en pesos y sin texto mezclado en las columnas numéricas (un valor que no
+aplica queda vacío, no como ``""`` dentro de una columna de números):
+
+- ``mensual``: resumen financiero mensual (ver ``mensual.tabla_mensual``).
+- ``partidas``: cada partida de la liquidación con su tipo y estado.
+- ``sanciones``: indemnización por mora, sanción de cesantías y despido, con sus días,
+  salario diario y año sancionado en columnas propias.
+- ``totales``: la fila de ``calculo.resumen_pretensiones``.
+- ``advertencias``: una fila por advertencia del cálculo.
+
+Los exportadores escriben a medida que reciben cada trabajador (``escribir``) y no guardan
+filas en memoria: ``csv.writer`` sobre un archivo por tabla, una línea JSON por trabajador
+o un libro de openpyxl en modo ``write_only`` con una hoja por tabla (que continúa en otra
+hoja al llegar al límite de filas de Excel). openpyxl solo se importa para XLSX.
+
+La memoria acotada es solo la de la escritura: quien llama sigue teniendo los datos de
+entrada. ``lote.exportar_lote`` recibe los desprendibles de todos los trabajadores (cada
+archivo de nómina se carga completo con pandas en ``lote.preparar_trabajos``) y devuelve una
+fila de resumen y las advertencias de cada uno; para nóminas que no caben en memoria, ver
+``bloques``.
+
+Uso:
+    with abrir_exportador('resultados.xlsx') as exportador:
+        for contrato, resultado, df_mensual in ...:
+            exportador.escribir(contrato, resultado, df_mensual)
+"""
+import csv
+import json
+import os
+
+from liquidacion.calculo import resumen_pretensiones
+
+FORMATOS = ['csv', 'jsonl', 'xlsx']
+
+COLUMNAS = {
+    "mensual": ['employee_id', 'mes', 'salario_base', 'extras', 'salario_total', 'auxilio_transporte', 'ibc',
+                'aporte_pension'],
+    "partidas": ['employee_id', 'orden', 'tipo', 'concepto', 'valor', 'estado'],
+    "sanciones": ['employee_id', 'sancion', 'valor', 'dias', 'salario_diario', 'anio'],
+    "totales": ['employee_id', 'fecha_inicio', 'fecha_fin', 'fecha_calculo', 'salario_base', 'primas_pagadas',
+                'prima_no_pagada', 'cesantias', 'intereses_cesantias', 'vacaciones', 'total_liquidacion_no_pagada',
+                'indemnizacion_mora_liquidacion', 'dias_mora_liquidacion', 'salario_diario_mora_liquidacion',
+                'sancion_mora_cesantias', 'anio_sancion_cesantias', 'dias_mora_cesantias',
+                'salario_diario_sancion_cesantias', 'indemnizacion_despido', 'total_indemnizaciones',
+                'total_pretensiones'],
+    "advertencias": ['employee_id', 'advertencia'],
+}
+# Filas por hoja de Excel (incluido el encabezado)
+MAX_FILAS_XLSX = 1_048_576
+
+
+def _entero(valor):
+    """Entero de Python (no de NumPy, para JSON) o ``None``."""
+    return None if valor is None else int(valor)
+
+
+def tablas_trabajador(contrato, resultado, df_mensual=None):
+    """
+    Filas de cada tabla de ``COLUMNAS`` para un trabajador: ``{tabla: [tupla, ...]}`` con los
+    valores en el orden de las columnas. ``resultado`` es el de ``calculo.calcular_pretensiones``
+    y ``df_mensual`` el de ``mensual.resumen_mensual`` (opcional) para ese trabajador.
+    """
+    empleado = contrato.employee_id
+    mensual = []
+    if df_mensual is not None:
+        # Columnas de ``tabla_mensual`` por posición: la de empleado, si está, se omite
+        columnas = [col for col in df_mensual.columns if col != 'employee_id'][:len(COLUMNAS["mensual"]) - 1]
+        for fila in df_mensual[columnas].itertuples(index=False, name=None):
+            mensual.append((empleado, str(fila[0]), *(int(valor) for valor in fila[1:])))
+
+    partidas = [(empleado, orden, partida["Tipo"], partida["Concepto"], int(partida["Valor"]), partida["Estado"])
+                for orden, partida in enumerate(resultado["liquidacion"], start=1)]
+
+    detalle = resultado["indemnizaciones"]
+    sanciones = [(empleado, 'mora_liquidacion', detalle["indemnizacion_mora_liquidacion"],
+                  detalle["dias_mora_liquidacion"], detalle["salario_diario_mora_liquidacion"], None)]
+    if detalle["anio_sancion_cesantias"] is not None:
+        sanciones.append((empleado, 'sancion_cesantias', detalle["sancion_mora_cesantias"],
+                          detalle["dias_mora_cesantias"], detalle["salario_diario_sancion_cesantias"],
+                          detalle["anio_sancion_cesantias"]))
+    sanciones.append((empleado, 'despido', detalle["indemnizacion_despido"], None, None, None))
+    sanciones = [(empleado, sancion, *(_entero(valor) for valor in valores))
+                 for empleado, sancion, *valores in sanciones]
+
+    fila_totales = resumen_pretensiones(contrato, resultado)
+    totales = [tuple(fila_totales[col] if isinstance(fila_totales[col], str) else _entero(fila_totales[col])
+                     for col in COLUMNAS["totales"])]
+    advertencias = [(empleado, texto) for texto in resultado["advertencias"]]
+    return {"mensual": mensual, "partidas": partidas, "sanciones": sanciones, "totales": totales,
+            "advertencias": advertencias}
+
+
+class Exportador:
+    """Base de los exportadores: ``escribir`` por trabajador y ``cerrar`` al final (o ``with``)."""
+
+    def __init__(self):
+        self.trabajadores = 0
+
+    def escribir(self, contrato, resultado, df_mensual=None):
+        self._escribir_tablas(contrato.employee_id, tablas_trabajador(contrato, resultado, df_mensual))
+        self.trabajadores += 1
+
+    def _escribir_tablas(self, empleado, tablas):
+        raise NotImplementedError
+
+    def cerrar(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+class ExportadorCSV(Exportador):
+    """Un CSV por tabla (``mensual.csv``, ``partidas.csv``, ...) dentro de la carpeta ``ruta``."""
+
+    def __init__(self, ruta):
+        super().__init__()
+        os.makedirs(ruta, exist_ok=True)
+        self._archivos, self._escritores = {}, {}
+        for tabla, columnas in COLUMNAS.items():
+            archivo = open(os.path.join(ruta, f'{tabla}.csv'), 'w', newline='', encoding='utf-8')
+            self._archivos[tabla] = archivo
+            self._escritores[tabla] = csv.writer(archivo)
+            self._escritores[tabla].writerow(columnas)
+
+    def _escribir_tablas(self, empleado, tablas):
+        for tabla, filas in tablas.items():
+            self._escritores[tabla].writerows(filas)
+
+    def cerrar(self):
+        for archivo in self._archivos.values():
+            archivo.close()
+
+
+class ExportadorJSONL(Exportador):
+    """
+    Una línea JSON por trabajador: ``employee_id``, ``totales`` (objeto) y las demás tablas
+    como listas de objetos, sin repetir ``employee_id`` en cada fila.
+    """
+
+    def __init__(self, ruta):
+        super().__init__()
+        self._archivo = open(ruta, 'w', encoding='utf-8')
+
+    def _escribir_tablas(self, empleado, tablas):
+        registro = {"employee_id": empleado}
+        for tabla, filas in tablas.items():
+            columnas = COLUMNAS[tabla][1:]
+            if tabla == "advertencias":
+                registro[tabla] = [fila[1] for fila in filas]
+            elif tabla == "totales":
+                registro[tabla] = dict(zip(columnas, filas[0][1:]))
+            else:
+                registro[tabla] = [dict(zip(columnas, fila[1:])) for fila in filas]
+        self._archivo.write(json.dumps(registro, ensure_ascii=False))
+        self._archivo.write("\n")
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class ExportadorXLSX(Exportador):
+    """
+    Libro con una hoja por tabla, escrito en modo ``write_only`` de openpyxl. Una tabla con
+    más de ``max_filas`` filas (encabezado incluido) continúa en ``tabla_2``, ``tabla_3``...
+    """
+
+    def __init__(self, ruta, max_filas=MAX_FILAS_XLSX):
+        super().__init__()
+        try:
+            from openpyxl import Workbook
+        except ImportError as error:
+            raise ImportError("La exportación a XLSX requiere 'openpyxl' (pip install openpyxl).") from error
+        self.ruta = ruta
+        self.max_filas = max_filas
+        self._libro = Workbook(write_only=True)
+        # Hoja actual de cada tabla, filas escritas en ella y número de hojas de la tabla
+        self._hojas = {}
+        for tabla in COLUMNAS:
+            self._nueva_hoja(tabla, 1)
+
+    def _nueva_hoja(self, tabla, numero):
+        hoja = self._libro.create_sheet(tabla if numero == 1 else f'{tabla}_{numero}')
+        hoja.append(COLUMNAS[tabla])
+        self._hojas[tabla] = [hoja, 1, numero]
+
+    def _escribir_tablas(self, empleado, tablas):
+        for tabla, filas in tablas.items():
+            for fila in filas:
+                hoja, escritas, numero = self._hojas[tabla]
+                if escritas >= self.max_filas:
+                    self._nueva_hoja(tabla, numero + 1)
+                    hoja = self._hojas[tabla][0]
+                hoja.append(fila)
+                self._hojas[tabla][1] += 1
+
+    def cerrar(self):
+        if self._libro is not None:
+            self._libro.save(self.ruta)
+            self._libro = None
+
+
+def formato_de_ruta(ruta):
+    """Formato según la extensión: ``.jsonl``, ``.xlsx`` o, en otro caso, carpeta de CSV."""
+    extension = os.path.splitext(ruta)[1].lower()
+    return {'.jsonl': 'jsonl', '.xlsx': 'xlsx'}.get(extension, 'csv')
+
+
+def abrir_exportador(ruta, formato=None):
+    """Exportador de ``formato`` (por defecto, el de ``formato_de_ruta``) que escribe en ``ruta``."""
+    formato = formato or formato_de_ruta(ruta)
+    clases = {'csv': ExportadorCSV, 'jsonl': ExportadorJSONL, 'xlsx': ExportadorXLSX}
+    if formato not in clases:
+        raise ValueError(f"Formato de exportación desconocido: {formato!r} (use {', '.join(FORMATOS)}).")
+    return clases[formato](ruta)
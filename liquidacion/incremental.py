@@ -0,0 +1,350 @@
+"""
+Recálculo incremental de un contrato cuando se agregan desprendibles o avanza la fecha de cálculo.
+
+El CSV de desprendibles crece con un desprendible por quincena y el total cambia todos los
+días por las sanciones, pero la mayor parte del cálculo no cambia. ``LiquidacionIncremental``
+conserva el estado derivado del contrato:
+
+- Los totales pro rata exactos de cada ventana (primas, cesantías y vacaciones) como
+  numeradores enteros por duración de desprendible (``bloques.AcumuladorPeriodos``), sus
+  totales en centavos y sus valores de liquidación.
+- El salario base de diciembre del año sancionado.
+- Las sumas mensuales de salario base, extras y auxilio.
+
+Al agregar desprendibles solo se recalculan las ventanas que se solapan con ellos y los
+meses que tocan; al mover la fecha de cálculo solo cambian los términos de las sanciones.
+Las partidas y las sanciones se rearman desde los valores guardados (unas pocas filas por
+contrato) y ``cambios_pretensiones`` compara el resultado con el anterior. El costo de cada
+actualización depende de los desprendibles nuevos, no del historial, y el resultado es el
+mismo que el de ``calculo.calcular_pretensiones`` con todos los desprendibles.
+
+Desde la línea de comandos el estado se guarda en un archivo ``.npz`` junto con la posición
+del CSV hasta la que se leyó y el SHA-256 de todos los bytes anteriores: las ejecuciones
+siguientes vuelven a calcular ese hash (sin interpretar las filas) y solo leen como tabla
+las filas agregadas al final. Si el hash no coincide, porque se editó, quitó o reordenó
+cualquier fila ya leída (o cambian los parámetros del contrato), el estado se reconstruye
+desde cero.
+
+Uso:
+    python -m liquidacion.incremental --inicio 2023-04-17 --fin 2024-02-17 --salario 2100000 \\
+        --paystubs paystubs-summary.csv [--fecha-calculo 2025-05-22] [--estado estado.npz] \\
+        [--mensual resumen-mensual.csv]
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+
+from liquidacion.bloques import AcumuladorPeriodos
+from liquidacion.calculo import (Contrato, anio_sancion_cesantias, periodos_liquidacion, pretensiones_desde_totales,
+                                 salario_diciembre, valores_liquidacion, ventanas_de_prima)
+from liquidacion.datos import Desprendibles
+from liquidacion.mensual import TASA_PENSION_EMPLEADOR, TASA_PENSION_TOTAL, agregar_por_mes, clave_mes, tabla_mensual
+from liquidacion.perfil import anotar_filas, etapa
+from liquidacion.validacion import validar_agregados, validar_paystubs
+from liquidacion.ventanas import a_numero_de_dia
+
+# Cambiar este valor invalida los estados guardados con un formato anterior
+VERSION_ESTADO = 2
+# Tamaño de los trozos en que se lee el CSV ya procesado para calcular su hash
+BYTES_LECTURA = 1 << 20
+
+_CLAVES_INDEMNIZACIONES = ["indemnizacion_mora_liquidacion", "sancion_mora_cesantias", "indemnizacion_despido"]
+_CLAVES_TOTALES = ["total_liquidacion_no_pagada", "total_indemnizaciones", "total_pretensiones"]
+
+
+class LiquidacionIncremental:
+    """
+    Estado derivado de la liquidación de un contrato, actualizable con desprendibles nuevos
+    (``agregar``) y con otra fecha de cálculo (``mover_fecha_calculo``). ``resultado`` es
+    siempre el diccionario de ``calculo.calcular_pretensiones`` con todo lo agregado.
+    """
+
+    def __init__(self, contrato, incluir_extras=True, incluir_aux=True):
+        self.contrato = contrato
+        self.incluir_extras = incluir_extras
+        self.incluir_aux = incluir_aux
+        self.primas, self.cesantias, ventanas = periodos_liquidacion(contrato)
+        self.es_prima = ventanas_de_prima(self.primas, self.cesantias)
+        self.periodos = AcumuladorPeriodos(np.zeros(len(ventanas), dtype=np.int64),
+                                           a_numero_de_dia([inicio for inicio, _ in ventanas]),
+                                           a_numero_de_dia([fin for _, fin in ventanas]))
+        self.anio_sancion = anio_sancion_cesantias(contrato)
+        # (suma, hay_desprendibles) de ``calculo.salario_diciembre`` del año sancionado
+        self.diciembre = (0, False)
+        # {mes (clave_mes): [base, extras, aux]}
+        self.meses = {}
+        self.filas = 0
+        self.ultimo_fin = None
+        self.totales = self.periodos.totales_centavos()
+        self.valores = valores_liquidacion(self.totales, incluir_extras, incluir_aux, self.es_prima)
+        self.resultado = self._pretensiones()
+
+    def _pretensiones(self):
+        return pretensiones_desde_totales(self.contrato, self.primas, self.cesantias, self.totales, self.diciembre,
+                                          self.incluir_extras, self.incluir_aux, valores=self.valores)
+
+    def agregar(self, desprendibles, advertir=print):
+        """
+        Incorpora ``desprendibles`` (``datos.Desprendibles``) y actualiza el resultado.
+        Devuelve los cambios de ``cambios_pretensiones`` más ``"ventanas"`` (índices de las
+        ventanas recalculadas) y ``"meses"`` (``AAAA-MM`` de los meses del resumen que cambiaron).
+        """
+        inicios = np.asarray(desprendibles.inicios, dtype=np.int64)
+        fines = np.asarray(desprendibles.fines, dtype=np.int64)
+        if inicios.size == 0:
+            return {**cambios_pretensiones(self.resultado, self.resultado), "ventanas": [], "meses": []}
+        if self.ultimo_fin is not None:
+            anteriores = int(np.count_nonzero(inicios <= self.ultimo_fin))
+            if anteriores:
+                advertir(f"Advertencia: {anteriores} desprendible(s) agregado(s) empiezan en o antes del "
+                         f"{np.datetime64(self.ultimo_fin, 'D')}, fin del último ya procesado; "
+                         "revise si están duplicados o solapados.")
+
+        with etapa('incremental_ventanas'):
+            anotar_filas(inicios.size)
+            ventanas = self.periodos.agregar(np.zeros(inicios.size, dtype=np.int64), inicios, fines,
+                                             desprendibles.base, desprendibles.extras, desprendibles.aux)
+            if ventanas.size:
+                totales = self.periodos.totales_centavos(ventanas)
+                valores = valores_liquidacion(totales, self.incluir_extras, self.incluir_aux, self.es_prima[ventanas])
+                for clave in ("base", "extras", "aux"):
+                    self.totales[clave][ventanas] = totales[clave]
+                for clave, arreglo in valores.items():
+                    self.valores[clave][ventanas] = arreglo
+
+        if self.anio_sancion is not None:
+            suma, hay = salario_diciembre(desprendibles, self.anio_sancion)
+            self.diciembre = (self.diciembre[0] + suma, self.diciembre[1] or hay)
+
+        with etapa('incremental_mensual'):
+            _, meses, sumas = agregar_por_mes(np.zeros(inicios.size), clave_mes(inicios),
+                                              np.stack([desprendibles.base, desprendibles.extras, desprendibles.aux]))
+            for mes, suma in zip(meses.tolist(), sumas.T.tolist()):
+                anterior = self.meses.get(mes, [0, 0, 0])
+                self.meses[mes] = [a + b for a, b in zip(anterior, suma)]
+
+        self.filas += inicios.size
+        fin = int(fines.max())
+        self.ultimo_fin = fin if self.ultimo_fin is None else max(self.ultimo_fin, fin)
+
+        anterior = self.resultado
+        self.resultado = self._pretensiones()
+        return {**cambios_pretensiones(anterior, self.resultado), "ventanas": ventanas.tolist(),
+                "meses": np.datetime_as_string(meses.astype('datetime64[M]')).tolist()}
+
+    def mover_fecha_calculo(self, fecha_calculo):
+        """
+        Cambia la fecha de cálculo: solo se rearman las sanciones, con los valores de
+        liquidación ya guardados. Devuelve los cambios de ``cambios_pretensiones``.
+        """
+        anterior = self.resultado
+        if fecha_calculo != self.contrato.fecha_calculo:
+            self.contrato = replace(self.contrato, fecha_calculo=fecha_calculo)
+            self.resultado = self._pretensiones()
+        return cambios_pretensiones(anterior, self.resultado)
+
+    def resumen_mensual(self, tasa_pension=TASA_PENSION_EMPLEADOR):
+        """Como ``mensual.resumen_mensual`` con el contrato, desde las sumas mensuales guardadas."""
+        desde, hasta = clave_mes(self.contrato.fecha_inicio), clave_mes(self.contrato.fecha_fin)
+        meses = np.array(sorted(mes for mes in self.meses if desde <= mes <= hasta), dtype=np.int64)
+        sumas = np.array([self.meses[mes] for mes in meses.tolist()], dtype=np.int64).reshape(-1, 3).T
+        return tabla_mensual(meses, sumas, tasa_pension)
+
+    # ============================
+    # Persistencia
+    # ============================
+
+    def _parametros(self):
+        return {"fecha_inicio": self.contrato.fecha_inicio.strftime('%Y-%m-%d'),
+                "fecha_fin": self.contrato.fecha_fin.strftime('%Y-%m-%d'),
+                "salario_base": self.contrato.salario_base, "employee_id": self.contrato.employee_id,
+                "incluir_extras": self.incluir_extras, "incluir_aux": self.incluir_aux}
+
+    def guardar(self, ruta, origen=None):
+        """
+        Escribe el estado en ``ruta`` (``.npz``) de forma atómica. ``origen`` describe la
+        posición leída del CSV (ver ``leer_filas_nuevas``).
+        """
+        meta = {"version": VERSION_ESTADO, "parametros": self._parametros(),
+                "fecha_calculo": self.contrato.fecha_calculo.strftime('%Y-%m-%d'),
+                "diciembre": list(self.diciembre), "filas": self.filas, "ultimo_fin": self.ultimo_fin,
+                "origen": origen}
+        meses = np.array(sorted(self.meses), dtype=np.int64)
+        temporal = ruta + '.tmp'
+        with open(temporal, 'wb') as archivo:
+            np.savez(archivo, meta=np.array(json.dumps(meta, ensure_ascii=False)),
+                     duraciones=self.periodos.duraciones, numeradores=self.periodos.numeradores, meses=meses,
+                     sumas_mensuales=np.array([self.meses[mes] for mes in meses.tolist()],
+                                              dtype=np.int64).reshape(-1, 3))
+        os.replace(temporal, ruta)
+
+    @classmethod
+    def cargar(cls, ruta, contrato, incluir_extras=True, incluir_aux=True):
+        """
+        Lee el estado de ``ruta`` si corresponde a ``contrato`` (sin importar su fecha de
+        cálculo, que se aplica después). Devuelve ``(liquidacion, origen)`` o ``(None, None)``
+        si no hay estado utilizable.
+        """
+        try:
+            with np.load(ruta, allow_pickle=False) as datos:
+                meta = json.loads(str(datos['meta']))
+                arreglos = {clave: datos[clave] for clave in datos.files if clave != 'meta'}
+        except (FileNotFoundError, ValueError, KeyError, OSError):
+            return None, None
+        liquidacion = cls(contrato, incluir_extras, incluir_aux)
+        if meta.get("version") != VERSION_ESTADO or meta["parametros"] != liquidacion._parametros():
+            return None, None
+
+        liquidacion.periodos.duraciones = arreglos['duraciones']
+        liquidacion.periodos.numeradores = arreglos['numeradores']
+        liquidacion.diciembre = (meta["diciembre"][0], meta["diciembre"][1])
+        liquidacion.meses = dict(zip(arreglos['meses'].tolist(), arreglos['sumas_mensuales'].tolist()))
+        liquidacion.filas = meta["filas"]
+        liquidacion.ultimo_fin = meta["ultimo_fin"]
+        liquidacion.contrato = replace(contrato, fecha_calculo=datetime.strptime(meta["fecha_calculo"], '%Y-%m-%d'))
+        liquidacion.totales = liquidacion.periodos.totales_centavos()
+        liquidacion.valores = valores_liquidacion(liquidacion.totales, incluir_extras, incluir_aux,
+                                                  liquidacion.es_prima)
+        liquidacion.resultado = liquidacion._pretensiones()
+        return liquidacion, meta["origen"]
+
+
+def cambios_pretensiones(anterior, nuevo):
+    """
+    Partidas que cambiaron entre dos resultados de ``calculo.calcular_pretensiones`` del
+    mismo contrato: liquidación, indemnizaciones y totales. Devuelve ``{"partidas": [...]}``
+    con ``{"Concepto", "Anterior", "Nuevo", "Diferencia"}`` por partida, en el orden del reporte.
+    """
+    cambios = []
+
+    def comparar(concepto, valor_anterior, valor_nuevo):
+        if valor_anterior != valor_nuevo:
+            cambios.append({"Concepto": concepto, "Anterior": valor_anterior, "Nuevo": valor_nuevo,
+                            "Diferencia": valor_nuevo - valor_anterior})
+
+    for partida_anterior, partida in zip(anterior["liquidacion"], nuevo["liquidacion"]):
+        comparar(partida["Concepto"], partida_anterior["Valor"], partida["Valor"])
+    for clave in _CLAVES_INDEMNIZACIONES:
+        comparar(clave, anterior["indemnizaciones"][clave], nuevo["indemnizaciones"][clave])
+    for clave in _CLAVES_TOTALES:
+        comparar(clave, anterior[clave], nuevo[clave])
+    return {"partidas": cambios}
+
+
+# ============================
+# Lectura de las filas agregadas al CSV
+# ============================
+
+def _hashear_hasta(archivo, huella, posicion):
+    """Agrega a ``huella`` los bytes de ``archivo`` hasta ``posicion`` (o hasta el final)."""
+    while archivo.tell() < posicion:
+        trozo = archivo.read(min(BYTES_LECTURA, posicion - archivo.tell()))
+        if not trozo:
+            break
+        huella.update(trozo)
+
+
+def leer_filas_nuevas(ruta_csv, origen=None, advertir=print):
+    """
+    Lee las filas del CSV posteriores a la posición de ``origen`` (de una lectura anterior)
+    y las preprocesa. Devuelve ``(df_nuevas, origen_nuevo, completo)``: con ``completo`` en
+    True se leyó el archivo entero porque no había ``origen`` o el SHA-256 de los bytes
+    anteriores a esa posición ya no es el guardado. ``df_nuevas`` es ``None`` si no hay
+    filas nuevas. Propaga ``FileNotFoundError``.
+    """
+    import pandas as pd
+
+    from liquidacion.datos import preprocesar_paystubs
+
+    with open(ruta_csv, 'rb') as archivo:
+        encabezado = archivo.readline()
+        huella = hashlib.sha256(encabezado)
+        completo = True
+        if origen is not None and origen["posicion"] >= len(encabezado):
+            _hashear_hasta(archivo, huella, origen["posicion"])
+            completo = archivo.tell() != origen["posicion"] or huella.hexdigest() != origen["huella"]
+        if completo:
+            archivo.seek(len(encabezado))
+            huella = hashlib.sha256(encabezado)
+        nuevos = archivo.read()
+        huella.update(nuevos)
+        posicion = archivo.tell()
+
+    origen_nuevo = {"ruta": os.path.abspath(ruta_csv), "posicion": posicion, "huella": huella.hexdigest()}
+    if not nuevos.strip():
+        return None, origen_nuevo, completo
+    with etapa('lectura_csv'):
+        df_nuevas = pd.read_csv(io.BytesIO(encabezado + nuevos))
+    if df_nuevas.empty:
+        return None, origen_nuevo, completo
+    return preprocesar_paystubs(df_nuevas, advertir=advertir), origen_nuevo, completo
+
+
+def _fecha(texto):
+    return datetime.strptime(texto, '%Y-%m-%d')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recálculo incremental de las pretensiones de un contrato.")
+    parser.add_argument('--inicio', type=_fecha, required=True, help="Fecha de inicio del contrato (AAAA-MM-DD)")
+    parser.add_argument('--fin', type=_fecha, required=True, help="Fecha de terminación del contrato (AAAA-MM-DD)")
+    parser.add_argument('--salario', type=int, required=True, help="Salario base contractual mensual")
+    parser.add_argument('--fecha-calculo', type=_fecha, default=datetime.now().replace(hour=0, minute=0, second=0,
+                                                                                       microsecond=0),
+                        help="Fecha a la que se calculan las sanciones (por defecto, hoy)")
+    parser.add_argument('--paystubs', default='paystubs-summary.csv', help="CSV de desprendibles")
+    parser.add_argument('--estado', default=None,
+                        help="Archivo .npz con el estado incremental (por defecto, <paystubs>.estado.npz)")
+    parser.add_argument('--mensual', default=None, help="CSV opcional con el resumen mensual del contrato")
+    parser.add_argument('--tasa-pension', type=float, choices=[TASA_PENSION_EMPLEADOR, TASA_PENSION_TOTAL],
+                        default=TASA_PENSION_EMPLEADOR,
+                        help="Tasa del aporte a pensión de referencia: 0.12 (empleador) o 0.16 (total)")
+    args = parser.parse_args(argv)
+
+    contrato = Contrato(args.inicio, args.fin, args.salario, args.fecha_calculo)
+    ruta_estado = args.estado or args.paystubs + '.estado.npz'
+    liquidacion, origen = LiquidacionIncremental.cargar(ruta_estado, contrato)
+
+    try:
+        df_nuevas, origen, completo = leer_filas_nuevas(args.paystubs, origen)
+    except FileNotFoundError:
+        print(f"Error: El archivo '{args.paystubs}' no fue encontrado. Por favor, verifique la ruta.")
+        return
+    nuevos = None if df_nuevas is None else Desprendibles.desde_dataframe(df_nuevas)
+
+    if completo:
+        if liquidacion is not None:
+            print(f"El CSV '{args.paystubs}' cambió antes de la última posición leída; se recalcula desde cero.")
+        liquidacion = LiquidacionIncremental(contrato)
+        if nuevos is not None:
+            validar_paystubs(df_nuevas, contrato=contrato)
+            liquidacion.agregar(nuevos)
+        print(f"Estado construido con {liquidacion.filas} desprendibles.")
+    else:
+        anterior = liquidacion.resultado
+        liquidacion.mover_fecha_calculo(contrato.fecha_calculo)
+        if nuevos is not None:
+            validar_agregados(df_nuevas, contrato, liquidacion.ultimo_fin, primera_fila=liquidacion.filas)
+        meses = liquidacion.agregar(nuevos)["meses"] if nuevos is not None else []
+        print(f"{0 if nuevos is None else len(nuevos.inicios)} desprendibles nuevos ({liquidacion.filas} en total).")
+        for cambio in cambios_pretensiones(anterior, liquidacion.resultado)["partidas"]:
+            print(f"  {cambio['Concepto']}: {cambio['Anterior']:,} -> {cambio['Nuevo']:,} ({cambio['Diferencia']:+,})")
+        if meses:
+            print(f"  Meses del resumen actualizados: {', '.join(meses)}")
+    liquidacion.guardar(ruta_estado, origen)
+
+    for texto in liquidacion.resultado["advertencias"]:
+        print(texto)
+    if args.mensual:
+        liquidacion.resumen_mensual(args.tasa_pension).to_csv(args.mensual, index=False)
+    print(f"Monto total de las pretensiones: {liquidacion.resultado['total_pretensiones']:,}")
+
+
+if __name__ == '__main__':
+    main()
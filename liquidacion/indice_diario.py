@@ -0,0 +1,182 @@
+"""
+Índice diario de devengos con sumas acumuladas (prefix sums).
+
+Cada desprendible reparte su ``base_salary``, ``total_extras`` y ``aux_transp`` por igual
+entre los días calendario de su periodo. Con esos valores diarios se construye un arreglo
+de sumas acumuladas por día, de modo que el total pro rata de cualquier ventana de fechas
+se obtiene con dos lecturas del arreglo en lugar de recorrer todos los desprendibles.
+
+Los valores diarios se guardan como enteros escalados por el mínimo común múltiplo de las
+longitudes de los periodos, de modo que las sumas son exactas y no dependen del orden de
+acumulación, y ``totales_centavos`` las convierte a centavos con un solo redondeo (ver
+``dinero``). Con longitudes muy variadas (p. ej. de 1 a 60 días) ese múltiplo no cabe en
+int64; entonces los desprendibles se reparten en grupos de longitudes cuyo múltiplo sí
+cabe, cada uno con sus propias sumas acumuladas y su ``denominador``, y las fracciones de
+los grupos se suman de forma exacta (``dinero.centavos_desde_fracciones``).
+"""
+from math import lcm
+
+import numpy as np
+
+from liquidacion.dinero import LIMITE_CENTAVOS, centavos_desde_float, centavos_desde_fracciones
+from liquidacion.perfil import contar_consulta
+from liquidacion.ventanas import a_numero_de_dia, promedios_desde_totales
+
+# Por encima de este valor los enteros escalados de un grupo ya no se podrían pasar a
+# centavos sin desbordar int64. Si ni un solo periodo cabe (montos absurdos), el índice usa
+# valores diarios en punto flotante.
+_LIMITE_EXACTO = LIMITE_CENTAVOS
+
+_COLUMNAS = ("base", "extras", "aux")
+
+
+class IndiceDiario:
+    """
+    Sumas acumuladas diarias de salario base, extras y auxilio de transporte.
+
+    ``acumulados[g, i, k]`` es la suma de los devengos diarios de la columna ``i`` de los
+    desprendibles del grupo ``g`` desde ``dia_inicial`` hasta el día ``dia_inicial + k - 1``;
+    el total de una ventana es la suma sobre los grupos de su diferencia dividida por
+    ``denominadores[g]`` (un solo grupo con denominador 1 cuando el índice trabaja en punto
+    flotante).
+    """
+
+    def __init__(self, ps_inicios, ps_fines, base, extras, aux):
+        ps_inicios = np.asarray(ps_inicios, dtype=np.int64)
+        ps_fines = np.asarray(ps_fines, dtype=np.int64)
+        validos = ps_fines >= ps_inicios
+        ps_inicios, ps_fines = ps_inicios[validos], ps_fines[validos]
+        montos = np.stack([
+            np.asarray(base, dtype=np.int64)[validos],
+            np.asarray(extras, dtype=np.int64)[validos],
+            np.asarray(aux, dtype=np.int64)[validos],
+        ])
+
+        if ps_inicios.size == 0:
+            self.dia_inicial = 0
+            self.num_dias = 0
+            self.denominadores = np.ones(1, dtype=np.int64)
+            self.acumulados = np.zeros((1, 3, 1), dtype=np.int64)
+            return
+
+        self.dia_inicial = int(ps_inicios.min())
+        self.num_dias = int(ps_fines.max()) - self.dia_inicial + 1
+        dias_desprendible = ps_fines - ps_inicios + 1
+
+        grupos = _agrupar_longitudes(dias_desprendible, montos)
+        if grupos is None:
+            self.denominadores = np.ones(1, dtype=np.int64)
+            self.acumulados = self._acumular(ps_inicios, ps_fines, montos / dias_desprendible)[np.newaxis]
+            return
+        self.denominadores = np.array([denominador for denominador, _ in grupos], dtype=np.int64)
+        self.acumulados = np.stack([
+            self._acumular(ps_inicios[miembros], ps_fines[miembros],
+                           montos[:, miembros] * (denominador // dias_desprendible[miembros]))
+            for denominador, miembros in grupos])
+
+    def _acumular(self, ps_inicios, ps_fines, tasas):
+        """Sumas acumuladas (3, N+1) de las tasas diarias de esos desprendibles."""
+        # Arreglo de diferencias: la tasa diaria entra el primer día del periodo y sale el
+        # día siguiente al último; un primer cumsum da el devengo de cada día y el segundo
+        # las sumas acumuladas.
+        diferencias = np.zeros((3, self.num_dias + 1), dtype=tasas.dtype)
+        for i in range(3):
+            np.add.at(diferencias[i], ps_inicios - self.dia_inicial, tasas[i])
+            np.add.at(diferencias[i], ps_fines + 1 - self.dia_inicial, -tasas[i])
+        diarios = np.cumsum(diferencias[:, :-1], axis=1)
+
+        acumulados = np.zeros((3, self.num_dias + 1), dtype=tasas.dtype)
+        np.cumsum(diarios, axis=1, out=acumulados[:, 1:])
+        return acumulados
+
+    @classmethod
+    def desde_paystubs(cls, df_paystubs):
+        """Construye el índice a partir del DataFrame de desprendibles ya preprocesado."""
+        return cls(
+            a_numero_de_dia(df_paystubs['Period_Start_Date']),
+            a_numero_de_dia(df_paystubs['Period_End_Date']),
+            df_paystubs['base_salary'].to_numpy(),
+            df_paystubs['total_extras'].to_numpy(),
+            df_paystubs['aux_transp'].to_numpy(),
+        )
+
+    def _sumas(self, inicios, fines):
+        """Sumas escaladas (G, 3, W) de cada grupo y ventana, y los días de cada ventana."""
+        contar_consulta(inicios.size)
+        dias = np.maximum(fines - inicios + 1, 0)
+        desde = np.clip(inicios - self.dia_inicial, 0, self.num_dias)
+        hasta = np.clip(fines + 1 - self.dia_inicial, 0, self.num_dias)
+        hasta = np.where(dias > 0, np.maximum(hasta, desde), desde)
+        return self.acumulados[:, :, hasta] - self.acumulados[:, :, desde], dias
+
+    def totales(self, inicios, fines):
+        """
+        Totales pro rata para ventanas expresadas en números de día (arreglos o escalares).
+        Devuelve el mismo diccionario que ``ventanas.calcular_totales_pro_rata``.
+        """
+        inicios = np.atleast_1d(np.asarray(inicios, dtype=np.int64))
+        fines = np.atleast_1d(np.asarray(fines, dtype=np.int64))
+        sumas, dias = self._sumas(inicios, fines)
+        montos = (sumas / self.denominadores[:, np.newaxis, np.newaxis]).sum(axis=0)
+        resultado = {nombre: montos[i] for i, nombre in enumerate(_COLUMNAS)}
+        resultado["dias"] = dias
+        return resultado
+
+    def totales_centavos(self, inicios, fines):
+        """
+        Como ``totales``, pero con los montos en centavos int64 redondeados desde el valor
+        exacto de cada ventana y con las fechas ``inicios``/``fines`` de las ventanas (entrada
+        de las fórmulas de ``calculo``).
+        """
+        inicios = np.atleast_1d(np.asarray(inicios, dtype=np.int64))
+        fines = np.atleast_1d(np.asarray(fines, dtype=np.int64))
+        sumas, dias = self._sumas(inicios, fines)
+        if sumas.dtype.kind == 'f':
+            centavos = centavos_desde_float(sumas[0])
+        else:
+            centavos = centavos_desde_fracciones(np.moveaxis(sumas, 0, -1), self.denominadores)
+        resultado = {nombre: centavos[i] for i, nombre in enumerate(_COLUMNAS)}
+        resultado.update(dias=dias, inicios=inicios, fines=fines)
+        return resultado
+
+    def get_proportional_earnings_for_periods(self, periodos, tope_auxilio=False):
+        """
+        Equivalente a ``ventanas.get_proportional_earnings_for_periods`` respondiendo desde el
+        índice: recibe periodos ``(fecha_inicio, fecha_fin)`` y devuelve un diccionario por periodo.
+        """
+        if len(periodos) == 0:
+            return []
+        inicios = a_numero_de_dia([inicio for inicio, _ in periodos])
+        fines = a_numero_de_dia([fin for _, fin in periodos])
+        if tope_auxilio:
+            return promedios_desde_totales(self.totales(inicios, fines), inicios, fines)
+        return promedios_desde_totales(self.totales(inicios, fines))
+
+
+def _agrupar_longitudes(dias_desprendible, montos):
+    """
+    Reparte los desprendibles en grupos de longitudes, de menor a mayor, mientras el mínimo
+    común múltiplo del grupo por la suma de sus montos absolutos quepa en ``_LIMITE_EXACTO``.
+    Devuelve una lista de ``(denominador, miembros)`` (máscara booleana de los desprendibles)
+    o ``None`` si algún periodo no cabe ni solo.
+    """
+    longitudes, posicion = np.unique(dias_desprendible, return_inverse=True)
+    absolutos = np.zeros((3, longitudes.size), dtype=np.int64)
+    for i in range(3):
+        np.add.at(absolutos[i], posicion, np.abs(montos[i]))
+    absolutos = absolutos.T.tolist()
+
+    grupos = []
+    denominador, suma, inicio = 1, [0, 0, 0], 0
+    for j, longitud in enumerate(longitudes.tolist()):
+        candidato = lcm(denominador, longitud)
+        ampliada = [total + valor for total, valor in zip(suma, absolutos[j])]
+        if candidato * max(ampliada) < _LIMITE_EXACTO:
+            denominador, suma = candidato, ampliada
+            continue
+        if longitud * max(absolutos[j]) >= _LIMITE_EXACTO:
+            return None
+        grupos.append((denominador, longitudes[inicio:j]))
+        denominador, suma, inicio = longitud, absolutos[j], j
+    grupos.append((denominador, longitudes[inicio:]))
+    return [(denominador, np.isin(dias_desprendible, miembros)) for denominador, miembros in grupos]
@@ -0,0 +1,303 @@
+"""
+Ingesta de desprendibles de nómina en PDF hacia el CSV de resumen (``paystubs-summary.csv``).
+
+Soporta los dos formatos presentes en ``source/``:
+- Correos de Gmail "Nómina Final del ..." (dos páginas por desprendible, montos como ``$1050000,  0``).
+- Comprobantes de pago de Heinsohn (una página, conceptos con montos como ``1.050.000,00``).
+
+Un PDF puede contener uno o varios desprendibles (p. ej. ``desprendibles de pago.pdf``
+recopila varios); los periodos repetidos entre archivos se conservan una sola vez.
+Los archivos se procesan en paralelo y el resultado de cada uno se guarda en una caché
+indexada por el hash SHA-256 de su contenido, de modo que al volver a ejecutar solo se
+procesan los PDF nuevos o modificados. Funciona sin conexión con ``pypdf``.
+
+Uso:
+    python -m liquidacion.ingesta_pdf source/ --salida paystubs-summary.csv --conservar
+"""
+import argparse
+import calendar
+import csv
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+
+# Cambiar este valor invalida la caché cuando cambian las reglas de extracción
+VERSION_EXTRACTOR = 1
+CACHE_FILE_NAME = '.ingesta-cache.json'
+
+CSV_COLUMNS = ['label', 'pay_period_starts', 'pay_period_ends', 'base_salary', 'aux_transp',
+               'incentive_transp', 'sunday_bonus', 'holiday_bonus', 'night_bonus', 'day_overtime',
+               'night_overtime', 'other_bonuses', 'gross_earnings', 'total_deductions', 'net_pay']
+AMOUNT_COLUMNS = CSV_COLUMNS[3:]
+
+MESES = ['enero', 'febrero', 'marzo', 'abril', 'mayo', 'junio', 'julio', 'agosto',
+         'septiembre', 'octubre', 'noviembre', 'diciembre']
+
+# --- Formato Gmail: etiqueta del concepto -> columna del CSV ---
+GMAIL_CONCEPTOS = {
+    'SUELDO': 'base_salary',
+    'AUX. TRANSPORTE': 'aux_transp',
+    'INCENTIVO TRANSPORTE': 'incentive_transp',
+    'DOMINICALES': 'sunday_bonus',
+    'FESTIVOS': 'holiday_bonus',
+    'RECARGO NOCTURNO': 'night_bonus',
+    'HORAS EXTRAS DIURNAS': 'day_overtime',
+    'HORAS EXTRAS NOCTURNAS': 'night_overtime',
+    'HR. EXCEDIDAS': 'other_bonuses',
+    'HR. BREAK': 'other_bonuses',
+    'REEMBOLSOS': 'other_bonuses',
+    'BONO INCENTIVO': 'other_bonuses',
+    'BONO DESEMPEÑO': 'other_bonuses',
+    'BONO ANTIGÜEDAD': 'other_bonuses',
+    'BONO REFERIDOS': 'other_bonuses',
+}
+
+# --- Formato Heinsohn: fragmento del concepto -> columna (el primero que coincide) ---
+# Los conceptos de deducción se ignoran porque el total de deducciones se toma de "Totales".
+HEINSOHN_CONCEPTOS = [
+    ('HORA EXTRA DIURNA', 'day_overtime'),
+    ('HORA EXTRA NOCTURNA', 'night_overtime'),
+    ('RECARGO DOMINICAL', 'sunday_bonus'),
+    ('RECARGO FESTIVO', 'holiday_bonus'),
+    ('RECARGO NOCTURNO', 'night_bonus'),
+    ('INCENTIVO TRANSPORTE', 'incentive_transp'),
+    ('SUBSIDIO DE TRANSPORTE', 'aux_transp'),
+    ('AUXILIO DE TRANSPORTE', 'aux_transp'),
+    ('HORA AGENTES', 'base_salary'),
+    ('SUELDO', 'base_salary'),
+    ('SALARIO', 'base_salary'),
+    ('APORTE', None),
+    ('RETENCI', None),
+    ('LIBRANZA', None),
+    ('DESCUENTO', None),
+    ('DEDUCIR', None),
+    ('HORAS BENEFICIO', None),
+]
+
+_RE_TITULO = re.compile(r'N[oó]mina Final del (\d{1,2}) al (\d{1,2}) (?:de )?([A-Za-zÁÉÍÓÚáéíóú]+) (?:de )?(\d{4})')
+_RE_FECHA_CORTA = re.compile(r'\b(\d{2})/(\d{2})/(\d{2})(?!\d)')
+_RE_CONCEPTO_HEINSOHN = re.compile(
+    r'^(?P<concepto>[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ .()0-9,]*?)[ \t]+'
+    r'(?:[\d,]+[ \t]+(?:HORA|DIA|UNIDAD)[ \t]+)?(?P<valor>[\d.]+,\d{2})$', re.MULTILINE)
+_RE_TOTALES_HEINSOHN = re.compile(r'Totales\s+([\d.]+,\d{2})\s+([\d.]+,\d{2})')
+
+
+def _monto_gmail(texto, etiqueta):
+    # "$1050000,  0" -> 1050000; "$ ,0 0" -> 0. Entre la etiqueta y el "$" solo hay horas.
+    coincidencia = re.search(re.escape(etiqueta) + r'[^$\-]*\$\s*(\d*)', texto)
+    return int(coincidencia.group(1) or 0) if coincidencia else 0
+
+
+def _monto_heinsohn(valor):
+    # "1.050.000,00" -> 1050000
+    return round(float(valor.replace('.', '').replace(',', '.')))
+
+
+def _fin_de_periodo(inicio, fin):
+    # La segunda quincena se liquida hasta el último día del mes aunque el documento diga 30
+    if inicio.day == 16 and fin.day >= 28 and (fin.year, fin.month) == (inicio.year, inicio.month):
+        return fin.replace(day=calendar.monthrange(fin.year, fin.month)[1])
+    return fin
+
+
+def _etiqueta(inicio, fin_documento):
+    return f"{inicio.day:02d} al {fin_documento.day:02d} de {MESES[inicio.month - 1].capitalize()} {inicio.year}"
+
+
+def _extraer_gmail(texto):
+    titulo = _RE_TITULO.search(texto)
+    if titulo is None:
+        return None
+    dia_inicio, dia_fin, mes, anio = titulo.groups()
+    numero_mes = MESES.index(mes.lower()) + 1
+    inicio = date(int(anio), numero_mes, int(dia_inicio))
+    fin_documento = date(int(anio), numero_mes, int(dia_fin))
+
+    desprendible = {col: 0 for col in AMOUNT_COLUMNS}
+    for etiqueta, columna in GMAIL_CONCEPTOS.items():
+        desprendible[columna] += _monto_gmail(texto, '-' + etiqueta)
+    desprendible['gross_earnings'] = _monto_gmail(texto, 'TOTAL DEVENGADO')
+    desprendible['total_deductions'] = _monto_gmail(texto, 'TOTAL DEDUCCIONES')
+    desprendible['net_pay'] = desprendible['gross_earnings'] - desprendible['total_deductions']
+    return inicio, fin_documento, desprendible
+
+
+def _extraer_heinsohn(texto):
+    fechas = _RE_FECHA_CORTA.findall(texto)
+    if len(fechas) < 2:
+        return None
+    inicio, fin_documento = (date(2000 + int(a), int(m), int(d)) for d, m, a in fechas[:2])
+
+    desprendible = {col: 0 for col in AMOUNT_COLUMNS}
+    solo_prima = True
+    for coincidencia in _RE_CONCEPTO_HEINSOHN.finditer(texto):
+        concepto = coincidencia.group('concepto')
+        if 'Totales' in concepto:
+            continue
+        columna = next((col for fragmento, col in HEINSOHN_CONCEPTOS if fragmento in concepto), 'other_bonuses')
+        if columna is None:
+            continue
+        if 'PRIMA' not in concepto:
+            solo_prima = False
+        desprendible[columna] += _monto_heinsohn(coincidencia.group('valor'))
+
+    # Los comprobantes que solo pagan la prima de servicios no son desprendibles quincenales
+    if solo_prima:
+        return None
+    totales = _RE_TOTALES_HEINSOHN.search(texto)
+    if totales:
+        desprendible['gross_earnings'] = _monto_heinsohn(totales.group(1))
+        desprendible['total_deductions'] = _monto_heinsohn(totales.group(2))
+    desprendible['net_pay'] = desprendible['gross_earnings'] - desprendible['total_deductions']
+    return inicio, fin_documento, desprendible
+
+
+def _es_inicio_de_desprendible(texto_pagina):
+    return 'COMPROBANTE DE PAGO' in texto_pagina or 'NOMBRE:' in texto_pagina
+
+
+def extraer_desprendibles(ruta_pdf):
+    """
+    Extrae todos los desprendibles de un PDF. Devuelve una lista de diccionarios con las
+    columnas del CSV (fechas en formato ISO); se ejecuta en los procesos de trabajo.
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError as error:
+        raise ImportError("La ingesta de PDF requiere 'pypdf' (pip install pypdf).") from error
+
+    # Agrupa las páginas por desprendible: cada uno empieza en una página con encabezado
+    documentos = []
+    for pagina in PdfReader(ruta_pdf).pages:
+        texto = pagina.extract_text() or ''
+        if _es_inicio_de_desprendible(texto) or not documentos:
+            documentos.append(texto)
+        else:
+            documentos[-1] += '\n' + texto
+
+    desprendibles = []
+    for texto in documentos:
+        extraido = _extraer_heinsohn(texto) if 'COMPROBANTE DE PAGO' in texto else _extraer_gmail(texto)
+        if extraido is None:
+            continue
+        inicio, fin_documento, desprendible = extraido
+        desprendible['label'] = _etiqueta(inicio, fin_documento)
+        desprendible['pay_period_starts'] = inicio.isoformat()
+        desprendible['pay_period_ends'] = _fin_de_periodo(inicio, fin_documento).isoformat()
+        desprendibles.append(desprendible)
+    return desprendibles
+
+
+def hash_archivo(ruta):
+    """Hash SHA-256 del contenido de un archivo, leído por bloques."""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as archivo:
+        for bloque in iter(lambda: archivo.read(1 << 20), b''):
+            sha.update(bloque)
+    return f"{sha.hexdigest()}-v{VERSION_EXTRACTOR}"
+
+
+def _leer_cache(ruta_cache):
+    try:
+        with open(ruta_cache, encoding='utf-8') as archivo:
+            return json.load(archivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _escribir_cache(ruta_cache, cache):
+    temporal = ruta_cache + '.tmp'
+    with open(temporal, 'w', encoding='utf-8') as archivo:
+        json.dump(cache, archivo, ensure_ascii=False, indent=1)
+    os.replace(temporal, ruta_cache)
+
+
+def ingerir_carpeta(carpeta, ruta_cache=None, procesos=None, advertir=print):
+    """
+    Procesa todos los PDF de ``carpeta`` (en orden de nombre) y devuelve la lista de
+    desprendibles sin periodos repetidos, ordenada por fecha de inicio. Solo se extraen los
+    archivos cuyo hash no está en la caché.
+    """
+    ruta_cache = ruta_cache or os.path.join(carpeta, CACHE_FILE_NAME)
+    cache = _leer_cache(ruta_cache)
+
+    archivos = sorted(os.path.join(carpeta, nombre) for nombre in os.listdir(carpeta)
+                      if nombre.lower().endswith('.pdf'))
+    hashes = {ruta: hash_archivo(ruta) for ruta in archivos}
+    pendientes = [ruta for ruta in archivos if hashes[ruta] not in cache]
+
+    if pendientes:
+        procesos = procesos or os.cpu_count() or 1
+        if procesos == 1 or len(pendientes) == 1:
+            extraidos = [extraer_desprendibles(ruta) for ruta in pendientes]
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as executor:
+                extraidos = list(executor.map(extraer_desprendibles, pendientes))
+        for ruta, desprendibles in zip(pendientes, extraidos):
+            cache[hashes[ruta]] = {"archivo": os.path.basename(ruta), "desprendibles": desprendibles}
+        _escribir_cache(ruta_cache, cache)
+
+    por_periodo = {}
+    for ruta in archivos:
+        for desprendible in cache[hashes[ruta]]["desprendibles"]:
+            periodo = (desprendible['pay_period_starts'], desprendible['pay_period_ends'])
+            existente = por_periodo.get(periodo)
+            if existente is None:
+                por_periodo[periodo] = desprendible
+            elif any(existente[col] != desprendible[col] for col in AMOUNT_COLUMNS):
+                advertir(f"Advertencia: El periodo {periodo[0]} a {periodo[1]} aparece con valores distintos "
+                         f"en '{os.path.basename(ruta)}'. Se conserva el primero.")
+    return [por_periodo[periodo] for periodo in sorted(por_periodo)]
+
+
+def _fecha_csv(valor_iso):
+    fecha = date.fromisoformat(valor_iso)
+    return f"{fecha.month}/{fecha.day}/{fecha.year}" # Mismo formato M/D/AAAA del CSV existente
+
+
+def escribir_csv(desprendibles, ruta_salida, conservar=False):
+    """
+    Escribe los desprendibles con el esquema de ``paystubs-summary.csv``. Con ``conservar``,
+    mantiene las filas del CSV existente cuyos periodos no aparecen en los PDF (p. ej. filas
+    agregadas a mano).
+    """
+    filas = [{**d, 'pay_period_starts': _fecha_csv(d['pay_period_starts']),
+              'pay_period_ends': _fecha_csv(d['pay_period_ends'])} for d in desprendibles]
+
+    if conservar and os.path.exists(ruta_salida):
+        periodos = {(d['pay_period_starts'], d['pay_period_ends']) for d in desprendibles}
+        with open(ruta_salida, newline='', encoding='utf-8') as archivo:
+            for fila in csv.DictReader(archivo):
+                periodo = tuple(datetime.strptime(fila[col], '%m/%d/%Y').date().isoformat()
+                                for col in ('pay_period_starts', 'pay_period_ends'))
+                if periodo not in periodos:
+                    filas.append(fila)
+        filas.sort(key=lambda f: datetime.strptime(f['pay_period_starts'], '%m/%d/%Y'))
+
+    with open(ruta_salida, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.DictWriter(archivo, fieldnames=CSV_COLUMNS, extrasaction='ignore')
+        escritor.writeheader()
+        escritor.writerows(filas)
+    return len(filas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extrae los desprendibles en PDF al CSV de resumen.")
+    parser.add_argument('carpeta', nargs='?', default='source', help="Carpeta con los PDF")
+    parser.add_argument('--salida', default='paystubs-summary.csv', help="CSV de salida")
+    parser.add_argument('--cache', default=None, help=f"Archivo de caché (por defecto, <carpeta>/{CACHE_FILE_NAME})")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos (por defecto, núcleos)")
+    parser.add_argument('--conservar', action='store_true',
+                        help="Mantener las filas del CSV de salida cuyos periodos no están en los PDF")
+    args = parser.parse_args(argv)
+
+    desprendibles = ingerir_carpeta(args.carpeta, ruta_cache=args.cache, procesos=args.procesos)
+    total_filas = escribir_csv(desprendibles, args.salida, conservar=args.conservar)
+    print(f"{len(desprendibles)} desprendibles extraídos. {total_filas} filas escritas en '{args.salida}'.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+"""
+Modo por lotes: liquida a un grupo de trabajadores en paralelo.
+
+Entradas:
+- Un manifiesto CSV con una fila por trabajador y las columnas ``employee_id``,
+  ``fecha_inicio``, ``fecha_fin``, ``salario_base`` y, opcionalmente, ``fecha_calculo`` y
+  ``paystubs_file`` (CSV de desprendibles propio del trabajador).
+- Una tabla de nómina con varios empleados (esquema de ``paystubs-summary.csv`` más la
+  columna ``employee_id``) para los trabajadores sin ``paystubs_file``.
+
+Cada archivo de nómina se lee y preprocesa una sola vez en el proceso principal (o se toma
+de la caché binaria de ``cache_paystubs`` si no ha cambiado); a los procesos de trabajo
+solo viajan el ``Contrato`` y los arreglos ``Desprendibles`` de cada trabajador, de modo
+que no importan pandas ni releen CSV por trabajador.
+
+Uso:
+    python -m liquidacion.lote manifiesto.csv --paystubs nomina.csv --salida resultados.csv
+    python -m liquidacion.lote manifiesto.csv --paystubs nomina.csv --exportar detalle.jsonl
+"""
+import argparse
+import contextlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from liquidacion.calculo import Contrato, calcular_pretensiones, resumen_pretensiones
+from liquidacion.cache_paystubs import cargar_paystubs_con_cache
+from liquidacion.datos import EMPLOYEE_COL, Desprendibles, desprendibles_por_empleado
+from liquidacion.exportacion import FORMATOS, abrir_exportador
+from liquidacion.mensual import resumen_mensual_desprendibles
+from liquidacion.validacion import validar_paystubs
+
+MANIFEST_DATE_COLS = ['fecha_inicio', 'fecha_fin', 'fecha_calculo']
+
+
+def leer_manifiesto(ruta_manifiesto, fecha_calculo_defecto):
+    """Lee el manifiesto de contratos y devuelve una lista de ``(Contrato, paystubs_file)``."""
+    df_manifiesto = pd.read_csv(ruta_manifiesto, dtype={EMPLOYEE_COL: str})
+    if 'fecha_calculo' not in df_manifiesto.columns:
+        df_manifiesto['fecha_calculo'] = pd.NaT
+    if 'paystubs_file' not in df_manifiesto.columns:
+        df_manifiesto['paystubs_file'] = None
+    for col in MANIFEST_DATE_COLS:
+        df_manifiesto[col] = pd.to_datetime(df_manifiesto[col], errors='coerce')
+    df_manifiesto['fecha_calculo'] = df_manifiesto['fecha_calculo'].fillna(pd.Timestamp(fecha_calculo_defecto))
+
+    invalidas = df_manifiesto[['fecha_inicio', 'fecha_fin']].isnull().any(axis=1)
+    if invalidas.any():
+        raise ValueError("Fechas de contrato inválidas para los empleados: "
+                         f"{', '.join(df_manifiesto.loc[invalidas, EMPLOYEE_COL].astype(str))}")
+    # Cada empleado se liquida una vez: un segundo contrato con el mismo id reemplazaría al primero
+    repetidos = df_manifiesto[EMPLOYEE_COL].astype(str)
+    repetidos = repetidos[repetidos.duplicated()].unique()
+    if len(repetidos):
+        raise ValueError(f"Empleados repetidos en el manifiesto: {', '.join(repetidos)}")
+
+    contratos = []
+    for fila in df_manifiesto.itertuples(index=False):
+        contrato = Contrato(
+            fecha_inicio=fila.fecha_inicio.to_pydatetime(),
+            fecha_fin=fila.fecha_fin.to_pydatetime(),
+            salario_base=int(fila.salario_base),
+            fecha_calculo=fila.fecha_calculo.to_pydatetime(),
+            employee_id=str(getattr(fila, EMPLOYEE_COL)),
+        )
+        paystubs_file = fila.paystubs_file if isinstance(fila.paystubs_file, str) and fila.paystubs_file else None
+        contratos.append((contrato, paystubs_file))
+    return contratos
+
+
+def _desprendibles_vacios():
+    vacio = np.zeros(0, dtype=np.int64)
+    return Desprendibles(vacio, vacio, vacio, vacio, vacio)
+
+
+def preparar_trabajos(contratos, ruta_paystubs=None, advertir=print):
+    """
+    Asocia a cada contrato sus desprendibles. Cada archivo de nómina distinto se carga una
+    sola vez y se valida contra los contratos que lo usan (ver ``validacion``); los archivos
+    que incluyen ``employee_id`` se filtran por empleado y los que no se asignan completos
+    al trabajador que los referencia. Lanza ``ValueError`` si un empleado tiene dos contratos
+    sobre el mismo archivo.
+    """
+    cache_archivos = {}
+    contratos_por_archivo = {}
+    for contrato, paystubs_file in contratos:
+        contratos_archivo = contratos_por_archivo.setdefault(paystubs_file or ruta_paystubs, {})
+        if contrato.employee_id in contratos_archivo:
+            raise ValueError(f"El empleado '{contrato.employee_id}' tiene más de un contrato con los "
+                             f"desprendibles de '{paystubs_file or ruta_paystubs}'.")
+        contratos_archivo[contrato.employee_id] = contrato
+
+    def desprendibles_de_archivo(ruta):
+        if ruta not in cache_archivos:
+            df_paystubs = cargar_paystubs_con_cache(ruta, advertir=advertir)
+            validar_archivo(df_paystubs, ruta)
+            if EMPLOYEE_COL in df_paystubs.columns:
+                df_paystubs[EMPLOYEE_COL] = df_paystubs[EMPLOYEE_COL].astype(str)
+                cache_archivos[ruta] = desprendibles_por_empleado(df_paystubs)
+            else:
+                cache_archivos[ruta] = Desprendibles.desde_dataframe(df_paystubs)
+        return cache_archivos[ruta]
+
+    def validar_archivo(df_paystubs, ruta):
+        # Cada empleado contra su contrato; un archivo sin employee_id de un solo contrato, contra ese
+        contratos_archivo = contratos_por_archivo[ruta]
+
+        def advertir_archivo(texto):
+            advertir(f"[{ruta}] {texto}")
+
+        if EMPLOYEE_COL in df_paystubs.columns:
+            validar_paystubs(df_paystubs, contratos=contratos_archivo, advertir=advertir_archivo)
+        elif len(contratos_archivo) == 1:
+            validar_paystubs(df_paystubs, contrato=next(iter(contratos_archivo.values())), advertir=advertir_archivo)
+        else:
+            validar_paystubs(df_paystubs, advertir=advertir_archivo)
+
+    trabajos = []
+    for contrato, paystubs_file in contratos:
+        ruta = paystubs_file or ruta_paystubs
+        if ruta is None:
+            raise ValueError(f"El empleado '{contrato.employee_id}' no tiene archivo de desprendibles "
+                             "y no se indicó una tabla de nómina general (--paystubs).")
+        desprendibles = desprendibles_de_archivo(ruta)
+        if isinstance(desprendibles, dict):
+            if contrato.employee_id not in desprendibles:
+                advertir(f"Advertencia: No hay desprendibles para el empleado '{contrato.employee_id}' en '{ruta}'.")
+            desprendibles = desprendibles.get(contrato.employee_id) or _desprendibles_vacios()
+        trabajos.append((contrato, desprendibles))
+    return trabajos
+
+
+def _liquidar_trabajador(trabajo):
+    contrato, desprendibles = trabajo
+    resultado = calcular_pretensiones(contrato, desprendibles)
+    return resumen_pretensiones(contrato, resultado), resultado["advertencias"]
+
+
+def ejecutar_lote(trabajos, procesos=None, chunksize=None):
+    """
+    Ejecuta el pipeline completo para cada ``(Contrato, Desprendibles)`` en un pool de
+    ``procesos`` procesos (por defecto, uno por núcleo; ``procesos=1`` ejecuta en el proceso
+    actual). Devuelve las filas consolidadas y las advertencias, en el orden de entrada.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(trabajos) <= 1:
+        salidas = [_liquidar_trabajador(trabajo) for trabajo in trabajos]
+    else:
+        # Trozos grandes para amortizar el costo de comunicación entre procesos
+        chunksize = chunksize or max(1, len(trabajos) // (procesos * 4))
+        with ProcessPoolExecutor(max_workers=procesos) as executor:
+            salidas = list(executor.map(_liquidar_trabajador, trabajos, chunksize=chunksize))
+
+    filas = [fila for fila, _ in salidas]
+    advertencias = [f"[{fila['employee_id']}] {texto}" for fila, avisos in salidas for texto in avisos]
+    return filas, advertencias
+
+
+def _liquidar_para_exportar(trabajo):
+    contrato, desprendibles = trabajo
+    return calcular_pretensiones(contrato, desprendibles), resumen_mensual_desprendibles(desprendibles, contrato)
+
+
+def exportar_lote(trabajos, exportador, procesos=None, chunksize=None):
+    """
+    Como ``ejecutar_lote``, pero además escribe cada trabajador en ``exportador`` (ver
+    ``exportacion``) con su resumen mensual, en el orden de entrada y a medida que se liquida.
+    Los trabajos se reparten por tandas para que en memoria haya a lo sumo una tanda de
+    resultados completos sin escribir; los ``trabajos`` (todos los desprendibles) y las filas
+    y advertencias devueltas sí quedan en memoria para todo el lote.
+    """
+    procesos = procesos or os.cpu_count() or 1
+    filas, advertencias = [], []
+
+    def escribir(contrato, salida):
+        resultado, df_mensual = salida
+        exportador.escribir(contrato, resultado, df_mensual)
+        filas.append(resumen_pretensiones(contrato, resultado))
+        advertencias.extend(f"[{contrato.employee_id}] {texto}" for texto in resultado["advertencias"])
+
+    if procesos == 1 or len(trabajos) <= 1:
+        for trabajo in trabajos:
+            escribir(trabajo[0], _liquidar_para_exportar(trabajo))
+        return filas, advertencias
+
+    chunksize = chunksize or max(1, min(64, len(trabajos) // (procesos * 4)))
+    tanda = procesos * chunksize * 4
+    with ProcessPoolExecutor(max_workers=procesos) as executor:
+        for inicio in range(0, len(trabajos), tanda):
+            trabajos_tanda = trabajos[inicio:inicio + tanda]
+            salidas = executor.map(_liquidar_para_exportar, trabajos_tanda, chunksize=chunksize)
+            for (contrato, _), salida in zip(trabajos_tanda, salidas):
+                escribir(contrato, salida)
+    return filas, advertencias
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Liquidación por lotes de varios trabajadores.")
+    parser.add_argument('manifiesto', help="CSV con una fila por contrato")
+    parser.add_argument('--paystubs', help="Tabla de nómina con varios empleados (columna employee_id)")
+    parser.add_argument('--salida', default='resultados-lote.csv', help="CSV de resultados consolidados")
+    parser.add_argument('--procesos', type=int, default=None, help="Número de procesos (por defecto, núcleos)")
+    parser.add_argument('--fecha-calculo', default=datetime.now().strftime('%Y-%m-%d'),
+                        help="Fecha de cálculo para filas sin 'fecha_calculo' (AAAA-MM-DD)")
+    parser.add_argument('--exportar', default=None,
+                        help="Exportar el detalle por trabajador (carpeta de CSV, archivo .jsonl o .xlsx)")
+    parser.add_argument('--formato', choices=FORMATOS, default=None,
+                        help="Formato de --exportar (por defecto, según la extensión)")
+    args = parser.parse_args(argv)
+
+    exportador = None
+    if args.exportar:
+        # Antes de cargar la nómina, para fallar de una vez si falta la dependencia del formato
+        try:
+            exportador = abrir_exportador(args.exportar, args.formato)
+        except ImportError as error:
+            print(f"Error: {error}")
+            return 1
+
+    with exportador or contextlib.nullcontext():
+        try:
+            contratos = leer_manifiesto(args.manifiesto, datetime.strptime(args.fecha_calculo, '%Y-%m-%d'))
+            trabajos = preparar_trabajos(contratos, args.paystubs)
+        except ValueError as error:
+            print(f"Error: {error}")
+            return 1
+        if exportador is not None:
+            filas, advertencias = exportar_lote(trabajos, exportador, procesos=args.procesos)
+        else:
+            filas, advertencias = ejecutar_lote(trabajos, procesos=args.procesos)
+    if exportador is not None:
+        print(f"Detalle de {exportador.trabajadores} trabajadores exportado en '{args.exportar}'.")
+    for texto in advertencias:
+        print(texto)
+
+    df_resultados = pd.DataFrame(filas)
+    if not df_resultados.empty:
+        df_resultados['anio_sancion_cesantias'] = df_resultados['anio_sancion_cesantias'].astype('Int64')
+    df_resultados.to_csv(args.salida, index=False)
+    print(f"{len(filas)} contratos liquidados. Resultados en '{args.salida}'.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Resumen financiero mensual de los desprendibles (salario, extras, auxilio, IBC y aporte a
+pensión de referencia), por mes y opcionalmente por empleado.
+
+Los meses se manejan como claves enteras (meses desde 1970-01, ver ``clave_mes``): la
+agregación es una sola reducción de NumPy sobre las filas ordenadas por (empleado, mes) y
+el filtro por periodo del contrato compara enteros. El texto ``AAAA-MM`` solo se genera al
+armar el reporte.
+"""
+import numpy as np
+import pandas as pd
+
+from liquidacion.datos import EMPLOYEE_COL
+from liquidacion.dinero import a_pesos, aplicar_tasa, pesos_a_centavos
+from liquidacion.perfil import anotar_filas, etapa
+from liquidacion.ventanas import a_numero_de_dia
+
+# El aporte total a pensión es 16% (12% empleador, 4% empleado)
+TASA_PENSION_EMPLEADOR = 0.12
+TASA_PENSION_TOTAL = 0.16
+
+COLUMNAS_MONTOS = ['base_salary', 'total_extras', 'aux_transp']
+
+
+def clave_mes(fechas):
+    """Meses desde 1970-01 (int64) de fechas o números de día."""
+    fechas = np.asarray(fechas)
+    if np.issubdtype(fechas.dtype, np.integer):
+        fechas = fechas.astype('datetime64[D]')
+    return np.asarray(fechas, dtype='datetime64[M]').astype(np.int64)
+
+
+def agregar_por_mes(codigos, meses, montos):
+    """
+    Suma ``montos`` (arreglo (3, N) de enteros) por pares ``(codigo, mes)``. Devuelve
+    ``(codigos, meses, sumas)`` con un elemento por par distinto, ordenados por código y mes.
+    """
+    codigos = np.asarray(codigos, dtype=np.int64)
+    meses = np.asarray(meses, dtype=np.int64)
+    montos = np.asarray(montos, dtype=np.int64).reshape(3, -1)
+    if codigos.size == 0:
+        return codigos, meses, montos
+    orden = np.lexsort((meses, codigos))
+    codigos, meses, montos = codigos[orden], meses[orden], montos[:, orden]
+    inicio_grupo = np.flatnonzero(np.r_[True, (codigos[1:] != codigos[:-1]) | (meses[1:] != meses[:-1])])
+    return codigos[inicio_grupo], meses[inicio_grupo], np.add.reduceat(montos, inicio_grupo, axis=1)
+
+
+def tabla_mensual(meses, sumas, tasa_pension=TASA_PENSION_EMPLEADOR, empleados=None):
+    """
+    Columnas del reporte mensual a partir de las sumas de ``agregar_por_mes``. Con
+    ``empleados`` (un valor por fila) se antepone la columna ``employee_id``.
+    """
+    base, extras, aux = sumas
+    salario_total = base + extras # Salario mensual = Salario base + Extras
+    # Ingreso Base de Cotización (IBC) para seguridad social: Salario Total + Auxilio de Transporte
+    ibc = salario_total + aux
+    aporte_pension = a_pesos(aplicar_tasa(pesos_a_centavos(ibc), tasa_pension))
+    columnas = {} if empleados is None else {EMPLOYEE_COL: empleados}
+    columnas.update({
+        "Mes": np.datetime_as_string(np.asarray(meses, dtype=np.int64).astype('datetime64[M]')).astype(object),
+        "Salario Base": base,
+        "Extras": extras,
+        "Salario Total (Base + Extras)": salario_total,
+        "Auxilio Transporte": aux,
+        "IBC (Ingreso Base Cotización)": ibc,
+        f"Aporte Pensión Referencia ({tasa_pension * 100:g}%)": aporte_pension,
+    })
+    return pd.DataFrame(columnas)
+
+
+def resumen_mensual(df_paystubs, contrato=None, tasa_pension=TASA_PENSION_EMPLEADOR, contratos=None):
+    """
+    Reporte mensual de los desprendibles preprocesados, agrupados por el mes de inicio del
+    periodo. Con ``contrato`` se conservan los meses entre su inicio y su terminación.
+    Con ``contratos`` (``{employee_id: Contrato}``) se agrupa por (empleado, mes), se filtra
+    cada empleado por su propio contrato y se descartan los empleados que no aparecen.
+    ``tasa_pension`` es 0.12 (aporte del empleador) o 0.16 (aporte total).
+    """
+    with etapa('resumen_mensual'):
+        anotar_filas(len(df_paystubs))
+        meses = clave_mes(a_numero_de_dia(df_paystubs['Period_Start_Date']))
+        montos = np.stack([df_paystubs[col].to_numpy(dtype=np.int64) for col in COLUMNAS_MONTOS])
+
+        if contratos is None:
+            _, meses, sumas = agregar_por_mes(np.zeros(meses.size), meses, montos)
+            if contrato is not None:
+                en_contrato = ((meses >= clave_mes(contrato.fecha_inicio)) &
+                               (meses <= clave_mes(contrato.fecha_fin)))
+                meses, sumas = meses[en_contrato], sumas[:, en_contrato]
+            return tabla_mensual(meses, sumas, tasa_pension)
+
+        empleados = list(contratos)
+        codigos_empleado = {empleado: i for i, empleado in enumerate(empleados)}
+        codigos = (df_paystubs[EMPLOYEE_COL].astype(str).map(codigos_empleado)
+                   .fillna(-1).to_numpy(dtype=np.int64))
+        con_contrato = codigos >= 0
+        codigos, meses, sumas = agregar_por_mes(codigos[con_contrato], meses[con_contrato], montos[:, con_contrato])
+
+        # Primer y último mes de cada contrato, indexados por código de empleado
+        mes_inicio = clave_mes([contratos[e].fecha_inicio for e in empleados])
+        mes_fin = clave_mes([contratos[e].fecha_fin for e in empleados])
+        en_contrato = (meses >= mes_inicio[codigos]) & (meses <= mes_fin[codigos])
+        return tabla_mensual(meses[en_contrato], sumas[:, en_contrato], tasa_pension,
+                             np.asarray(empleados, dtype=object)[codigos[en_contrato]])
+
+
+def resumen_mensual_desprendibles(desprendibles, contrato=None, tasa_pension=TASA_PENSION_EMPLEADOR):
+    """
+    Como ``resumen_mensual`` con un solo empleado, desde sus ``datos.Desprendibles`` (los
+    arreglos que reciben los motores por lotes) en lugar del DataFrame.
+    """
+    meses = clave_mes(desprendibles.inicios)
+    montos = np.stack([np.asarray(desprendibles.base, dtype=np.int64), np.asarray(desprendibles.extras, dtype=np.int64),
+                       np.asarray(desprendibles.aux, dtype=np.int64)])
+    _, meses, sumas = agregar_por_mes(np.zeros(meses.size), meses, montos)
+    if contrato is not None:
+        en_contrato = (meses >= clave_mes(contrato.fecha_inicio)) & (meses <= clave_mes(contrato.fecha_fin))
+        meses, sumas = meses[en_contrato], sumas[:, en_contrato]
+    return tabla_mensual(meses, sumas, tasa_pension)
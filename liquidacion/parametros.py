@@ -0,0 +1,189 @@
+"""
+Parámetros legales con fechas de vigencia: salario mínimo (SMMLV), auxilio de transporte y
+tasa de intereses sobre cesantías.
+
+Cada parámetro es una ``TablaVigencias``: valores ordenados por la fecha desde la que rigen.
+El valor aplicable a un día es el de la última vigencia que empezó en o antes de ese día, y
+se resuelve para arreglos completos de días (desprendibles, ventanas, fechas de cálculo)
+con un solo ``np.searchsorted``, sin búsquedas fila a fila. Después de la última vigencia
+sigue rigiendo el último valor hasta que se agregue el decreto siguiente. Antes de la
+primera no hay dato: ``en`` y ``vigente`` fallan, y las reglas que dependen del mínimo
+(``salario_con_minimo``, ``auxilio_elegible``) no se aplican a esas fechas (ver ``cubre``).
+
+También se definen aquí las convenciones de días del cálculo (mes de 30 días, año de 360).
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+from liquidacion.dinero import CENTAVOS_POR_PESO, pesos_a_centavos, prorrata
+
+DIAS_MES = 30
+DIAS_ANIO = 360
+# Las vacaciones son 15 días hábiles por año: salario * días / 720
+DIAS_VACACIONES = 2 * DIAS_ANIO
+# El auxilio de transporte solo se causa para salarios de hasta dos mínimos
+TOPE_AUXILIO_SMMLV = 2
+
+
+class TablaVigencias:
+    """Valores de un parámetro legal ordenados por la fecha desde la que rigen."""
+
+    def __init__(self, nombre, vigencias):
+        """``vigencias`` es una lista de ``('AAAA-MM-DD', valor)`` en cualquier orden."""
+        vigencias = sorted(vigencias)
+        self.nombre = nombre
+        self.desde = np.array([desde for desde, _ in vigencias], dtype='datetime64[D]').astype(np.int64)
+        self.valores = np.array([valor for _, valor in vigencias])
+        self._desde_lista = self.desde.tolist()
+
+    def _error(self, dia):
+        primera = self.desde[0].astype('datetime64[D]')
+        return ValueError(f"No hay {self.nombre} vigente el {np.datetime64(int(dia), 'D')} "
+                          f"(la tabla empieza el {primera}).")
+
+    def cubre(self, dias):
+        """Si la tabla tiene valor vigente en ``dias`` (números de día, escalar o arreglo)."""
+        return np.asarray(dias, dtype=np.int64) >= self.desde[0]
+
+    def en(self, dias):
+        """Valores vigentes en ``dias`` (números de día, escalar o arreglo), vectorizado."""
+        dias = np.asarray(dias, dtype=np.int64)
+        posiciones = np.searchsorted(self.desde, dias, side='right') - 1
+        if posiciones.size and posiciones.min() < 0:
+            raise self._error(dias.min())
+        return self.valores[posiciones]
+
+    def vigente(self, dia):
+        """Valor vigente en un solo número de día, sin pasar por NumPy."""
+        posicion = bisect_right(self._desde_lista, dia) - 1
+        if posicion < 0:
+            raise self._error(dia)
+        return self.valores[posicion].item()
+
+
+# Decretos anuales de salario mínimo y auxilio de transporte, en pesos
+SMMLV = TablaVigencias("salario mínimo", [
+    ('2000-01-01', 260_100),
+    ('2001-01-01', 286_000),
+    ('2002-01-01', 309_000),
+    ('2003-01-01', 332_000),
+    ('2004-01-01', 358_000),
+    ('2005-01-01', 381_500),
+    ('2006-01-01', 408_000),
+    ('2007-01-01', 433_700),
+    ('2008-01-01', 461_500),
+    ('2009-01-01', 496_900),
+    ('2010-01-01', 515_000),
+    ('2011-01-01', 535_600),
+    ('2012-01-01', 566_700),
+    ('2013-01-01', 589_500),
+    ('2014-01-01', 616_000),
+    ('2015-01-01', 644_350),
+    ('2016-01-01', 689_455),
+    ('2017-01-01', 737_717),
+    ('2018-01-01', 781_242),
+    ('2019-01-01', 828_116),
+    ('2020-01-01', 877_803),
+    ('2021-01-01', 908_526),
+    ('2022-01-01', 1_000_000),
+    ('2023-01-01', 1_160_000),
+    ('2024-01-01', 1_300_000),
+    ('2025-01-01', 1_423_500),
+])
+AUXILIO_TRANSPORTE = TablaVigencias("auxilio de transporte", [
+    ('2000-01-01', 30_000),
+    ('2001-01-01', 34_000),
+    ('2002-01-01', 37_500),
+    ('2003-01-01', 37_500),
+    ('2004-01-01', 41_600),
+    ('2005-01-01', 44_500),
+    ('2006-01-01', 47_700),
+    ('2007-01-01', 50_800),
+    ('2008-01-01', 55_000),
+    ('2009-01-01', 59_300),
+    ('2010-01-01', 61_500),
+    ('2011-01-01', 63_600),
+    ('2012-01-01', 67_800),
+    ('2013-01-01', 70_500),
+    ('2014-01-01', 72_000),
+    ('2015-01-01', 74_000),
+    ('2016-01-01', 77_700),
+    ('2017-01-01', 83_140),
+    ('2018-01-01', 88_211),
+    ('2019-01-01', 97_032),
+    ('2020-01-01', 102_854),
+    ('2021-01-01', 106_454),
+    ('2022-01-01', 117_172),
+    ('2023-01-01', 140_606),
+    ('2024-01-01', 162_000),
+    ('2025-01-01', 200_000),
+])
+# Tasa anual de intereses sobre cesantías (Ley 52/75)
+TASA_INTERESES_CESANTIAS = TablaVigencias("tasa de intereses sobre cesantías", [
+    ('1976-01-01', 0.12),
+])
+
+
+def dias_comerciales(inicios, fines):
+    """
+    Días de cada periodo ``(inicio, fin)`` (números de día, inclusive) en el calendario
+    comercial de nómina: meses de 30 días y el último día de cada mes cuenta como el 30.
+    Una quincena de febrero o de un mes de 31 días vale 15 días, como en los desprendibles.
+    """
+    inicios = np.asarray(inicios, dtype='datetime64[D]')
+    fines = np.asarray(fines, dtype='datetime64[D]')
+    meses_inicio = inicios.astype('datetime64[M]')
+    meses_fin = fines.astype('datetime64[M]')
+    dia_inicio = np.minimum((inicios - meses_inicio.astype('datetime64[D]')).astype(np.int64) + 1, DIAS_MES)
+    ultimo_del_mes = (fines + 1).astype('datetime64[M]') != meses_fin
+    dia_fin = np.where(ultimo_del_mes, DIAS_MES,
+                       np.minimum((fines - meses_fin.astype('datetime64[D]')).astype(np.int64) + 1, DIAS_MES))
+    meses = (meses_fin - meses_inicio).astype(np.int64)
+    return np.maximum(meses * DIAS_MES + dia_fin - dia_inicio + 1, 0)
+
+
+def promedio_mensual(total, dias):
+    """Promedio mensual (base 30 días) en centavos de un total pro rata de ``dias`` días."""
+    return prorrata(total, DIAS_MES, np.maximum(dias, 1))
+
+
+def auxilio_elegible(total_base, inicios, fines):
+    """
+    Si el salario base mensual de cada ventana ``(inicio, fin)`` da derecho a auxilio de
+    transporte con el mínimo vigente al cierre de la ventana. ``total_base`` es el total pro
+    rata en centavos. Los desprendibles pagan unas veces por días calendario y otras por
+    días comerciales (quincenas fijas aunque febrero sea corto), así que el salario mensual
+    se estima de las dos formas y se toma el menor: ante la duda, el auxilio se conserva,
+    también en las ventanas que cierran antes de la tabla de ``SMMLV``.
+    Devuelve un arreglo booleano.
+    """
+    inicios = np.asarray(inicios, dtype=np.int64)
+    fines = np.asarray(fines, dtype=np.int64)
+    total_base = np.asarray(total_base, dtype=np.int64)
+    sin_minimo = ~SMMLV.cubre(fines)
+    tope = SMMLV.en(np.maximum(fines, SMMLV.desde[0])) * (TOPE_AUXILIO_SMMLV * CENTAVOS_POR_PESO)
+    # Promedio exacto total * 30 / días <= tope, comparado sin dividir
+    mensual = total_base * DIAS_MES
+    dias = np.maximum(fines - inicios + 1, 1)
+    elegible = (mensual <= tope * dias) | sin_minimo
+    # Un periodo tiene a lo sumo 2 días comerciales más que calendario (febrero): solo las
+    # ventanas que superan el tope en días calendario pero no con 2 días más pueden cambiar
+    dudosas = np.flatnonzero(~elegible & (mensual <= tope * (dias + 2)))
+    if dudosas.size:
+        dias_dudosas = np.maximum(dias_comerciales(inicios[dudosas], fines[dudosas]), 1)
+        elegible[dudosas] = mensual[dudosas] <= tope[dudosas] * dias_dudosas
+    return elegible
+
+
+def salario_con_minimo(salario, dias_referencia):
+    """
+    Salario mensual en centavos, nunca inferior al mínimo vigente en ``dias_referencia``
+    (sin cambios en las fechas anteriores a la tabla de ``SMMLV``).
+    """
+    if type(salario) is int and type(dias_referencia) is int:
+        if not SMMLV.cubre(dias_referencia):
+            return salario
+        return max(salario, pesos_a_centavos(SMMLV.vigente(dias_referencia)))
+    minimo = pesos_a_centavos(SMMLV.en(np.maximum(dias_referencia, SMMLV.desde[0])))
+    return np.where(SMMLV.cubre(dias_referencia), np.maximum(salario, minimo), salario)
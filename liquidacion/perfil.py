@@ -0,0 +1,157 @@
+"""
+Instrumentación por etapas del cálculo.
+
+Cada etapa del pipeline (carga, preprocesamiento, resumen mensual, cada prestación,
+sanciones, reporte e impresión) se envuelve en ``with etapa(nombre):``. Con el perfil
+activo se registra por etapa el tiempo de reloj, el número de llamadas, las filas
+procesadas (``anotar_filas``) y la memoria pico por encima de la que había al entrar
+(``tracemalloc``, que también cuenta los arreglos de NumPy). ``contar_consulta`` cuenta las
+consultas de devengos por ventanas (el antiguo ``get_proportional_earnings_for_period``) y
+los periodos que cubren, las haga ``IndiceDiario``, ``bloques`` o ``ventanas``.
+
+``tracemalloc`` encarece cada asignación de memoria de Python (sobre todo al importar
+módulos): con el perfil activo los tiempos sirven para comparar etapas entre sí, no con
+una ejecución sin perfil.
+
+Apagado (lo normal) ``etapa`` devuelve un contexto vacío compartido y ``contar_consulta`` y
+``anotar_filas`` solo consultan una variable global: el costo es despreciable incluso en
+las funciones que se llaman una vez por contrato. Solo usa la librería estándar.
+
+Uso:
+    python pretensiones.py --profile           # tabla en stderr
+    python -m liquidacion ... --profile json
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+_NULO = nullcontext()
+# Contador de las consultas de devengos por ventanas (ver ``contar_consulta``)
+CONSULTAS_VENTANAS = 'consultas_ventanas'
+
+# Perfil en curso, o None si la instrumentación está apagada
+_activo = None
+
+
+class Perfil:
+    """Mediciones acumuladas por etapa y contadores de llamadas de una ejecución."""
+
+    def __init__(self):
+        self.etapas = {}
+        self.contadores = {}
+        self.inicio = time.perf_counter()
+        self.segundos = None
+        self.detener_tracemalloc = False
+        # Una entrada por etapa abierta: [pico de memoria visto en ella, filas anotadas]
+        self._pila = []
+
+    @contextmanager
+    def medir(self, nombre):
+        """Mide una ejecución de la etapa ``nombre``; las etapas pueden anidarse."""
+        if self._pila:
+            # El pico de la etapa exterior hasta ahora se conserva antes de reiniciarlo
+            self._pila[-1][0] = max(self._pila[-1][0], tracemalloc.get_traced_memory()[1])
+        # Se registra al entrar para que las etapas queden en orden de aparición
+        registro = self.etapas.setdefault(nombre, {
+            "etapa": nombre, "nivel": len(self._pila), "llamadas": 0, "segundos": 0.0, "filas": 0,
+            "memoria_pico_bytes": 0,
+        })
+        memoria_inicial = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        marco = [0, 0]
+        self._pila.append(marco)
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            self._pila.pop()
+            pico = max(tracemalloc.get_traced_memory()[1], marco[0])
+            if self._pila:
+                self._pila[-1][0] = max(self._pila[-1][0], pico)
+            registro["llamadas"] += 1
+            registro["segundos"] += segundos
+            registro["filas"] += marco[1]
+            registro["memoria_pico_bytes"] = max(registro["memoria_pico_bytes"], pico - memoria_inicial)
+
+    def contar(self, nombre, cantidad=1):
+        self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def anotar_filas(self, filas):
+        if self._pila:
+            self._pila[-1][1] += int(filas)
+
+    def terminar(self):
+        self.segundos = time.perf_counter() - self.inicio
+
+    def como_dict(self):
+        """Resultado serializable: etapas en orden de aparición, contadores y tiempo total."""
+        return {
+            "segundos_totales": self.segundos if self.segundos is not None else time.perf_counter() - self.inicio,
+            "etapas": list(self.etapas.values()),
+            "contadores": dict(self.contadores),
+        }
+
+    def como_json(self):
+        return json.dumps(self.como_dict(), ensure_ascii=False, indent=1)
+
+    def como_tabla(self):
+        """Tabla de texto con las etapas indentadas según su anidamiento."""
+        datos = self.como_dict()
+        lineas = ["--- PERFIL DE EJECUCIÓN ---",
+                  f"{'Etapa':<32}{'Llamadas':>10}{'Tiempo (ms)':>14}{'Filas':>12}{'Memoria pico (KiB)':>20}"]
+        for registro in datos["etapas"]:
+            nombre = "  " * registro["nivel"] + registro["etapa"]
+            lineas.append(f"{nombre:<32}{registro['llamadas']:>10}{registro['segundos'] * 1000:>14.2f}"
+                          f"{registro['filas']:>12}{registro['memoria_pico_bytes'] / 1024:>20.1f}")
+        if datos["contadores"]:
+            lineas.append("Contadores:")
+            lineas.extend(f"  {nombre}: {cantidad}" for nombre, cantidad in datos["contadores"].items())
+        lineas.append(f"Tiempo total: {datos['segundos_totales'] * 1000:.2f} ms")
+        return "\n".join(lineas)
+
+
+def activar():
+    """Enciende la instrumentación y devuelve el ``Perfil`` que acumula las mediciones."""
+    global _activo
+    _activo = Perfil()
+    # Si otro código ya usa tracemalloc se deja encendido al desactivar
+    _activo.detener_tracemalloc = not tracemalloc.is_tracing()
+    if _activo.detener_tracemalloc:
+        tracemalloc.start()
+    return _activo
+
+
+def desactivar():
+    """Apaga la instrumentación y devuelve el ``Perfil`` terminado (o ``None``)."""
+    global _activo
+    perfil, _activo = _activo, None
+    if perfil is not None:
+        perfil.terminar()
+        if perfil.detener_tracemalloc:
+            tracemalloc.stop()
+    return perfil
+
+
+def etapa(nombre):
+    """Contexto que mide la etapa ``nombre`` si el perfil está activo."""
+    if _activo is None:
+        return _NULO
+    return _activo.medir(nombre)
+
+
+def contar_consulta(periodos):
+    """
+    Cuenta una consulta de devengos pro rata por ventanas (lo que hacía cada llamada a
+    ``get_proportional_earnings_for_period``) y los ``periodos`` que cubre.
+    """
+    if _activo is not None:
+        _activo.contar(CONSULTAS_VENTANAS, 1)
+        _activo.contar(CONSULTAS_VENTANAS + '.periodos', int(periodos))
+
+
+def anotar_filas(filas):
+    """Suma ``filas`` a las filas procesadas por la etapa abierta más interna."""
+    if _activo is not None:
+        _activo.anotar_filas(filas)
@@ -0,0 +1,84 @@
+"""
+Reportes de texto de ``pretensiones.py`` construidos a partir del resultado de
+``calculo.calcular_pretensiones``.
+
+Cada función devuelve el texto de una sección (sin imprimirlo), con el mismo formato que
+generaba el script original. pandas solo se usa para dar formato a las tablas.
+"""
+import pandas as pd
+
+from liquidacion.calculo import ESTADO_NO_PAGADA
+from liquidacion.perfil import etapa
+
+
+def reporte_mensual(df_monthly_report):
+    """Sección del resumen financiero mensual (ver ``mensual.resumen_mensual``)."""
+    return ("--- RESUMEN FINANCIERO MENSUAL (Periodo del Contrato) ---\n"
+            f"{df_monthly_report.to_string(index=False)}\n\n")
+
+
+def reporte_liquidacion(resultado):
+    """Tabla de partidas de liquidación con la fila del total no pagado."""
+    df_liquidacion = pd.DataFrame([{k: p[k] for k in ("Concepto", "Valor", "Estado")}
+                                   for p in resultado["liquidacion"]])
+    df_liquidacion["Valor"] = df_liquidacion["Valor"].round().astype(int)
+
+    total_liquidacion_no_pagada = df_liquidacion[df_liquidacion["Estado"] == ESTADO_NO_PAGADA]["Valor"].sum()
+    df_total_liquidacion_row = pd.DataFrame([{"Concepto": "TOTAL LIQUIDACIÓN NO PAGADA",
+                                              "Valor": total_liquidacion_no_pagada, "Estado": ""}])
+    df_liquidacion_reporte = pd.concat([df_liquidacion, df_total_liquidacion_row], ignore_index=True)
+    return f"\n--- DETALLE DE LIQUIDACIÓN ---\n{df_liquidacion_reporte.to_string(index=False)}\n\n"
+
+
+def reporte_indemnizaciones(contrato, resultado):
+    """Tabla de indemnizaciones y sanciones, con las filas de detalle y el total."""
+    detalle = resultado["indemnizaciones"]
+    anio = detalle["anio_sancion_cesantias"]
+    indemnizaciones_items = [
+        {"Concepto": "Indemnización por mora en pago de liquidación (Art. 65 CST)",
+         "Valor": detalle["indemnizacion_mora_liquidacion"]},
+        {"Concepto": f"  (Días mora: {detalle['dias_mora_liquidacion']}, "
+                     f"Salario día base: {detalle['salario_diario_mora_liquidacion']})",
+         "Valor": ""}, # Detalle, sin valor numérico sumable
+    ]
+    if anio is not None:
+        indemnizaciones_items += [
+            {"Concepto": f"Sanción por no consignación Cesantías {anio} (Ley 50/90 Art. 99)",
+             "Valor": detalle["sancion_mora_cesantias"]},
+            {"Concepto": f"  (Días mora: {detalle['dias_mora_cesantias']}, "
+                         f"Salario día base sanción: {detalle['salario_diario_sancion_cesantias']})",
+             "Valor": ""}, # Detalle
+        ]
+    indemnizaciones_items.append({"Concepto": "Indemnización por Despido Indirecto (según cálculo original)",
+                                  "Valor": detalle["indemnizacion_despido"]})
+
+    df_indemnizaciones = pd.DataFrame(indemnizaciones_items)
+    # Convertir la columna 'Valor' a numérico, los strings vacíos se volverán NaN
+    df_indemnizaciones['Valor'] = pd.to_numeric(df_indemnizaciones['Valor'], errors='coerce')
+    df_total_indemnizaciones_row = pd.DataFrame([{
+        "Concepto": "TOTAL INDEMNIZACIONES Y SANCIONES",
+        "Valor": resultado["total_indemnizaciones"]
+    }])
+    df_indemnizaciones_reporte = pd.concat([df_indemnizaciones.fillna({'Valor': ''}), df_total_indemnizaciones_row],
+                                           ignore_index=True)
+    return ("\n--- INDEMNIZACIONES Y SANCIONES ---\n"
+            f"Cálculos realizados a fecha: {contrato.fecha_calculo.strftime('%Y-%m-%d')}\n"
+            f"{df_indemnizaciones_reporte.to_string(index=False)}")
+
+
+def reporte_total(resultado):
+    """Línea final con el monto total de las pretensiones."""
+    return ("\n--- MONTO TOTAL DE LAS PRETENSIONES ---\n"
+            f"Monto total de las pretensiones: {resultado['total_pretensiones']:,}\n"
+            "==========================================")
+
+
+def reporte_completo(contrato, resultado, df_monthly_report=None):
+    """Todas las secciones en el orden del script; las advertencias van antes de las indemnizaciones."""
+    with etapa('reporte'):
+        secciones = [reporte_mensual(df_monthly_report)] if df_monthly_report is not None else []
+        secciones.append(reporte_liquidacion(resultado))
+        secciones.extend(resultado["advertencias"])
+        secciones.append(reporte_indemnizaciones(contrato, resultado))
+        secciones.append(reporte_total(resultado))
+        return "\n".join(secciones)
@@ -0,0 +1,342 @@
+"""
+Servicio local de cálculo: un proceso de larga duración que responde pretensiones por HTTP.
+
+Cada ejecución de ``pretensiones.py`` importa pandas, relee el CSV y arma el cálculo desde
+cero; una herramienta que pide totales de muchos trabajadores mientras el usuario navega
+necesita respuestas en milisegundos. El servicio (solo librería estándar: ``http.server``)
+mantiene en memoria:
+
+- Los desprendibles preprocesados de cada CSV por empleado (``datos.Desprendibles``),
+  cargados con la caché de ``cache_paystubs`` y recargados cuando cambian el tamaño o la
+  fecha de modificación del archivo (la versión de los datos).
+- Las tablas de parámetros legales (``parametros``), importadas una sola vez.
+- Dos cachés LRU con la versión de los datos en la clave:
+  - ``liquidaciones``: el estado de ``incremental.LiquidacionIncremental`` por contrato
+    (fechas, salario, empleado y opciones), que no depende de la fecha de cálculo.
+  - ``resultados``: la respuesta completa por contrato y fecha de cálculo.
+  Una consulta repetida se responde desde ``resultados``; una casi repetida (el mismo
+  contrato con otra fecha de cálculo) solo rearma las sanciones desde ``liquidaciones``.
+
+Rutas:
+- ``POST /pretensiones``: un objeto JSON (o una lista de objetos) con ``inicio``, ``fin``,
+  ``salario`` y opcionalmente ``fecha_calculo`` (por defecto, hoy), ``employee_id``,
+  ``paystubs`` (por defecto, el del servicio), ``incluir_extras`` e ``incluir_aux``
+  (booleanos JSON). ``inicio`` no puede ser posterior a ``fin`` y ``salario`` debe ser un
+  entero positivo. ``paystubs`` solo puede nombrar los CSV habilitados al iniciar el
+  servicio (``--paystubs`` y ``--permitir``): un cliente no puede leer otros archivos del
+  servidor ni crear cachés junto a ellos. Una consulta inválida (incluido un CSV sin las
+  columnas esperadas o un monto fuera de rango) responde 400; un error inesperado, 500.
+  Responde la liquidación, las indemnizaciones, los totales, las advertencias (incluida la
+  validación de los desprendibles contra el contrato) y de qué caché salió la respuesta.
+- ``GET /estado``: versiones de los datos cargados y aciertos/fallos de cada caché.
+
+Uso:
+    python -m liquidacion.servicio --paystubs nomina.csv [--permitir otra.csv] [--host 127.0.0.1] [--puerto 8765]
+    curl -s localhost:8765/pretensiones -d '{"inicio": "2023-04-17", "fin": "2024-02-17", "salario": 2100000}'
+"""
+import argparse
+import json
+import os
+import threading
+import traceback
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from liquidacion.cache_paystubs import cargar_paystubs_con_cache
+from liquidacion.calculo import Contrato
+from liquidacion.datos import EMPLOYEE_COL, Desprendibles, desprendibles_por_empleado
+from liquidacion.incremental import LiquidacionIncremental
+from liquidacion.validacion import validar_desprendibles
+
+CAPACIDAD_CACHE = 4096
+PUERTO = 8765
+# Tamaño máximo del cuerpo de una solicitud
+MAX_BYTES_SOLICITUD = 16 << 20
+
+_CLAVES_RESPUESTA = ["liquidacion", "total_liquidacion_no_pagada", "indemnizaciones", "total_indemnizaciones",
+                     "total_pretensiones"]
+
+
+class CacheLRU:
+    """Diccionario acotado a ``capacidad`` entradas que descarta la usada hace más tiempo."""
+
+    def __init__(self, capacidad=CAPACIDAD_CACHE):
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+
+    def obtener(self, clave):
+        valor = self._entradas.get(clave)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, clave, valor):
+        self._entradas[clave] = valor
+        self._entradas.move_to_end(clave)
+        if len(self._entradas) > self.capacidad:
+            self._entradas.popitem(last=False)
+
+    def estado(self):
+        return {"entradas": len(self._entradas), "capacidad": self.capacidad, "aciertos": self.aciertos,
+                "fallos": self.fallos}
+
+
+def _desprendibles_vacios():
+    vacio = np.zeros(0, dtype=np.int64)
+    return Desprendibles(vacio, vacio, vacio, vacio, vacio)
+
+
+def _fecha(datos, campo, defecto=None):
+    texto = datos.get(campo)
+    if texto is None:
+        if defecto is None:
+            raise ValueError(f"Falta el campo '{campo}'.")
+        return defecto
+    try:
+        return datetime.strptime(str(texto), '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"El campo '{campo}' debe ser una fecha AAAA-MM-DD: {texto!r}.") from None
+
+
+def _salario(datos):
+    if 'salario' not in datos:
+        raise ValueError("Falta el campo 'salario'.")
+    valor = datos['salario']
+    # bool es subclase de int y un float perdería centavos en silencio
+    if isinstance(valor, bool) or not isinstance(valor, (int, str)):
+        valor = None
+    try:
+        salario = int(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"El campo 'salario' debe ser un entero: {datos['salario']!r}.") from None
+    if salario <= 0:
+        raise ValueError(f"El campo 'salario' debe ser positivo: {salario}.")
+    return salario
+
+
+def _booleano(datos, campo, defecto=True):
+    valor = datos.get(campo, defecto)
+    if not isinstance(valor, bool):
+        raise ValueError(f"El campo '{campo}' debe ser true o false: {valor!r}.")
+    return valor
+
+
+def _texto(datos, campo, defecto=''):
+    valor = datos.get(campo, defecto)
+    if not isinstance(valor, str):
+        raise ValueError(f"El campo '{campo}' debe ser un texto: {valor!r}.")
+    return valor
+
+
+class ServicioPretensiones:
+    """
+    Datos y cachés del servicio. ``calcular`` es seguro entre hilos: los cálculos (de pocos
+    milisegundos) se serializan con un candado. Las consultas solo pueden pedir ``paystubs``
+    (el CSV por defecto) o alguno de ``permitidos``.
+    """
+
+    def __init__(self, paystubs='paystubs-summary.csv', capacidad=CAPACIDAD_CACHE, advertir=print, permitidos=()):
+        self.paystubs = paystubs
+        self.permitidos = {os.path.abspath(ruta) for ruta in (paystubs, *permitidos)}
+        self.advertir = advertir
+        self.liquidaciones = CacheLRU(capacidad)
+        self.resultados = CacheLRU(capacidad)
+        # {ruta absoluta: (version, {employee_id: Desprendibles} o Desprendibles, advertencias)}
+        self._datos = {}
+        self._candado = threading.Lock()
+
+    def datos(self, ruta):
+        """
+        Desprendibles de ``ruta`` y su versión ``(tamaño, mtime_ns)``; se recargan si el CSV
+        cambió. Devuelve ``(version, desprendibles, advertencias)``. Propaga ``FileNotFoundError``;
+        un CSV sin las columnas de desprendibles lanza ``ValueError``.
+        """
+        ruta = os.path.abspath(ruta)
+        estado = os.stat(ruta)
+        version = (estado.st_size, estado.st_mtime_ns)
+        cargados = self._datos.get(ruta)
+        if cargados is not None and cargados[0] == version:
+            return cargados
+        advertencias = []
+        try:
+            df_paystubs = cargar_paystubs_con_cache(ruta, advertir=advertencias.append)
+        except KeyError as error:
+            raise ValueError(f"El archivo '{ruta}' no tiene la columna {error} de los desprendibles.") from None
+        if EMPLOYEE_COL in df_paystubs.columns:
+            df_paystubs[EMPLOYEE_COL] = df_paystubs[EMPLOYEE_COL].astype(str)
+            desprendibles = desprendibles_por_empleado(df_paystubs)
+        else:
+            desprendibles = Desprendibles.desde_dataframe(df_paystubs)
+        cargados = (version, desprendibles, advertencias)
+        self._datos[ruta] = cargados
+        self.advertir(f"Desprendibles cargados de '{ruta}' ({len(df_paystubs)} filas).")
+        return cargados
+
+    def calcular(self, datos):
+        """Atiende una consulta (diccionario de ``POST /pretensiones``) y devuelve la respuesta."""
+        if not isinstance(datos, dict):
+            raise ValueError("Cada consulta debe ser un objeto JSON.")
+        inicio, fin = _fecha(datos, 'inicio'), _fecha(datos, 'fin')
+        if inicio > fin:
+            raise ValueError(f"'inicio' ({inicio:%Y-%m-%d}) es posterior a 'fin' ({fin:%Y-%m-%d}).")
+        salario = _salario(datos)
+        hoy = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        contrato = Contrato(inicio, fin, salario, _fecha(datos, 'fecha_calculo', hoy), _texto(datos, 'employee_id'))
+        incluir_extras = _booleano(datos, 'incluir_extras')
+        incluir_aux = _booleano(datos, 'incluir_aux')
+        ruta = os.path.abspath(_texto(datos, 'paystubs', None) if datos.get('paystubs') else self.paystubs)
+        if ruta not in self.permitidos:
+            raise ValueError(f"El archivo de desprendibles '{datos['paystubs']}' no está habilitado en el servicio.")
+
+        with self._candado:
+            version, desprendibles, advertencias_carga = self.datos(ruta)
+            clave = (ruta, version, contrato.employee_id, contrato.fecha_inicio, contrato.fecha_fin, salario,
+                     incluir_extras, incluir_aux)
+            clave_resultado = clave + (contrato.fecha_calculo,)
+            respuesta = self.resultados.obtener(clave_resultado)
+            if respuesta is not None:
+                return {**respuesta, "cache": "resultado"}
+
+            origen = "liquidacion"
+            entrada = self.liquidaciones.obtener(clave)
+            if entrada is None:
+                origen = "ninguna"
+                advertencias = list(advertencias_carga)
+                if isinstance(desprendibles, dict):
+                    if contrato.employee_id not in desprendibles:
+                        advertencias.append(f"Advertencia: No hay desprendibles para el empleado "
+                                            f"'{contrato.employee_id}' en '{ruta}'.")
+                    desprendibles = desprendibles.get(contrato.employee_id) or _desprendibles_vacios()
+                validar_desprendibles(desprendibles, contrato, advertir=advertencias.append)
+                liquidacion = LiquidacionIncremental(contrato, incluir_extras, incluir_aux)
+                liquidacion.agregar(desprendibles, advertir=advertencias.append)
+                entrada = (liquidacion, advertencias)
+                self.liquidaciones.guardar(clave, entrada)
+
+            liquidacion, advertencias = entrada
+            liquidacion.mover_fecha_calculo(contrato.fecha_calculo)
+            resultado = liquidacion.resultado
+            respuesta = {clave_respuesta: resultado[clave_respuesta] for clave_respuesta in _CLAVES_RESPUESTA}
+            respuesta.update(employee_id=contrato.employee_id,
+                             fecha_calculo=contrato.fecha_calculo.strftime('%Y-%m-%d'),
+                             advertencias=advertencias + resultado["advertencias"],
+                             version_datos=f"{version[0]}-{version[1]}")
+            self.resultados.guardar(clave_resultado, respuesta)
+            return {**respuesta, "cache": origen}
+
+    def estado(self):
+        with self._candado:
+            return {"datos": {ruta: {"version": f"{version[0]}-{version[1]}", "advertencias": advertencias}
+                              for ruta, (version, _, advertencias) in self._datos.items()},
+                    "liquidaciones": self.liquidaciones.estado(), "resultados": self.resultados.estado()}
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantiene la conexión abierta entre consultas del mismo cliente
+    protocol_version = 'HTTP/1.1'
+    servicio = None
+    registrar = False
+
+    def _responder(self, codigo, cuerpo):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/estado':
+            self._responder(200, self.servicio.estado())
+        else:
+            self._responder(404, {"error": f"Ruta desconocida: {self.path}"})
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/pretensiones':
+            self._responder(404, {"error": f"Ruta desconocida: {self.path}"})
+            return
+        try:
+            longitud = int(self.headers.get('Content-Length') or 0)
+            if longitud < 0:
+                raise ValueError
+        except ValueError:
+            # Sin una longitud válida no se puede leer el cuerpo ni reutilizar la conexión
+            self.close_connection = True
+            self._responder(400, {"error": f"Content-Length inválido: {self.headers.get('Content-Length')!r}"})
+            return
+        if longitud > MAX_BYTES_SOLICITUD:
+            self.close_connection = True
+            self._responder(413, {"error": f"La solicitud supera {MAX_BYTES_SOLICITUD} bytes."})
+            return
+        try:
+            datos = json.loads(self.rfile.read(longitud) or b'null')
+            if isinstance(datos, list):
+                respuesta = [self.servicio.calcular(consulta) for consulta in datos]
+            else:
+                respuesta = self.servicio.calcular(datos)
+        except json.JSONDecodeError as error:
+            self._responder(400, {"error": f"JSON inválido: {error}"})
+        except FileNotFoundError as error:
+            self._responder(404, {"error": f"El archivo '{error.filename}' no fue encontrado."})
+        except (ValueError, OverflowError) as error:
+            # OverflowError: un monto que no cabe en la aritmética entera de centavos
+            self._responder(400, {"error": str(error)})
+        except OSError as error:
+            self._responder(400, {"error": f"No se pudo leer '{error.filename}': {error.strerror}"})
+        except Exception as error:
+            traceback.print_exc()
+            self._responder(500, {"error": f"Error interno: {type(error).__name__}: {error}"})
+        else:
+            self._responder(200, respuesta)
+
+    def log_message(self, formato, *argumentos):
+        if self.registrar:
+            super().log_message(formato, *argumentos)
+
+
+def crear_servidor(servicio, host='127.0.0.1', puerto=PUERTO, registrar=False):
+    """Servidor HTTP (un hilo por conexión) que atiende con ``servicio``; ``puerto=0`` elige uno libre."""
+    manejador = type('Manejador', (_Manejador,), {"servicio": servicio, "registrar": registrar})
+    return ThreadingHTTPServer((host, puerto), manejador)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP local del cálculo de pretensiones.")
+    parser.add_argument('--paystubs', default='paystubs-summary.csv',
+                        help="CSV de desprendibles por defecto (se carga al iniciar)")
+    parser.add_argument('--permitir', action='append', default=[], metavar='CSV',
+                        help="CSV adicional que las consultas pueden pedir en 'paystubs' (repetible)")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección en la que escucha el servicio")
+    parser.add_argument('--puerto', type=int, default=PUERTO, help="Puerto TCP")
+    parser.add_argument('--capacidad', type=int, default=CAPACIDAD_CACHE, help="Entradas de cada caché LRU")
+    parser.add_argument('--registrar', action='store_true', help="Escribir cada solicitud en stderr")
+    args = parser.parse_args(argv)
+
+    servicio = ServicioPretensiones(args.paystubs, args.capacidad, permitidos=args.permitir)
+    for ruta in [args.paystubs, *args.permitir]:
+        try:
+            servicio.datos(ruta)
+        except FileNotFoundError:
+            print(f"Advertencia: El archivo '{ruta}' no fue encontrado; se cargará cuando exista.")
+        except (ValueError, OSError) as error:
+            print(f"Advertencia: No se pudo cargar '{ruta}': {error}")
+    servidor = crear_servidor(servicio, args.host, args.puerto, args.registrar)
+    print(f"Servicio de pretensiones en http://{args.host}:{servidor.server_address[1]} (Ctrl+C para terminar).")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""
+Generador determinista de nóminas sintéticas con el esquema de ``paystubs-summary.csv``
+(más la columna ``employee_id``), para pruebas de carga y benchmarks.
+
+Cada empleado tiene un esquema de pago:
+- quincenal (la mayoría): un desprendible por quincena (1-15 y 16-fin de mes);
+- mensual: un desprendible por mes calendario (de 28 a 31 días);
+- irregular: periodos consecutivos de 1 a 60 días, que pueden cruzar meses y años.
+El primero y el último son parciales (del ingreso al fin del periodo, del inicio del
+periodo a la terminación) y se pagan por días, como el desprendible del 16 al 30 de abril
+de 2023 o el del 16 al 17 de febrero de 2024 de los datos reales. Los contratos ingresan
+desde 2019 (antes, si el empleado tiene tantos desprendibles que no caben) y terminan a
+más tardar en la fecha de cálculo (``FECHA_CALCULO``), que el manifiesto incluye. El
+salario se ajusta cada enero con el salario mínimo, el auxilio de transporte se paga solo
+hasta dos salarios mínimos y la primera quincena de cada mes (cada periodo, en los demás
+esquemas) trae recargos dominicales, festivos y nocturnos y horas extra con probabilidades
+fijas.
+
+Todo se genera con operaciones vectorizadas de NumPy a partir de una semilla, de modo que
+la misma semilla produce siempre la misma tabla, desde 10² hasta 10⁷ filas.
+
+Uso:
+    python -m liquidacion.sinteticos --filas 1000000 --semilla 0 --salida nomina-sintetica.csv \\
+        --manifiesto contratos-sinteticos.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from liquidacion.datos import EMPLOYEE_COL
+from liquidacion.ingesta_pdf import CSV_COLUMNS, MESES
+from liquidacion.parametros import AUXILIO_TRANSPORTE, SMMLV, TOPE_AUXILIO_SMMLV
+
+_ANIO_BASE = 2019
+FECHA_CALCULO = '2025-05-22'
+
+# Recargos de la primera quincena: (columna, probabilidad, horas máximas, factor sobre la hora ordinaria)
+_RECARGOS = [
+    ('sunday_bonus', 0.5, 24, 0.75),
+    ('holiday_bonus', 0.15, 16, 0.75),
+    ('night_bonus', 0.3, 40, 0.35),
+    ('day_overtime', 0.15, 12, 1.25),
+    ('night_overtime', 0.15, 8, 1.75),
+]
+HORAS_MES = 240
+TASA_DEDUCCIONES = 0.08 # Salud (4%) + pensión (4%) a cargo del trabajador
+DESPRENDIBLES_POR_EMPLEADO = 36 # Promedio, unos 18 meses de contrato
+# Esquemas de pago y la proporción de empleados de cada uno
+QUINCENAL, MENSUAL, IRREGULAR = 0, 1, 2
+_PROPORCION_ESQUEMAS = [0.75, 0.15, 0.10]
+DIAS_MAXIMOS_IRREGULAR = 60
+
+
+def _texto_fecha(dias):
+    """Fechas (números de día) en formato M/D/AAAA, formateando solo los valores distintos."""
+    unicos, inversa = np.unique(dias, return_inverse=True)
+    textos = np.array([f"{d.month}/{d.day}/{d.year}" for d in unicos.astype('datetime64[D]').tolist()], dtype=object)
+    return textos[inversa]
+
+
+def _etiquetas(inicios, fines):
+    """
+    Etiquetas como '16 al 30 de Abril 2023' (o '20 de Abril 2023 al 05 de Junio 2023' si el
+    periodo cruza de mes), formateando solo los periodos distintos.
+    """
+    unicos, inversa = np.unique(np.stack([inicios, fines], axis=1), axis=0, return_inverse=True)
+    textos = []
+    for inicio, fin in unicos.astype('datetime64[D]').tolist():
+        if (inicio.year, inicio.month) == (fin.year, fin.month):
+            textos.append(f"{inicio.day:02d} al {fin.day:02d} de {MESES[inicio.month - 1].capitalize()} {inicio.year}")
+        else:
+            textos.append(f"{inicio.day:02d} de {MESES[inicio.month - 1].capitalize()} {inicio.year} al "
+                          f"{fin.day:02d} de {MESES[fin.month - 1].capitalize()} {fin.year}")
+    return np.array(textos, dtype=object)[np.ravel(inversa)]
+
+
+def _quincena(dias):
+    """Índice de la quincena (mes * 2 + mitad) que contiene cada número de día."""
+    mes = dias.astype('datetime64[D]').astype('datetime64[M]')
+    return mes.astype(np.int64) * 2 + (dias - mes.astype('datetime64[D]').astype(np.int64) >= 15)
+
+
+def _limites_quincena(quincena):
+    """Primer y último día de cada quincena."""
+    mes, mitad = quincena // 2, quincena % 2
+    inicio_mes = mes.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+    fin_mes = (mes + 1).astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) - 1
+    return inicio_mes + 15 * mitad, np.where(mitad == 0, inicio_mes + 14, fin_mes)
+
+
+def generar_nomina(num_filas, num_empleados=None, semilla=0, fecha_calculo=FECHA_CALCULO):
+    """
+    Genera ``num_filas`` desprendibles repartidos entre ``num_empleados`` empleados (por
+    defecto, uno por cada 36 filas), con contratos que terminan a más tardar en
+    ``fecha_calculo`` (AAAA-MM-DD). Devuelve ``(df_paystubs, df_contratos)``: la tabla de
+    nómina con el esquema del CSV y un manifiesto de contratos para ``liquidacion.lote``.
+    """
+    if num_filas < 1:
+        raise ValueError("Se necesita al menos un desprendible.")
+    rng = np.random.default_rng(semilla)
+    num_empleados = min(num_empleados or max(1, num_filas // DESPRENDIBLES_POR_EMPLEADO), num_filas)
+    corte = np.datetime64(fecha_calculo, 'D').astype(np.int64)
+    dia_base = np.datetime64(f'{_ANIO_BASE}-01-01').astype(np.int64)
+
+    # Desprendibles por empleado: al menos uno, con duraciones de contrato dispersas
+    pesos = rng.gamma(2.0, size=num_empleados)
+    por_empleado = 1 + rng.multinomial(num_filas - num_empleados, pesos / pesos.sum())
+    empleado = np.repeat(np.arange(num_empleados), por_empleado)
+    desde = np.cumsum(por_empleado) - por_empleado
+    posicion = np.arange(num_filas) - desde[empleado]
+    primero = posicion == 0
+    ultimo = posicion == por_empleado[empleado] - 1
+    esquema = rng.choice(3, num_empleados, p=_PROPORCION_ESQUEMAS)
+    esquema_fila = esquema[empleado]
+
+    # Quincenal y mensual: periodos de ``paso`` quincenas consecutivas (una o dos). La primera
+    # quincena se elige desde 2019 de modo que la última empiece a más tardar en el corte
+    paso = np.where(esquema == MENSUAL, 2, 1)
+    primera_maxima = _quincena(corte) - paso * (por_empleado - 1)
+    primera_maxima -= primera_maxima % paso
+    holgura = np.maximum(primera_maxima - _quincena(dia_base), 0) // paso
+    primera = primera_maxima - paso * rng.integers(0, holgura + 1)
+    quincena = primera[empleado] + paso[empleado] * posicion
+    inicio_quincenas, _ = _limites_quincena(quincena)
+    _, fin_quincenas = _limites_quincena(quincena + paso[empleado] - 1)
+
+    # Irregular: duraciones de 1 a 60 días seguidas, con el último periodo empezando a más
+    # tardar en el corte
+    duracion = rng.integers(1, DIAS_MAXIMOS_IRREGULAR + 1, num_filas)
+    acumulado = np.cumsum(duracion) - duracion
+    desplazamiento = acumulado - acumulado[desde][empleado]
+    inicio_maximo = corte - desplazamiento[desde + por_empleado - 1]
+    inicio_irregular = inicio_maximo - rng.integers(0, np.maximum(inicio_maximo - dia_base, 0) + 1)
+    inicio_irregulares = inicio_irregular[empleado] + desplazamiento
+
+    irregular = esquema_fila == IRREGULAR
+    inicio_periodo = np.where(irregular, inicio_irregulares, inicio_quincenas)
+    fin_periodo = np.where(irregular, inicio_irregulares + duracion - 1, fin_quincenas)
+    if inicio_periodo.min() < SMMLV.desde[0]:
+        raise ValueError("Demasiados desprendibles por empleado: las fechas quedan antes de las tablas de "
+                         "parámetros. Use más empleados.")
+
+    # Ingreso dentro del primer periodo y terminación dentro del último, sin pasar del corte
+    tope = np.minimum(fin_periodo, corte)
+    ingreso_fila = inicio_periodo + np.where(irregular, 0, rng.integers(0, tope - inicio_periodo + 1))
+    ingreso = ingreso_fila[desde]
+    inicios = np.where(primero, ingreso_fila, inicio_periodo)
+    terminacion = inicios + rng.integers(0, tope - inicios + 1)
+    fines = np.where(ultimo, terminacion, fin_periodo)
+    completa = ~irregular & (inicios == inicio_periodo) & (fines == fin_periodo)
+    dias = fines - inicios + 1
+    # Recargos en la primera quincena del mes y bonificación de transporte en la segunda; en
+    # los esquemas mensual e irregular, en cada periodo
+    quincenal = esquema_fila == QUINCENAL
+    mitad = quincena % 2
+    con_recargos = ~quincenal | (mitad == 0)
+    con_incentivo = ~quincenal | (mitad == 1)
+
+    # Salario ajustado cada año con el mínimo; auxilio solo hasta dos mínimos
+    # Mínimo y auxilio vigentes en el mes de cada desprendible (parametros)
+    inicio_mes = inicios.astype('datetime64[D]').astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+    smmlv = SMMLV.en(inicio_mes)
+    multiplicador = np.clip(rng.lognormal(np.log(1.8), 0.35, num_empleados), 1.0, 8.0)
+    salario = (np.round(multiplicador[empleado] * smmlv / 1000) * 1000).astype(np.int64)
+    auxilio = np.where(salario <= TOPE_AUXILIO_SMMLV * smmlv, AUXILIO_TRANSPORTE.en(inicio_mes), 0)
+    periodos_mes = np.where(quincenal, 2, 1)
+
+    columnas = {
+        'base_salary': np.where(completa, salario // periodos_mes, np.round(salario / 30 * dias)).astype(np.int64),
+        'aux_transp': np.where(completa, auxilio // periodos_mes, np.round(auxilio / 30 * dias)).astype(np.int64),
+        'incentive_transp': np.where(con_incentivo & (auxilio > 0) & (rng.random(num_filas) < 0.4),
+                                     rng.integers(0, 260_000, num_filas), 0),
+    }
+    hora = salario / HORAS_MES
+    for col, probabilidad, horas_maximas, factor in _RECARGOS:
+        horas = rng.integers(1, horas_maximas + 1, num_filas)
+        aplica = con_recargos & (rng.random(num_filas) < probabilidad)
+        columnas[col] = np.where(aplica, np.round(hora * factor * horas), 0).astype(np.int64)
+    columnas['other_bonuses'] = np.where(con_recargos & (rng.random(num_filas) < 0.5),
+                                         rng.integers(0, salario // 5 + 1), 0)
+
+    gross = sum(columnas[col] for col in CSV_COLUMNS[3:12])
+    deducciones = np.round((gross - columnas['aux_transp'] - columnas['incentive_transp']) * TASA_DEDUCCIONES)
+    columnas['gross_earnings'] = gross
+    columnas['total_deductions'] = deducciones.astype(np.int64)
+    columnas['net_pay'] = gross - columnas['total_deductions']
+
+    ids = np.array([f"E{i:07d}" for i in range(num_empleados)], dtype=object)
+    df_paystubs = pd.DataFrame({
+        EMPLOYEE_COL: ids[empleado],
+        'label': _etiquetas(inicios, fines),
+        'pay_period_starts': _texto_fecha(inicios),
+        'pay_period_ends': _texto_fecha(fines),
+        **{col: columnas[col] for col in CSV_COLUMNS[3:]},
+    })
+
+    df_contratos = pd.DataFrame({
+        EMPLOYEE_COL: ids,
+        'fecha_inicio': ingreso.astype('datetime64[D]'),
+        'fecha_fin': fines[ultimo].astype('datetime64[D]'),
+        'salario_base': salario[ultimo],
+        'fecha_calculo': np.full(num_empleados, corte).astype('datetime64[D]'),
+    })
+    return df_paystubs, df_contratos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera una nómina sintética.")
+    parser.add_argument('--filas', type=int, required=True, help="Número de desprendibles")
+    parser.add_argument('--empleados', type=int, default=None, help="Número de empleados (por defecto, filas / 36)")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla del generador")
+    parser.add_argument('--fecha-calculo', default=FECHA_CALCULO,
+                        help="Fecha de cálculo (AAAA-MM-DD); ningún contrato termina después")
+    parser.add_argument('--salida', default='nomina-sintetica.csv', help="CSV de desprendibles")
+    parser.add_argument('--manifiesto', default=None, help="CSV de contratos para liquidacion.lote")
+    args = parser.parse_args(argv)
+
+    df_paystubs, df_contratos = generar_nomina(args.filas, args.empleados, args.semilla, args.fecha_calculo)
+    df_paystubs.to_csv(args.salida, index=False)
+    if args.manifiesto:
+        df_contratos.to_csv(args.manifiesto, index=False, date_format='%Y-%m-%d')
+    print(f"{len(df_paystubs)} desprendibles de {len(df_contratos)} empleados escritos en '{args.salida}'.")
+
+
+if __name__ == '__main__':
+    main()
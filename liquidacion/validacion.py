@@ -0,0 +1,406 @@
+"""
+Validación de la línea de tiempo y de los totales de los desprendibles, antes de calcular.
+
+Las fórmulas suponen que los periodos de los desprendibles de cada trabajador no se solapan
+y cubren el contrato: un desprendible duplicado o solapado cuenta dos veces los mismos días
+y un hueco baja los promedios sin que nada lo indique. Aquí se revisa:
+
+- Línea de tiempo (``revisar_periodos``): los intervalos se ordenan una sola vez por
+  (empleado, inicio, fin) y un barrido con el máximo acumulado de los fines de cada
+  empleado encuentra duplicados, solapes y huecos entre desprendibles, y con las fechas
+  del contrato también los días pagados fuera del contrato y los días del contrato sin
+  desprendible. O(n log n) por el ordenamiento; el resto es O(n).
+- Totales (``revisar_montos``): ``gross_earnings`` igual a la suma de los conceptos
+  devengados y ``gross_earnings - total_deductions == net_pay``, fila a fila y vectorizado.
+
+Nada recorre filas en Python, así que la validación corre siempre (millones de filas en
+pocos segundos). Los hallazgos son índices de fila en el orden de entrada; las funciones
+``validar_*`` los resumen en advertencias de texto y no detienen el cálculo.
+
+Uso:
+    python -m liquidacion.validacion paystubs-summary.csv [--inicio 2023-04-17 --fin 2024-02-17]
+"""
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+from liquidacion.datos import EMPLOYEE_COL, EXTRAS_COLS
+from liquidacion.ventanas import a_numero_de_dia
+
+# Conceptos devengados que suman ``gross_earnings``
+COLUMNAS_DEVENGADO = ['base_salary', 'aux_transp', 'incentive_transp', *EXTRAS_COLS, 'other_bonuses']
+# Filas de ejemplo que se citan en cada advertencia
+MAX_EJEMPLOS = 5
+
+_MAXIMO_INT64 = int(np.iinfo(np.int64).max)
+
+
+def revisar_periodos(inicios, fines, codigos=None, contrato_inicios=None, contrato_fines=None):
+    """
+    Barrido de la línea de tiempo de los desprendibles.
+
+    ``inicios``/``fines`` son números de día por fila y ``codigos`` el código entero del
+    empleado de cada fila (por defecto, todas del mismo). ``contrato_inicios`` y
+    ``contrato_fines`` son las fechas del contrato (números de día), escalares o arreglos
+    indexados por código; sin ellas no se revisan los días fuera del contrato y los huecos
+    se cuentan solo entre desprendibles.
+
+    Devuelve un diccionario de arreglos: ``duplicados``, ``solapados`` (filas que empiezan
+    antes de que termine un desprendible anterior del mismo empleado), ``huecos`` (filas
+    precedidas por días sin desprendible) con sus ``dias_hueco``, ``fuera_contrato`` con sus
+    ``dias_fuera_contrato`` y ``sin_cubrir_al_final`` (códigos cuyo último desprendible
+    termina antes que el contrato) con sus ``dias_sin_cubrir_al_final``.
+    """
+    inicios = np.asarray(inicios, dtype=np.int64)
+    fines = np.asarray(fines, dtype=np.int64)
+    codigos = np.zeros(inicios.size, dtype=np.int64) if codigos is None else np.asarray(codigos, dtype=np.int64)
+    con_contrato = contrato_inicios is not None
+    vacio = np.zeros(0, dtype=np.int64)
+    if inicios.size == 0:
+        return {clave: vacio for clave in ('duplicados', 'solapados', 'huecos', 'dias_hueco', 'fuera_contrato',
+                                           'dias_fuera_contrato', 'sin_cubrir_al_final', 'dias_sin_cubrir_al_final')}
+
+    orden = _orden_periodos(codigos, inicios, fines)
+    codigos, inicios, fines = codigos[orden], inicios[orden], fines[orden]
+    primero = np.r_[True, codigos[1:] != codigos[:-1]]
+    ultimo = np.r_[primero[1:], True]
+
+    # Máximo acumulado de los fines dentro de cada empleado: cada grupo se desplaza por
+    # encima de todos los anteriores para que un solo maximum.accumulate no los mezcle
+    grupo = np.cumsum(primero) - 1
+    base = min(int(inicios.min()), int(fines.min())) - 1
+    salto = int(fines.max()) - base + 1
+    fin_acumulado = np.maximum.accumulate(fines - base + grupo * salto) - grupo * salto + base
+    fin_previo = np.r_[base, fin_acumulado[:-1]]
+
+    if con_contrato:
+        contrato_inicio = _por_fila(contrato_inicios, codigos)
+        contrato_fin = _por_fila(contrato_fines, codigos)
+        # El primer desprendible de cada empleado debe empezar con el contrato
+        fin_previo = np.where(primero, contrato_inicio - 1, fin_previo)
+        # Solo cuentan los días sin desprendible que caen dentro del contrato
+        desde = np.maximum(fin_previo + 1, contrato_inicio)
+        dias_hueco = np.maximum(np.minimum(inicios - 1, contrato_fin) - desde + 1, 0)
+    else:
+        dias_hueco = np.where(primero, 0, np.maximum(inicios - fin_previo - 1, 0))
+
+    duplicado = ~primero & (inicios == np.r_[base, inicios[:-1]]) & (fines == np.r_[base, fines[:-1]])
+    solapado = ~primero & ~duplicado & (inicios <= fin_previo)
+    hueco = dias_hueco > 0
+    resultado = {
+        "duplicados": np.sort(orden[duplicado]),
+        "solapados": np.sort(orden[solapado]),
+    }
+    resultado["huecos"], resultado["dias_hueco"] = _ordenar_por_fila(orden[hueco], dias_hueco[hueco])
+
+    if con_contrato:
+        # Días del desprendible antes del inicio o después del fin del contrato
+        dias_fuera = (np.maximum(np.minimum(fines, contrato_inicio - 1) - inicios + 1, 0) +
+                      np.maximum(fines - np.maximum(inicios, contrato_fin + 1) + 1, 0))
+        fuera = dias_fuera > 0
+        resultado["fuera_contrato"], resultado["dias_fuera_contrato"] = \
+            _ordenar_por_fila(orden[fuera], dias_fuera[fuera])
+        dias_final = np.maximum(contrato_fin - np.maximum(fin_acumulado, contrato_inicio - 1), 0)
+        sin_cubrir = ultimo & (dias_final > 0)
+        resultado["sin_cubrir_al_final"] = codigos[sin_cubrir]
+        resultado["dias_sin_cubrir_al_final"] = dias_final[sin_cubrir]
+    else:
+        resultado.update(fuera_contrato=vacio, dias_fuera_contrato=vacio, sin_cubrir_al_final=vacio,
+                         dias_sin_cubrir_al_final=vacio)
+    return resultado
+
+
+def _orden_periodos(codigos, inicios, fines):
+    """Orden por (código, inicio, fin); con una sola clave int64 si cabe, que es varias veces más rápido."""
+    minimo_inicio, minimo_fin = int(inicios.min()), int(fines.min())
+    rango_inicio = int(inicios.max()) - minimo_inicio + 1
+    rango_fin = int(fines.max()) - minimo_fin + 1
+    if codigos.min() < 0 or (int(codigos.max()) + 1) * rango_inicio * rango_fin > _MAXIMO_INT64:
+        return np.lexsort((fines, inicios, codigos))
+    clave = (codigos * rango_inicio + (inicios - minimo_inicio)) * rango_fin + (fines - minimo_fin)
+    return np.argsort(clave, kind='stable')
+
+
+def _por_fila(valores, codigos):
+    valores = np.asarray(valores, dtype=np.int64)
+    return np.full(codigos.size, valores) if valores.ndim == 0 else valores[codigos]
+
+
+def _ordenar_por_fila(filas, valores):
+    orden = np.argsort(filas, kind='stable')
+    return filas[orden], valores[orden]
+
+
+def revisar_montos(df_paystubs):
+    """
+    Filas cuyo devengado no cuadra. Devuelve ``{"devengado": (filas, diferencias),
+    "neto": (filas, diferencias)}``: ``gross_earnings`` menos la suma de
+    ``COLUMNAS_DEVENGADO`` y ``gross_earnings - total_deductions`` menos ``net_pay``. Una
+    revisión se omite (sin filas) si faltan sus columnas; los vacíos cuentan como 0.
+    """
+    def columna(col):
+        return np.rint(np.nan_to_num(np.asarray(df_paystubs[col], dtype=np.float64))).astype(np.int64)
+
+    columnas = set(df_paystubs.columns)
+    vacio = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    resultado = {"devengado": vacio, "neto": vacio}
+    if 'gross_earnings' not in columnas:
+        return resultado
+    bruto = columna('gross_earnings')
+    presentes = [col for col in COLUMNAS_DEVENGADO if col in columnas]
+    if presentes:
+        diferencia = bruto - sum(columna(col) for col in presentes)
+        filas = np.flatnonzero(diferencia)
+        resultado["devengado"] = (filas, diferencia[filas])
+    if {'total_deductions', 'net_pay'} <= columnas:
+        diferencia = bruto - columna('total_deductions') - columna('net_pay')
+        filas = np.flatnonzero(diferencia)
+        resultado["neto"] = (filas, diferencia[filas])
+    return resultado
+
+
+# ============================
+# Advertencias
+# ============================
+
+def _fecha(dia):
+    return str(np.datetime64(int(dia), 'D'))
+
+
+def resumir_hallazgos(periodos, montos, inicios, fines, numeros_fila=None):
+    """
+    Resumen de los hallazgos de ``revisar_periodos`` y ``revisar_montos`` (``montos`` puede
+    ser ``None``) para ``advertencias_hallazgos``: ``{tipo: (cantidad, total, ejemplos)}``,
+    con ``ejemplos`` las primeras ``MAX_EJEMPLOS`` filas como ``(numero_fila, inicio, fin,
+    valor)`` (``(codigo, valor)`` en ``sin_cubrir_al_final``) y ``total`` la suma de los
+    valores. ``numeros_fila`` traduce los índices de los hallazgos al número de fila que se
+    cita (por defecto, el mismo índice).
+    """
+    def resumen(filas, valores=None):
+        filas = np.asarray(filas, dtype=np.int64)
+        valores = np.zeros(filas.size, dtype=np.int64) if valores is None else np.asarray(valores, dtype=np.int64)
+        ejemplos = [(fila if numeros_fila is None else int(numeros_fila[fila]), int(inicios[fila]), int(fines[fila]),
+                     valor) for fila, valor in zip(filas[:MAX_EJEMPLOS].tolist(), valores[:MAX_EJEMPLOS].tolist())]
+        return filas.size, int(valores.sum()), ejemplos
+
+    dias_final = np.asarray(periodos["dias_sin_cubrir_al_final"], dtype=np.int64)
+    hallazgos = {
+        "duplicados": resumen(periodos["duplicados"]),
+        "solapados": resumen(periodos["solapados"]),
+        "huecos": resumen(periodos["huecos"], periodos["dias_hueco"]),
+        "fuera_contrato": resumen(periodos["fuera_contrato"], periodos["dias_fuera_contrato"]),
+        "sin_cubrir_al_final": (dias_final.size, int(dias_final.sum()),
+                                list(zip(periodos["sin_cubrir_al_final"][:MAX_EJEMPLOS].tolist(),
+                                         dias_final[:MAX_EJEMPLOS].tolist()))),
+    }
+    if montos is not None:
+        for clave in ("devengado", "neto"):
+            hallazgos[clave] = resumen(*montos[clave])
+    return hallazgos
+
+
+def _ejemplos(cantidad, ejemplos, detalle=None):
+    textos = []
+    for k, (numero, inicio, fin, _) in enumerate(ejemplos):
+        texto = f"fila {numero} ({_fecha(inicio)} a {_fecha(fin)})"
+        if detalle is not None:
+            texto += f" {detalle[k]}"
+        textos.append(texto)
+    if cantidad > MAX_EJEMPLOS:
+        textos.append(f"y {cantidad - MAX_EJEMPLOS} más")
+    return ", ".join(textos)
+
+
+def advertencias_validacion(periodos, montos, inicios, fines, nombres_empleado=None, numeros_fila=None):
+    """
+    Textos de advertencia de los hallazgos de ``revisar_periodos`` y ``revisar_montos``
+    (``montos`` puede ser ``None``), citando hasta ``MAX_EJEMPLOS`` filas de cada uno.
+    ``nombres_empleado`` traduce los códigos de empleado a sus identificadores y
+    ``numeros_fila`` los índices de los hallazgos al número de fila que se cita (por
+    defecto, el mismo índice).
+    """
+    return advertencias_hallazgos(resumir_hallazgos(periodos, montos, inicios, fines, numeros_fila),
+                                  nombres_empleado)
+
+
+def advertencias_hallazgos(hallazgos, nombres_empleado=None):
+    """
+    Textos de advertencia de un resumen de ``resumir_hallazgos`` (o armado fila a fila,
+    como en ``bloques``); los tipos que faltan no tienen hallazgos.
+    """
+    def hay(tipo):
+        return tipo in hallazgos and hallazgos[tipo][0] > 0
+
+    def ejemplos(tipo, detalle=None):
+        cantidad, _, filas = hallazgos[tipo]
+        return _ejemplos(cantidad, filas, detalle and [detalle(valor) for *_, valor in filas])
+
+    advertencias = []
+    if hay("duplicados"):
+        advertencias.append(f"Advertencia: {hallazgos['duplicados'][0]} desprendible(s) duplicado(s) se "
+                            f"cuentan dos veces: {ejemplos('duplicados')}.")
+    if hay("solapados"):
+        advertencias.append(f"Advertencia: {hallazgos['solapados'][0]} desprendible(s) se solapan con uno "
+                            f"anterior: {ejemplos('solapados')}.")
+    if hay("huecos"):
+        cantidad, dias, _ = hallazgos["huecos"]
+        advertencias.append(f"Advertencia: {dias} día(s) sin desprendible antes de {cantidad} desprendible(s): "
+                            f"{ejemplos('huecos', lambda d: f'tras {d} día(s) sin desprendible')}.")
+    if hay("fuera_contrato"):
+        advertencias.append(f"Advertencia: {hallazgos['fuera_contrato'][0]} desprendible(s) pagan días fuera "
+                            f"del contrato: {ejemplos('fuera_contrato', lambda d: f'{d} día(s)')}.")
+    if hay("sin_cubrir_al_final"):
+        cantidad, _, codigos = hallazgos["sin_cubrir_al_final"]
+        quienes = ", ".join(f"{nombres_empleado[c] if nombres_empleado is not None else c}: {d} día(s)"
+                            for c, d in codigos)
+        mas = cantidad - len(codigos)
+        advertencias.append(f"Advertencia: Los desprendibles terminan antes que el contrato ({quienes}"
+                            f"{f', y {mas} más' if mas > 0 else ''}).")
+    if hay("devengado"):
+        advertencias.append(f"Advertencia: {hallazgos['devengado'][0]} desprendible(s) con 'gross_earnings' "
+                            f"distinto de la suma de los devengados: "
+                            f"{ejemplos('devengado', lambda d: f'diferencia {d:,}')}.")
+    if hay("neto"):
+        advertencias.append(f"Advertencia: {hallazgos['neto'][0]} desprendible(s) con 'net_pay' distinto de "
+                            f"'gross_earnings' - 'total_deductions': "
+                            f"{ejemplos('neto', lambda d: f'diferencia {d:,}')}.")
+    return advertencias
+
+
+def validar_paystubs(df_paystubs, contrato=None, contratos=None, advertir=print):
+    """
+    Valida un DataFrame de desprendibles preprocesado (ver ``datos.preprocesar_paystubs``)
+    y pasa cada advertencia a ``advertir``. Con ``contrato`` se revisa la cobertura de ese
+    contrato; con ``contratos`` (``{employee_id: Contrato}``) cada empleado se revisa contra
+    el suyo y las filas de empleados sin contrato se ignoran. Sin columna ``employee_id``
+    todas las filas son de un mismo trabajador. Devuelve la lista de advertencias.
+    """
+    inicios = a_numero_de_dia(df_paystubs['Period_Start_Date'])
+    fines = a_numero_de_dia(df_paystubs['Period_End_Date'])
+    codigos = nombres = None
+    # Con un solo contrato todas las filas son de ese trabajador, como en ``calcular_pretensiones``
+    if EMPLOYEE_COL in df_paystubs.columns and contrato is None:
+        import pandas as pd
+
+        codigos, nombres = pd.factorize(df_paystubs[EMPLOYEE_COL].astype(str))
+        nombres = np.asarray(nombres, dtype=object)
+    return validar_arreglos(inicios, fines, codigos, nombres, contrato, contratos, revisar_montos(df_paystubs),
+                            advertir)
+
+
+def validar_arreglos(inicios, fines, codigos=None, nombres=None, contrato=None, contratos=None, montos=None,
+                     advertir=print, numeros_fila=None):
+    """
+    ``validar_paystubs`` sobre arreglos ya extraídos: ``inicios``/``fines`` en números de
+    día, ``codigos`` de empleado con sus ``nombres`` y los hallazgos de ``revisar_montos``
+    (o ``None``). ``numeros_fila`` da el número de fila que se cita para cada posición.
+    """
+    if contratos is not None and nombres is not None:
+        vigentes = [contratos.get(nombre) for nombre in nombres.tolist()]
+        con_contrato = np.array([c is not None for c in vigentes], dtype=bool)
+        filas = np.flatnonzero(con_contrato[codigos])
+        periodos = revisar_periodos(inicios[filas], fines[filas], codigos[filas],
+                                    _dias_contrato([c and c.fecha_inicio for c in vigentes]),
+                                    _dias_contrato([c and c.fecha_fin for c in vigentes]))
+        # Índices de vuelta a filas del DataFrame completo
+        for clave in ('duplicados', 'solapados', 'huecos', 'fuera_contrato'):
+            periodos[clave] = filas[periodos[clave]]
+        for clave, (filas_montos, diferencias) in (montos or {}).items():
+            conservar = con_contrato[codigos[filas_montos]]
+            montos[clave] = (filas_montos[conservar], diferencias[conservar])
+    elif contrato is not None:
+        periodos = revisar_periodos(inicios, fines, None, a_numero_de_dia(contrato.fecha_inicio),
+                                    a_numero_de_dia(contrato.fecha_fin))
+    else:
+        periodos = revisar_periodos(inicios, fines, codigos)
+
+    advertencias = advertencias_validacion(periodos, montos, inicios, fines, nombres, numeros_fila)
+    for texto in advertencias:
+        advertir(texto)
+    return advertencias
+
+
+def _dias_contrato(fechas):
+    # Los empleados sin contrato (None) quedan en 0; sus filas ya se descartaron
+    return np.nan_to_num(np.asarray(fechas, dtype='datetime64[D]').astype(np.float64)).astype(np.int64)
+
+
+def validar_desprendibles(desprendibles, contrato=None, advertir=print):
+    """
+    Como ``validar_paystubs`` para los ``datos.Desprendibles`` de un trabajador: solo la
+    línea de tiempo, porque los arreglos no traen devengado ni neto.
+    """
+    contrato_inicio = contrato_fin = None
+    if contrato is not None:
+        contrato_inicio = a_numero_de_dia(contrato.fecha_inicio)
+        contrato_fin = a_numero_de_dia(contrato.fecha_fin)
+    periodos = revisar_periodos(desprendibles.inicios, desprendibles.fines, None, contrato_inicio, contrato_fin)
+    advertencias = advertencias_validacion(periodos, None, desprendibles.inicios, desprendibles.fines)
+    for texto in advertencias:
+        advertir(texto)
+    return advertencias
+
+
+def validar_agregados(df_nuevas, contrato, ultimo_fin=None, advertir=print, primera_fila=0):
+    """
+    Valida filas agregadas al final de una nómina ya procesada hasta el día ``ultimo_fin``
+    (ver ``incremental``): duplicados y solapes entre ellas, el hueco desde ``ultimo_fin``
+    (o desde el inicio del contrato) hasta la primera, días fuera del contrato y totales.
+    Los solapes con lo ya procesado los advierte ``LiquidacionIncremental.agregar``. Las
+    filas se citan a partir de ``primera_fila``.
+    """
+    inicios = a_numero_de_dia(df_nuevas['Period_Start_Date'])
+    fines = a_numero_de_dia(df_nuevas['Period_End_Date'])
+    contrato_inicio = a_numero_de_dia(contrato.fecha_inicio)
+    contrato_fin = a_numero_de_dia(contrato.fecha_fin)
+    desde = contrato_inicio if ultimo_fin is None else max(int(contrato_inicio), int(ultimo_fin) + 1)
+    periodos = revisar_periodos(inicios, fines, None, desde, contrato_fin)
+    # Fuera del contrato se mide contra el contrato completo, no contra lo pendiente
+    fuera = revisar_periodos(inicios, fines, None, contrato_inicio, contrato_fin)
+    periodos["fuera_contrato"] = fuera["fuera_contrato"]
+    periodos["dias_fuera_contrato"] = fuera["dias_fuera_contrato"]
+    advertencias = advertencias_validacion(periodos, revisar_montos(df_nuevas), inicios, fines,
+                                           numeros_fila=np.arange(inicios.size) + primera_fila)
+    for texto in advertencias:
+        advertir(texto)
+    return advertencias
+
+
+def validar_montos(df_paystubs, advertir=print):
+    """
+    Solo la revisión de totales de ``validar_paystubs``, para quien ya valida la línea de
+    tiempo sobre los ``datos.Desprendibles`` (ver ``validar_desprendibles``).
+    """
+    inicios = a_numero_de_dia(df_paystubs['Period_Start_Date'])
+    fines = a_numero_de_dia(df_paystubs['Period_End_Date'])
+    periodos = revisar_periodos(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    advertencias = advertencias_validacion(periodos, revisar_montos(df_paystubs), inicios, fines)
+    for texto in advertencias:
+        advertir(texto)
+    return advertencias
+
+
+def _fecha_argumento(texto):
+    return datetime.strptime(texto, '%Y-%m-%d')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Valida la línea de tiempo y los totales de los desprendibles.")
+    parser.add_argument('paystubs', help="CSV de desprendibles")
+    parser.add_argument('--inicio', type=_fecha_argumento, help="Inicio del contrato (AAAA-MM-DD)")
+    parser.add_argument('--fin', type=_fecha_argumento, help="Terminación del contrato (AAAA-MM-DD)")
+    args = parser.parse_args(argv)
+
+    from liquidacion.cache_paystubs import cargar_paystubs_con_cache
+    from liquidacion.calculo import Contrato
+
+    contrato = None
+    if args.inicio is not None and args.fin is not None:
+        contrato = Contrato(args.inicio, args.fin, 0, args.fin)
+    advertencias = validar_paystubs(cargar_paystubs_con_cache(args.paystubs), contrato=contrato)
+    print(f"{len(advertencias)} advertencia(s) en '{args.paystubs}'.")
+
+
+if __name__ == '__main__':
+    main()
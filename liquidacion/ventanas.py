@@ -0,0 +1,136 @@
+"""
+Motor vectorizado de solapamiento entre periodos de cálculo y desprendibles de nómina.
+
+Reemplaza el recorrido fila a fila (``iterrows``) de ``get_proportional_earnings_for_period``
+por un único cálculo con NumPy sobre todas las ventanas a la vez. Las fechas se trabajan
+como números de día (int64) y la acumulación se hace con ``cumsum`` en el mismo orden de
+filas que el bucle original, de modo que los resultados coinciden bit a bit.
+
+El tope legal del auxilio de transporte (ver ``parametros.auxilio_elegible``) no forma
+parte de la función original: ``get_proportional_earnings_for_periods`` solo lo aplica con
+``tope_auxilio=True`` y, por defecto, devuelve exactamente lo mismo que el bucle.
+"""
+import numpy as np
+
+from liquidacion.dinero import centavos_desde_float
+from liquidacion.parametros import auxilio_elegible
+from liquidacion.perfil import contar_consulta
+
+# Máximo de celdas (ventanas x desprendibles) que se materializan por bloque.
+# Acota la memoria cuando se consultan muchas ventanas sobre muchos desprendibles.
+MAX_CELDAS_POR_BLOQUE = 4_000_000
+
+
+def a_numero_de_dia(fechas):
+    """
+    Convierte fechas (datetime, Timestamp, Series o arreglos datetime64) a números de día
+    int64 desde 1970-01-01. Se descarta la hora: todos los cálculos son por día calendario.
+    """
+    return np.asarray(fechas, dtype='datetime64[D]').astype(np.int64)
+
+
+def calcular_totales_pro_rata(inicios, fines, ps_inicios, ps_fines, base, extras, aux):
+    """
+    Calcula, para cada ventana (inicio, fin), los totales proporcionales de salario base,
+    extras y auxilio de transporte de los desprendibles que se solapan con ella.
+
+    Todos los argumentos son arreglos: ``inicios``/``fines`` (W,) y ``ps_*``, ``base``,
+    ``extras``, ``aux`` (P,), con fechas expresadas como números de día.
+    Devuelve un diccionario con los arreglos (W,) ``base``, ``extras``, ``aux`` y ``dias``.
+    """
+    inicios = np.asarray(inicios, dtype=np.int64)
+    fines = np.asarray(fines, dtype=np.int64)
+    contar_consulta(inicios.size)
+    ps_inicios = np.asarray(ps_inicios, dtype=np.int64)
+    ps_fines = np.asarray(ps_fines, dtype=np.int64)
+    montos = np.stack([
+        np.asarray(base, dtype=np.float64),
+        np.asarray(extras, dtype=np.float64),
+        np.asarray(aux, dtype=np.float64),
+    ])
+
+    num_ventanas = inicios.shape[0]
+    num_desprendibles = ps_inicios.shape[0]
+    totales = np.zeros((3, num_ventanas), dtype=np.float64)
+    dias_desprendible = ps_fines - ps_inicios + 1
+
+    if num_desprendibles > 0:
+        tamano_bloque = max(1, MAX_CELDAS_POR_BLOQUE // num_desprendibles)
+        for desde in range(0, num_ventanas, tamano_bloque):
+            hasta = min(desde + tamano_bloque, num_ventanas)
+            # Intersección de cada ventana del bloque con cada desprendible (broadcast W x P)
+            solape_inicio = np.maximum(inicios[desde:hasta, None], ps_inicios[None, :])
+            solape_fin = np.minimum(fines[desde:hasta, None], ps_fines[None, :])
+            dias_solape = solape_fin - solape_inicio + 1
+            hay_solape = (dias_solape > 0) & (dias_desprendible[None, :] > 0)
+
+            ratio = np.divide(dias_solape, dias_desprendible[None, :],
+                              out=np.zeros(dias_solape.shape, dtype=np.float64), where=hay_solape)
+            # cumsum acumula en orden de filas, igual que ``total += monto * ratio`` en el bucle;
+            # sumar 0.0 por los desprendibles sin solape no altera el resultado.
+            for i in range(3):
+                totales[i, desde:hasta] = np.cumsum(montos[i][None, :] * ratio, axis=1)[:, -1]
+
+    return {
+        "base": totales[0],
+        "extras": totales[1],
+        "aux": totales[2],
+        "dias": np.maximum(fines - inicios + 1, 0),
+    }
+
+
+def get_proportional_earnings_for_periods(df_paystubs, periodos, tope_auxilio=False):
+    """
+    Versión por lotes de ``get_proportional_earnings_for_period``: recibe una lista de
+    periodos ``(fecha_inicio, fecha_fin)`` y devuelve, en el mismo orden, un diccionario
+    por periodo con los mismos campos que la función original. Con ``tope_auxilio`` el
+    auxilio de las ventanas sin derecho a él queda en 0, como en ``calculo``.
+    """
+    if len(periodos) == 0:
+        return []
+    inicios = a_numero_de_dia([inicio for inicio, _ in periodos])
+    fines = a_numero_de_dia([fin for _, fin in periodos])
+
+    totales = calcular_totales_pro_rata(
+        inicios, fines,
+        a_numero_de_dia(df_paystubs['Period_Start_Date']),
+        a_numero_de_dia(df_paystubs['Period_End_Date']),
+        df_paystubs['base_salary'].to_numpy(),
+        df_paystubs['total_extras'].to_numpy(),
+        df_paystubs['aux_transp'].to_numpy(),
+    )
+    if tope_auxilio:
+        return promedios_desde_totales(totales, inicios, fines)
+    return promedios_desde_totales(totales)
+
+
+def promedios_desde_totales(totales, inicios=None, fines=None):
+    """
+    Convierte los totales pro rata por ventana en los promedios mensuales (base 30 días)
+    que usan las fórmulas de liquidación. Con las fechas de las ventanas (``inicios`` y
+    ``fines`` en números de día) el auxilio de las ventanas sin derecho a él queda en 0
+    (ver ``parametros.auxilio_elegible``).
+    """
+    totales_aux = totales["aux"]
+    if fines is not None:
+        elegible = auxilio_elegible(centavos_desde_float(totales["base"]), inicios, fines)
+        totales_aux = np.where(elegible, totales_aux, 0.0)
+    resultados = []
+    for total_base, total_extras, total_aux, dias in zip(
+            totales["base"].tolist(), totales["extras"].tolist(),
+            totales_aux.tolist(), totales["dias"].tolist()):
+        if dias == 0:
+            resultados.append({
+                "avg_monthly_salary_for_formula": 0.0,
+                "avg_monthly_aux_for_formula": 0.0,
+                "avg_monthly_base_salary_only_for_formula": 0.0,
+                "worked_days_in_period": 0,
+            })
+            continue
+        resultados.append({
+            "avg_monthly_salary_for_formula": (total_base + total_extras) / dias * 30,
+            "avg_monthly_aux_for_formula": total_aux / dias * 30,
+            "avg_monthly_base_salary_only_for_formula": total_base / dias * 30,
+            "worked_days_in_period": dias,
+        })
+    return resultados
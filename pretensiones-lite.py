@@ -1,6 +1,14 @@
-import pandas as pd
 from datetime import datetime, timedelta
 
+from liquidacion import dinero
+from liquidacion.cache_paystubs import cargar_paystubs_con_cache
+from liquidacion.calculo import (Contrato, calcular_cesantias, calcular_intereses_cesantias, calcular_prima,
+                                 calcular_vacaciones, excluir_auxilio_no_elegible)
+from liquidacion.indice_diario import IndiceDiario
+from liquidacion.parametros import DIAS_ANIO, DIAS_MES, TASA_INTERESES_CESANTIAS, salario_con_minimo
+from liquidacion.validacion import validar_paystubs
+from liquidacion.ventanas import a_numero_de_dia
+
 # ============================
 # 1. CONFIGURACIÓN GENERAL
 # ============================
@@ -10,27 +18,21 @@ fecha_fin_contrato = datetime(2024, 2, 17)
 fecha_actual = datetime(2025, 5, 9)
 
 salario_base = 2_100_000
-salario_diario = salario_base / 30
+salario_base_centavos = dinero.pesos_a_centavos(salario_base)
 
 # ============================
 # 2. CARGA Y PREPROCESAMIENTO DE DATOS
 # ============================
 
-# Carga el archivo CSV con la información de los desprendibles de nómina
-df_paystubs = pd.read_csv('paystubs-summary.csv')
-
-# Convierte fechas y extrae metadatos útiles
-df_paystubs['Period_Start_Date'] = pd.to_datetime(df_paystubs['pay_period_starts'])
-df_paystubs['Period_End_Date'] = pd.to_datetime(df_paystubs['pay_period_ends'])
-df_paystubs['year_month_period'] = df_paystubs['Period_Start_Date'].dt.to_period('M')
-
-# Columnas relevantes para el cálculo de extras
-extras_cols = ['sunday_bonus', 'holiday_bonus', 'night_bonus', 'day_overtime', 'night_overtime']
+# Carga el archivo CSV con la información de los desprendibles de nómina, convierte fechas y
+# columnas numéricas y calcula el total de extras (usa la caché binaria si el CSV no cambió)
+df_paystubs = cargar_paystubs_con_cache('paystubs-summary.csv')
 
-for col in extras_cols + ['base_salary', 'aux_transp']:
-    df_paystubs[col] = pd.to_numeric(df_paystubs[col], errors='coerce').fillna(0).astype(int)
+# Validación de la línea de tiempo y de los totales de los desprendibles antes de calcular
+validar_paystubs(df_paystubs, contrato=Contrato(fecha_inicio_contrato, fecha_fin_contrato, salario_base, fecha_actual))
 
-df_paystubs['total_extras'] = df_paystubs[extras_cols].sum(axis=1)
+# Índice diario con sumas acumuladas para consultar cualquier periodo sin recorrer la tabla
+indice_devengos = IndiceDiario.desde_paystubs(df_paystubs)
 
 # ============================
 # 3. FUNCIONES AUXILIARES
@@ -39,33 +41,16 @@ df_paystubs['total_extras'] = df_paystubs[extras_cols].sum(axis=1)
 def calcular_dias_laborados(inicio, fin):
     return max((fin - inicio).days + 1, 0)
 
-def get_proportional_earnings_for_period(df, start, end):
-    total_base, total_extras, total_aux = 0, 0, 0
-    dias_periodo = calcular_dias_laborados(start, end)
-
-    for _, row in df.iterrows():
-        ps_start, ps_end = row['Period_Start_Date'], row['Period_End_Date']
-        overlap_start, overlap_end = max(start, ps_start), min(end, ps_end)
-
-        if overlap_start <= overlap_end:
-            overlap_days = calcular_dias_laborados(overlap_start, overlap_end)
-            pay_period_days = calcular_dias_laborados(ps_start, ps_end)
-            if pay_period_days == 0:
-                continue
-            ratio = overlap_days / pay_period_days
-            total_base += row['base_salary'] * ratio
-            total_extras += row['total_extras'] * ratio
-            total_aux += row['aux_transp'] * ratio
-
-    if dias_periodo == 0:
-        return {"avg_monthly_salary": 0, "avg_monthly_aux": 0, "avg_base_only": 0, "days": 0}
-
-    return {
-        "avg_monthly_salary": (total_base + total_extras) / dias_periodo * 30,
-        "avg_monthly_aux": total_aux / dias_periodo * 30,
-        "avg_base_only": total_base / dias_periodo * 30,
-        "days": dias_periodo,
-    }
+def totales_periodos(periods):
+    # Totales pro rata en centavos de todos los periodos, respondidos desde las sumas
+    # acumuladas del índice diario (ver liquidacion.dinero para los redondeos)
+    return indice_devengos.totales_centavos(a_numero_de_dia([inicio for inicio, _ in periods]),
+                                            a_numero_de_dia([fin for _, fin in periods]))
+
+def totales_prestaciones(periods):
+    # Igual, pero sin el auxilio de transporte donde el salario supera el tope legal vigente
+    totales = totales_periodos(periods)
+    return excluir_auxilio_no_elegible(totales, totales['inicios'], totales['fines'])
 
 # ============================
 # 4. CALCULO DE PRESTACIONES
@@ -85,26 +70,19 @@ cesantias_periods = [
 
 vacaciones_period = (fecha_inicio_contrato, fecha_fin_contrato)
 
-# Calcular primas
-primas = []
-for inicio, fin in prima_periods:
-    data = get_proportional_earnings_for_period(df_paystubs, inicio, fin)
-    valor = (data['avg_monthly_salary'] + data['avg_monthly_aux']) * data['days'] / 360
-    primas.append(round(valor))
-
-# Calcular cesantías e intereses
-cesantias = []
-intereses = []
-for inicio, fin in cesantias_periods:
-    data = get_proportional_earnings_for_period(df_paystubs, inicio, fin)
-    ces = (data['avg_monthly_salary'] + data['avg_monthly_aux']) * data['days'] / 360
-    int_ces = ces * data['days'] * 0.12 / 360
-    cesantias.append(round(ces))
-    intereses.append(round(int_ces))
-
-# Calcular vacaciones
-vac_data = get_proportional_earnings_for_period(df_paystubs, *vacaciones_period)
-vacaciones = round(vac_data['avg_base_only'] * vac_data['days'] / 720)
+# Calcular primas: (salario promedio + auxilio promedio) * días / 360
+primas = dinero.a_pesos(calcular_prima(totales_prestaciones(prima_periods))).tolist()
+
+# Calcular cesantías e intereses (tasa anual vigente al cierre de cada periodo)
+totales_cesantias = totales_prestaciones(cesantias_periods)
+valores_cesantias = calcular_cesantias(totales_cesantias)
+cesantias = dinero.a_pesos(valores_cesantias).tolist()
+tasas_intereses = TASA_INTERESES_CESANTIAS.en(totales_cesantias['fines'])
+intereses = dinero.a_pesos(calcular_intereses_cesantias(valores_cesantias, totales_cesantias['dias'],
+                                                       tasas_intereses)).tolist()
+
+# Calcular vacaciones: salario base promedio * días / 720
+vacaciones = int(dinero.a_pesos(calcular_vacaciones(totales_periodos([vacaciones_period])))[0])
 
 # ============================
 # 5. INDEMNIZACIONES Y SANCIONES
@@ -112,14 +90,17 @@ vacaciones = round(vac_data['avg_base_only'] * vac_data['days'] / 720)
 
 fecha_limite_pago = fecha_fin_contrato + timedelta(days=15)
 dias_mora_liquidacion = max((fecha_actual - fecha_limite_pago).days, 0)
-indem_mora_liquidacion = round(salario_diario * dias_mora_liquidacion)
+# Salario de las sanciones: el contractual, sin bajar del mínimo vigente
+salario_mora = salario_con_minimo(salario_base_centavos, a_numero_de_dia(fecha_fin_contrato))
+indem_mora_liquidacion = int(dinero.a_pesos(dinero.prorrata(salario_mora, dias_mora_liquidacion, DIAS_MES)))
 
 fecha_limite_cesantias = datetime(2024, 2, 15)
 dias_mora_cesantias = max((fecha_actual - fecha_limite_cesantias).days, 0)
-sancion_cesantias = round(salario_diario * dias_mora_cesantias)
+salario_sancion = salario_con_minimo(salario_base_centavos, a_numero_de_dia(datetime(2023, 12, 31)))
+sancion_cesantias = int(dinero.a_pesos(dinero.prorrata(salario_sancion, dias_mora_cesantias, DIAS_MES)))
 
 dias_servicio = calcular_dias_laborados(fecha_inicio_contrato, fecha_fin_contrato)
-indem_despido = round(salario_base / 360 * dias_servicio)
+indem_despido = int(dinero.a_pesos(dinero.prorrata(salario_base_centavos, dias_servicio, DIAS_ANIO)))
 
 # ============================
 # 6. RESUMEN FINAL
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Las pruebas importan ``liquidacion`` y ``benchmarks`` desde la raíz del repositorio
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
@@ -0,0 +1,107 @@
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.paridad_motores import ganancias_periodo_fila_a_fila
+from liquidacion.bloques import AcumuladorPeriodos, AcumuladorValidacion, liquidar_por_bloques
+from liquidacion.calculo import calcular_pretensiones
+from liquidacion.datos import cargar_paystubs, desprendibles_por_empleado
+from liquidacion.lote import leer_manifiesto
+from liquidacion.sinteticos import generar_nomina
+from liquidacion.validacion import MAX_EJEMPLOS, validar_paystubs
+
+
+def _silencio(texto):
+    pass
+
+
+def _centavos(monto):
+    """Fracción de pesos redondeada al centavo, mitad al par (como ``dinero``)."""
+    return round(monto * 100)
+
+
+@pytest.fixture(scope='module')
+def nomina(tmp_path_factory):
+    carpeta = tmp_path_factory.mktemp('bloques')
+    df_nomina, df_contratos = generar_nomina(800, semilla=5)
+    df_nomina.to_csv(carpeta / 'nomina.csv', index=False)
+    df_contratos.to_csv(carpeta / 'manifiesto.csv', index=False, date_format='%Y-%m-%d')
+    return carpeta
+
+
+@pytest.mark.parametrize("filas_por_bloque", [7, 100_000])
+def test_bloques_igual_a_calcular_pretensiones(nomina, filas_por_bloque):
+    contratos = [contrato for contrato, _ in leer_manifiesto(nomina / 'manifiesto.csv',
+                                                             pd.Timestamp('2025-05-22').to_pydatetime())]
+    resultados, _ = liquidar_por_bloques(contratos, str(nomina / 'nomina.csv'), filas_por_bloque,
+                                         advertir=_silencio)
+    por_empleado = desprendibles_por_empleado(cargar_paystubs(nomina / 'nomina.csv', advertir=_silencio))
+    assert resultados == [calcular_pretensiones(c, por_empleado[c.employee_id]) for c in contratos]
+
+
+def test_periodos_con_duraciones_de_1_a_60_dias():
+    # El mínimo común múltiplo de 1..47 ya no cabe en int64
+    rng = np.random.default_rng(3)
+    duraciones = np.tile(np.arange(1, 61), 4)
+    ps_inicios = rng.integers(0, 400, duraciones.size)
+    ps_fines = ps_inicios + duraciones - 1
+    montos = rng.integers(0, 9_000_000, (3, duraciones.size))
+    inicios = rng.integers(0, 400, 50)
+    fines = inicios + rng.integers(0, 200, 50)
+
+    periodos = AcumuladorPeriodos(np.zeros(50), inicios, fines)
+    for desde in range(0, duraciones.size, 70):
+        tramo = slice(desde, desde + 70)
+        periodos.agregar(np.zeros(duraciones[tramo].size), ps_inicios[tramo], ps_fines[tramo], *montos[:, tramo])
+    totales = periodos.totales_centavos()
+
+    filas = list(zip(ps_inicios.tolist(), ps_fines.tolist(), *montos.tolist()))
+    for k in range(inicios.size):
+        esperados = ganancias_periodo_fila_a_fila(filas, int(inicios[k]), int(fines[k]))
+        assert [int(totales[nombre][k]) for nombre in ("base", "extras", "aux")] == [
+            _centavos(Fraction(monto)) for monto in esperados]
+
+
+@pytest.mark.parametrize("filas_por_bloque", [41, 100_000])
+def test_validacion_por_bloques_igual_a_validacion(tmp_path, filas_por_bloque):
+    df_nomina, df_contratos = generar_nomina(1500, semilla=4)
+    rng = np.random.default_rng(4)
+    # Duplicados y huecos, con las filas de cada empleado en orden de fechas
+    df_nomina = pd.concat([df_nomina, df_nomina.sample(30, random_state=1)]).drop(
+        df_nomina.sample(40, random_state=2).index)
+    df_nomina = df_nomina.iloc[np.argsort(pd.to_datetime(df_nomina['pay_period_starts']).to_numpy(), kind='stable')]
+    df_nomina['gross_earnings'] = df_nomina['base_salary'] + rng.integers(0, 2, len(df_nomina))
+    df_nomina.to_csv(tmp_path / 'nomina.csv', index=False)
+    # El manifiesto en el orden en que aparecen los empleados, como los cita ``validacion``
+    df_contratos = df_contratos.set_index('employee_id').loc[df_nomina['employee_id'].unique()].reset_index()
+    df_contratos.iloc[1:].to_csv(tmp_path / 'manifiesto.csv', index=False, date_format='%Y-%m-%d')
+    contratos = [contrato for contrato, _ in leer_manifiesto(tmp_path / 'manifiesto.csv',
+                                                             pd.Timestamp('2025-05-22').to_pydatetime())]
+
+    esperadas = validar_paystubs(cargar_paystubs(tmp_path / 'nomina.csv', advertir=_silencio),
+                                 contratos={contrato.employee_id: contrato for contrato in contratos},
+                                 advertir=_silencio)
+    assert any("duplicado" in texto for texto in esperadas) and any("sin desprendible" in texto for texto in esperadas)
+    advertencias = []
+    liquidar_por_bloques(contratos, str(tmp_path / 'nomina.csv'), filas_por_bloque, advertir=advertencias.append)
+    assert advertencias == esperadas
+
+
+def test_validacion_guarda_solo_el_estado_por_empleado():
+    validacion = AcumuladorValidacion(1)
+    sin_montos = pd.DataFrame(index=range(2))
+    dias = np.arange(0, 200, 2)
+    for desde in range(0, dias.size, 2):
+        # Desprendibles de un día con un día sin pagar entre cada uno
+        validacion.agregar(sin_montos, np.zeros(2, dtype=np.int64), dias[desde:desde + 2], dias[desde:desde + 2],
+                           np.ones(2, dtype=bool))
+    cantidad, total, ejemplos = validacion._hallazgos["huecos"]
+    assert (cantidad, total, len(ejemplos)) == (99, 99, MAX_EJEMPLOS)
+    # Una fila que llega después de otra posterior del mismo empleado se advierte como solapada
+    validacion.agregar(sin_montos.iloc[:1], np.zeros(1, dtype=np.int64), np.array([51]), np.array([51]),
+                       np.ones(1, dtype=bool))
+    (texto_solape, texto_huecos) = validacion.validar(advertir=_silencio)
+    assert "1 desprendible(s) se solapan" in texto_solape and "fila 100 (1970-02-21 a 1970-02-21)" in texto_solape
+    assert texto_huecos.startswith("Advertencia: 99 día(s) sin desprendible antes de 99 desprendible(s)")
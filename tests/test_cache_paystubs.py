@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from liquidacion import cache_paystubs
+from liquidacion.cache_paystubs import cargar_desprendibles_con_cache, cargar_paystubs_con_cache
+from liquidacion.datos import Desprendibles, cargar_paystubs
+from liquidacion.sinteticos import generar_nomina
+
+
+def _silencio(texto):
+    pass
+
+
+@pytest.fixture
+def ruta_csv(tmp_path):
+    df_nomina, _ = generar_nomina(80, num_empleados=2, semilla=4)
+    ruta = tmp_path / 'nomina.csv'
+    df_nomina.to_csv(ruta, index=False)
+    return str(ruta)
+
+
+@pytest.fixture
+def sin_preprocesar(monkeypatch):
+    """Hace fallar cualquier lectura del CSV: solo se puede responder desde la caché."""
+    def fallar(*args, **kwargs):
+        raise AssertionError("Se volvió a preprocesar el CSV")
+
+    def activar():
+        monkeypatch.setattr(cache_paystubs, 'preprocesar_paystubs', fallar)
+    return activar
+
+
+def _cambiar_valor(ruta, anterior, nuevo):
+    with open(ruta, encoding='utf-8') as archivo:
+        texto = archivo.read()
+    assert anterior in texto
+    estado = os.stat(ruta)
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        archivo.write(texto.replace(anterior, nuevo, 1))
+    # Misma longitud: el cambio lo delatan la fecha de modificación y el hash del contenido
+    os.utime(ruta, ns=(estado.st_atime_ns, estado.st_mtime_ns + 1_000_000_000))
+
+
+def test_la_cache_reproduce_la_carga(ruta_csv, sin_preprocesar):
+    esperado = cargar_paystubs(ruta_csv, advertir=_silencio)
+    primero = cargar_paystubs_con_cache(ruta_csv, advertir=_silencio)
+    sin_preprocesar()
+    segundo = cargar_paystubs_con_cache(ruta_csv, advertir=_silencio)
+    for df in (primero, segundo):
+        pd.testing.assert_frame_equal(df[esperado.columns], esperado, check_dtype=False)
+    desprendibles = cargar_desprendibles_con_cache(ruta_csv, advertir=_silencio)
+    assert all(np.array_equal(a, b) for a, b in zip(desprendibles, Desprendibles.desde_dataframe(esperado)))
+
+
+def test_se_invalida_si_cambia_el_csv(ruta_csv):
+    cargar_paystubs_con_cache(ruta_csv, advertir=_silencio)
+    salario = str(int(pd.read_csv(ruta_csv)['base_salary'][0]))
+    reemplazo = ('9' if salario[0] != '9' else '8') + salario[1:]
+    _cambiar_valor(ruta_csv, f',{salario},', f',{reemplazo},')
+    assert cargar_paystubs_con_cache(ruta_csv, advertir=_silencio)['base_salary'][0] == int(reemplazo)
+    assert cargar_desprendibles_con_cache(ruta_csv, advertir=_silencio).base[0] == int(reemplazo)
+
+
+def test_solo_cambia_la_fecha_reutiliza_y_actualiza_meta(ruta_csv, sin_preprocesar):
+    cargar_paystubs_con_cache(ruta_csv, advertir=_silencio)
+    estado = os.stat(ruta_csv)
+    os.utime(ruta_csv, ns=(estado.st_atime_ns, estado.st_mtime_ns + 5_000_000_000))
+    sin_preprocesar()
+    cargar_paystubs_con_cache(ruta_csv, advertir=_silencio)
+    meta = cache_paystubs._leer_meta(cache_paystubs._carpeta_cache(ruta_csv))
+    assert meta["origen"]["mtime_ns"] == os.stat(ruta_csv).st_mtime_ns
+    assert not [nombre for nombre in os.listdir(cache_paystubs._carpeta_cache(ruta_csv)) if nombre.endswith('.tmp')]
+
+
+def test_mismo_nombre_en_carpetas_distintas_con_cache_compartida(tmp_path):
+    compartida = str(tmp_path / 'cache')
+    rutas = []
+    for semilla in (1, 2):
+        carpeta = tmp_path / f'origen-{semilla}'
+        carpeta.mkdir()
+        df_nomina, _ = generar_nomina(40, num_empleados=1, semilla=semilla)
+        df_nomina.to_csv(carpeta / 'nomina.csv', index=False)
+        rutas.append(str(carpeta / 'nomina.csv'))
+    for _ in range(2):
+        for ruta in rutas:
+            df = cargar_paystubs_con_cache(ruta, advertir=_silencio, carpeta_cache=compartida)
+            assert df['base_salary'].tolist() == pd.read_csv(ruta)['base_salary'].tolist()
+    assert len(os.listdir(compartida)) == 2
@@ -0,0 +1,51 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from liquidacion.cache_paystubs import cargar_desprendibles_con_cache
+from liquidacion.calculo import Contrato, calcular_pretensiones
+from liquidacion.curvas import curva_pretensiones, fechas_de_curva
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTRATO = Contrato(datetime(2023, 4, 17), datetime(2024, 2, 17), 2_100_000, datetime(2025, 5, 22))
+COLUMNAS = ['dias_mora_liquidacion', 'indemnizacion_mora_liquidacion', 'dias_mora_cesantias',
+            'sancion_mora_cesantias', 'indemnizacion_despido']
+
+
+def _silencio(texto):
+    pass
+
+
+@pytest.fixture(scope='module')
+def desprendibles(tmp_path_factory):
+    return cargar_desprendibles_con_cache(os.path.join(RAIZ, 'paystubs-summary.csv'), advertir=_silencio,
+                                          carpeta_cache=str(tmp_path_factory.mktemp('cache')))
+
+
+def test_curva_igual_a_calcular_pretensiones_en_cada_fecha(desprendibles):
+    # Antes de la terminación, antes y después del 15 de febrero y con meses cortos
+    fechas = pd.to_datetime(['2024-01-10', '2024-02-17', '2024-02-18', '2024-03-01', '2024-02-14', '2024-02-15',
+                             '2025-02-15', '2025-02-16', '2025-05-22', '2027-12-31'])
+    df_curva = curva_pretensiones(CONTRATO, desprendibles, fechas, advertir=_silencio)
+    assert df_curva.index.tolist() == fechas.tolist()
+    for fecha, fila in df_curva.iterrows():
+        contrato = Contrato(CONTRATO.fecha_inicio, CONTRATO.fecha_fin, CONTRATO.salario_base, fecha.to_pydatetime())
+        resultado = calcular_pretensiones(contrato, desprendibles)
+        assert {col: int(fila[col]) for col in COLUMNAS} == {col: resultado["indemnizaciones"][col]
+                                                           for col in COLUMNAS}
+        assert fila["total_pretensiones"] == resultado["total_pretensiones"]
+    assert df_curva.loc['2025-05-22', 'total_pretensiones'] == 69_787_008
+
+
+def test_curva_no_decrece(desprendibles):
+    df_curva = curva_pretensiones(CONTRATO, desprendibles, fechas_de_curva('2024-01-01', 900), advertir=_silencio)
+    assert len(df_curva) == 901
+    assert np.all(np.diff(df_curva["total_pretensiones"].to_numpy()) >= 0)
+
+
+def test_fechas_de_curva_con_fechas_adicionales():
+    fechas = fechas_de_curva('2025-01-01', 2, ['2025-06-30', '2025-01-02'])
+    assert [str(f.date()) for f in fechas] == ['2025-01-01', '2025-01-02', '2025-01-03', '2025-06-30']
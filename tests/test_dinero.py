@@ -0,0 +1,78 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from liquidacion.dinero import (a_pesos, aplicar_tasa, centavos_desde_float, centavos_desde_fraccion,
+                                centavos_desde_fracciones, dividir_redondeando, pesos_a_centavos, prorrata)
+
+
+@pytest.mark.parametrize("numerador, esperado", [(5, 0), (15, 2), (25, 2), (35, 4), (-5, 0), (-15, -2), (14, 1),
+                                                 (16, 2)])
+def test_dividir_redondeando_mitad_al_par(numerador, esperado):
+    assert dividir_redondeando(numerador, 10) == esperado
+    assert dividir_redondeando(np.array([numerador]), 10).tolist() == [esperado]
+
+
+@pytest.mark.parametrize("numerador, esperado", [(5, 1), (15, 2), (25, 3), (-5, 0), (-15, -1), (14, 1), (16, 2)])
+def test_dividir_redondeando_mitad_arriba(numerador, esperado):
+    assert dividir_redondeando(numerador, 10, mitad_arriba=True) == esperado
+    assert dividir_redondeando(np.array([numerador]), 10, mitad_arriba=True).tolist() == [esperado]
+
+
+def test_escalar_y_arreglo_coinciden_con_fracciones():
+    rng = np.random.default_rng(0)
+    numeradores = rng.integers(-10**12, 10**12, 2000)
+    denominadores = rng.integers(1, 10**6, 2000)
+    par = dividir_redondeando(numeradores, denominadores)
+    arriba = dividir_redondeando(numeradores, denominadores, mitad_arriba=True)
+    for n, d, p, a in zip(numeradores.tolist(), denominadores.tolist(), par.tolist(), arriba.tolist()):
+        assert p == round(Fraction(n, d)) == dividir_redondeando(n, d)
+        assert a == int(np.floor(Fraction(n, d) + Fraction(1, 2))) == dividir_redondeando(n, d, mitad_arriba=True)
+
+
+@pytest.mark.parametrize("numeradores, denominadores, esperado", [
+    ([-294], [240], -122), ([294], [240], 122), ([3, 3], [8, 8], 75), ([1, 1], [400, 400], 0),
+    ([3, 1], [400, 400], 1)])
+def test_suma_de_fracciones_empates_al_par(numeradores, denominadores, esperado):
+    assert centavos_desde_fracciones(numeradores, denominadores) == esperado
+
+
+@pytest.mark.parametrize("maximo", [12, 60])
+def test_suma_de_fracciones_exacta(maximo):
+    # Con denominadores de 1 a 60 el mínimo común múltiplo no cabe en int64
+    rng = np.random.default_rng(maximo)
+    denominadores = np.arange(1, maximo + 1)
+    numeradores = rng.integers(-10**12, 10**12, (2, 30, maximo))
+    centavos = centavos_desde_fracciones(numeradores, denominadores)
+    assert centavos.shape == (2, 30)
+    for fila, obtenido in zip(numeradores.reshape(-1, maximo).tolist(), centavos.reshape(-1).tolist()):
+        assert obtenido == round(sum(Fraction(n * 100, d) for n, d in zip(fila, denominadores.tolist())))
+
+
+def test_prorrata_redondea_una_sola_vez():
+    # 1 centavo * 1/2 = 0,5 -> 0 (par); 3 * 1/2 = 1,5 -> 2
+    assert prorrata(1, 1, 2) == 0
+    assert prorrata(3, 1, 2) == 2
+    assert prorrata(np.array([1, 3, 100]), 1, 3).tolist() == [0, 1, 33]
+    with pytest.raises(OverflowError):
+        prorrata(np.array([2**62]), 4, 1)
+
+
+def test_aplicar_tasa_en_puntos_basicos():
+    # 12 % de 1.000.000 centavos por 180/360 días
+    assert aplicar_tasa(1_000_000, 0.12, 180, 360) == 60_000
+    assert aplicar_tasa(np.array([1_000_000, 7]), 0.12).tolist() == [120_000, 1]
+    with pytest.raises(ValueError):
+        aplicar_tasa(100, 0.123456)
+
+
+def test_conversiones_al_centavo_y_al_peso():
+    assert pesos_a_centavos(1_300_000) == 130_000_000
+    assert pesos_a_centavos(np.array([1.0, 2.0])).tolist() == [100, 200]
+    with pytest.raises(ValueError):
+        pesos_a_centavos(np.array([1.5]))
+    # 1/8 de peso = 12,5 centavos -> 12 (par); 3/8 = 37,5 -> 38
+    assert centavos_desde_fraccion(np.array([1, 3]), 8).tolist() == [12, 38]
+    assert centavos_desde_float(np.array([0.125, 0.375])).tolist() == [12, 38]
+    assert a_pesos(np.array([49, 50, 150, 250, -50])).tolist() == [0, 1, 2, 3, 0]
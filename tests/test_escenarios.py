@@ -0,0 +1,61 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from liquidacion.cache_paystubs import cargar_desprendibles_con_cache
+from liquidacion.calculo import Contrato, calcular_pretensiones
+from liquidacion.escenarios import barrido_escenarios
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INICIO = datetime(2023, 4, 17)
+FINES = [datetime(2023, 12, 31), datetime(2024, 2, 17), datetime(2024, 6, 30)]
+SALARIOS = [1_000_000, 2_100_000]
+FECHAS_CALCULO = [datetime(2024, 7, 1), datetime(2025, 5, 22)]
+
+
+def _silencio(texto):
+    pass
+
+
+@pytest.fixture(scope='module')
+def desprendibles(tmp_path_factory):
+    return cargar_desprendibles_con_cache(os.path.join(RAIZ, 'paystubs-summary.csv'), advertir=_silencio,
+                                          carpeta_cache=str(tmp_path_factory.mktemp('cache')))
+
+
+@pytest.fixture(scope='module')
+def escenarios(desprendibles):
+    return barrido_escenarios(INICIO, desprendibles, FINES, SALARIOS, FECHAS_CALCULO, incluir_extras=(True, False),
+                              incluir_aux=(True, False), advertir=_silencio)
+
+
+def test_una_fila_por_escenario_igual_a_calcular_pretensiones(escenarios, desprendibles):
+    assert len(escenarios) == len(FINES) * len(SALARIOS) * len(FECHAS_CALCULO) * 4
+    for fila in escenarios.itertuples(index=False):
+        contrato = Contrato(INICIO, fila.fecha_fin.to_pydatetime(), fila.salario_base,
+                            fila.fecha_calculo.to_pydatetime())
+        resultado = calcular_pretensiones(contrato, desprendibles, incluir_extras=fila.incluir_extras,
+                                          incluir_aux=fila.incluir_aux)
+        assert fila.total_liquidacion_no_pagada == resultado["total_liquidacion_no_pagada"]
+        for columna in ('indemnizacion_mora_liquidacion', 'sancion_mora_cesantias', 'indemnizacion_despido'):
+            assert getattr(fila, columna) == resultado["indemnizaciones"][columna]
+        assert fila.total_pretensiones == resultado["total_pretensiones"]
+
+
+def test_escenario_del_contrato(escenarios):
+    fila = escenarios[(escenarios['fecha_fin'] == '2024-02-17') & (escenarios['salario_base'] == 2_100_000) &
+                      (escenarios['fecha_calculo'] == '2025-05-22') & escenarios['incluir_extras'] &
+                      escenarios['incluir_aux']]
+    assert fila['total_pretensiones'].tolist() == [69_787_008]
+
+
+def test_procesos_no_cambian_el_resultado(escenarios, desprendibles):
+    en_paralelo = barrido_escenarios(INICIO, desprendibles, FINES, SALARIOS, FECHAS_CALCULO,
+                                     incluir_extras=(True, False), incluir_aux=(True, False), procesos=2,
+                                     advertir=_silencio)
+    assert en_paralelo.equals(escenarios)
+
+
+def test_sin_fechas_de_terminacion(desprendibles):
+    assert barrido_escenarios(INICIO, desprendibles, [], SALARIOS, FECHAS_CALCULO, advertir=_silencio).empty
@@ -0,0 +1,108 @@
+import csv
+import json
+import os
+import sys
+
+import pytest
+
+from liquidacion.calculo import Contrato, calcular_pretensiones
+from liquidacion.datos import desprendibles_por_empleado, preprocesar_paystubs
+from liquidacion.exportacion import COLUMNAS, ExportadorXLSX, abrir_exportador, tablas_trabajador
+from liquidacion.mensual import resumen_mensual_desprendibles
+from liquidacion.sinteticos import generar_nomina
+
+
+def _silencio(texto):
+    pass
+
+
+@pytest.fixture(scope='module')
+def trabajadores():
+    """``(contrato, resultado, df_mensual)`` de los trabajadores de una nómina sintética pequeña."""
+    df_nomina, df_contratos = generar_nomina(300, semilla=3)
+    por_empleado = desprendibles_por_empleado(preprocesar_paystubs(df_nomina, advertir=_silencio))
+    salida = []
+    for fila in df_contratos.itertuples(index=False):
+        contrato = Contrato(fila.fecha_inicio.to_pydatetime(), fila.fecha_fin.to_pydatetime(),
+                            int(fila.salario_base), fila.fecha_fin.to_pydatetime(), fila.employee_id)
+        desprendibles = por_empleado[contrato.employee_id]
+        salida.append((contrato, calcular_pretensiones(contrato, desprendibles),
+                       resumen_mensual_desprendibles(desprendibles, contrato)))
+    return salida
+
+
+def _filas_esperadas(trabajadores):
+    esperadas = {tabla: [] for tabla in COLUMNAS}
+    for trabajador in trabajadores:
+        for tabla, filas in tablas_trabajador(*trabajador).items():
+            esperadas[tabla].extend(filas)
+    return esperadas
+
+
+def test_csv_una_tabla_por_archivo(tmp_path, trabajadores):
+    carpeta = tmp_path / 'detalle'
+    with abrir_exportador(str(carpeta)) as exportador:
+        for trabajador in trabajadores:
+            exportador.escribir(*trabajador)
+    esperadas = _filas_esperadas(trabajadores)
+    for tabla, columnas in COLUMNAS.items():
+        with open(carpeta / f'{tabla}.csv', newline='', encoding='utf-8') as archivo:
+            filas = list(csv.reader(archivo))
+        assert filas[0] == columnas
+        assert filas[1:] == [['' if valor is None else str(valor) for valor in fila] for fila in esperadas[tabla]]
+
+
+def test_jsonl_una_linea_por_trabajador(tmp_path, trabajadores):
+    ruta = tmp_path / 'detalle.jsonl'
+    with abrir_exportador(str(ruta)) as exportador:
+        for trabajador in trabajadores:
+            exportador.escribir(*trabajador)
+    with open(ruta, encoding='utf-8') as archivo:
+        registros = [json.loads(linea) for linea in archivo]
+    assert [r["employee_id"] for r in registros] == [c.employee_id for c, _, _ in trabajadores]
+    for registro, (contrato, resultado, _) in zip(registros, trabajadores):
+        assert registro["totales"]["total_pretensiones"] == resultado["total_pretensiones"]
+        assert [p["valor"] for p in registro["partidas"]] == [p["Valor"] for p in resultado["liquidacion"]]
+
+
+def test_xlsx_continua_en_otra_hoja_al_llegar_al_limite(tmp_path, trabajadores):
+    openpyxl = pytest.importorskip('openpyxl')
+    ruta = tmp_path / 'detalle.xlsx'
+    max_filas = 7
+    with ExportadorXLSX(str(ruta), max_filas=max_filas) as exportador:
+        for trabajador in trabajadores:
+            exportador.escribir(*trabajador)
+
+    libro = openpyxl.load_workbook(ruta)
+    esperadas = _filas_esperadas(trabajadores)
+    for tabla, columnas in COLUMNAS.items():
+        hojas = [tabla] + [nombre for nombre in libro.sheetnames if nombre.startswith(f'{tabla}_')
+                           and nombre[len(tabla) + 1:].isdigit()]
+        assert len(hojas) == max(1, -(-len(esperadas[tabla]) // (max_filas - 1)))
+        filas = []
+        for nombre in hojas:
+            valores = list(libro[nombre].iter_rows(values_only=True))
+            assert list(valores[0]) == columnas
+            assert len(valores) <= max_filas
+            filas.extend(valores[1:])
+        assert filas == [tuple(fila) for fila in esperadas[tabla]]
+
+
+def test_formato_desconocido(tmp_path):
+    with pytest.raises(ValueError):
+        abrir_exportador(os.fspath(tmp_path / 'detalle'), 'parquet')
+
+
+def test_lote_sin_openpyxl_termina_con_error(tmp_path, monkeypatch, capsys):
+    from liquidacion import lote
+
+    # ``None`` en sys.modules hace que ``import openpyxl`` lance ImportError
+    monkeypatch.setitem(sys.modules, 'openpyxl', None)
+    df_nomina, df_contratos = generar_nomina(100, semilla=1)
+    df_nomina.to_csv(tmp_path / 'nomina.csv', index=False)
+    df_contratos.to_csv(tmp_path / 'manifiesto.csv', index=False, date_format='%Y-%m-%d')
+    codigo = lote.main([str(tmp_path / 'manifiesto.csv'), '--paystubs', str(tmp_path / 'nomina.csv'),
+                        '--exportar', str(tmp_path / 'detalle.xlsx'), '--salida', str(tmp_path / 'r.csv')])
+    assert codigo == 1
+    assert "openpyxl" in capsys.readouterr().out
+    assert not (tmp_path / 'r.csv').exists()
@@ -0,0 +1,116 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from liquidacion.calculo import Contrato, calcular_pretensiones
+from liquidacion.datos import Desprendibles, cargar_paystubs
+from liquidacion.incremental import LiquidacionIncremental, leer_filas_nuevas, main
+from liquidacion.mensual import resumen_mensual_desprendibles
+from liquidacion.sinteticos import generar_nomina
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONTRATO = Contrato(datetime(2023, 4, 17), datetime(2024, 2, 17), 2_100_000, datetime(2025, 5, 22))
+
+
+def _silencio(texto):
+    pass
+
+
+def _desprendibles(ruta_csv):
+    return Desprendibles.desde_dataframe(cargar_paystubs(ruta_csv, advertir=_silencio))
+
+
+def _parte(desprendibles, desde, hasta):
+    return Desprendibles(*(arreglo[desde:hasta] for arreglo in desprendibles))
+
+
+def test_agregar_por_partes_y_mover_la_fecha():
+    desprendibles = _desprendibles(os.path.join(RAIZ, 'paystubs-summary.csv'))
+    liquidacion = LiquidacionIncremental(CONTRATO)
+    for desde in range(0, len(desprendibles.inicios), 4):
+        parte = _parte(desprendibles, 0, desde + 4)
+        liquidacion.agregar(_parte(desprendibles, desde, desde + 4), advertir=_silencio)
+        assert liquidacion.resultado == calcular_pretensiones(CONTRATO, parte)
+    assert liquidacion.resumen_mensual().equals(resumen_mensual_desprendibles(desprendibles, CONTRATO))
+
+    cambios = liquidacion.mover_fecha_calculo(datetime(2025, 9, 1))
+    otra_fecha = Contrato(CONTRATO.fecha_inicio, CONTRATO.fecha_fin, CONTRATO.salario_base, datetime(2025, 9, 1))
+    assert liquidacion.resultado == calcular_pretensiones(otra_fecha, desprendibles)
+    assert any(cambio["Concepto"] == "total_pretensiones" for cambio in cambios["partidas"])
+
+
+def test_estado_guardado_y_cargado(tmp_path):
+    desprendibles = _desprendibles(os.path.join(RAIZ, 'paystubs-summary.csv'))
+    liquidacion = LiquidacionIncremental(CONTRATO)
+    liquidacion.agregar(desprendibles, advertir=_silencio)
+    liquidacion.guardar(str(tmp_path / 'estado.npz'), {"posicion": 0})
+    cargada, origen = LiquidacionIncremental.cargar(str(tmp_path / 'estado.npz'), CONTRATO)
+    assert origen == {"posicion": 0} and cargada.resultado == liquidacion.resultado
+    otro_salario = Contrato(CONTRATO.fecha_inicio, CONTRATO.fecha_fin, 1_000_000, CONTRATO.fecha_calculo)
+    assert LiquidacionIncremental.cargar(str(tmp_path / 'estado.npz'), otro_salario) == (None, None)
+
+
+@pytest.fixture
+def csv_parcial(tmp_path):
+    """
+    Nómina sintética de un trabajador de más de 4 KiB, con las primeras 120 filas escritas;
+    las demás se agregan en cada prueba.
+    """
+    df_nomina, df_contratos = generar_nomina(160, num_empleados=1, semilla=3)
+    lineas = df_nomina.drop(columns='employee_id').to_csv(index=False).encode().splitlines(keepends=True)
+    ruta = tmp_path / 'paystubs.csv'
+    ruta.write_bytes(b''.join(lineas[:121]))
+    contrato = Contrato(df_contratos['fecha_inicio'][0].to_pydatetime(), datetime(2025, 3, 31),
+                        int(df_contratos['salario_base'][0]), datetime(2025, 5, 22))
+    argumentos = ['--inicio', contrato.fecha_inicio.strftime('%Y-%m-%d'), '--fin', '2025-03-31',
+                  '--salario', str(contrato.salario_base), '--fecha-calculo', '2025-05-22', '--paystubs', str(ruta)]
+    return ruta, lineas[121:], contrato, argumentos
+
+
+def _total(capsys):
+    salida = capsys.readouterr().out
+    return salida, int(salida.rsplit("Monto total de las pretensiones: ", 1)[1].strip().replace(',', ''))
+
+
+def test_cli_lee_solo_las_filas_agregadas(csv_parcial, capsys):
+    ruta, restantes, contrato, argumentos = csv_parcial
+    main(argumentos)
+    salida, _ = _total(capsys)
+    assert "Estado construido con 120 desprendibles" in salida
+
+    with open(ruta, 'ab') as archivo:
+        archivo.writelines(restantes)
+    main(argumentos)
+    salida, total = _total(capsys)
+    assert f"{len(restantes)} desprendibles nuevos (160 en total)" in salida
+    assert total == calcular_pretensiones(contrato, _desprendibles(ruta))["total_pretensiones"]
+
+
+def test_cli_reconstruye_si_cambia_una_fila_ya_leida(csv_parcial, capsys):
+    ruta, restantes, contrato, argumentos = csv_parcial
+    main(argumentos)
+    capsys.readouterr()
+
+    # El salario de la tercera fila cambia sin cambiar el largo del archivo, lejos del final
+    lineas = ruta.read_bytes().splitlines(keepends=True)
+    campos = lineas[3].split(b',')
+    campos[3] = str(int(campos[3]) + 100_000).encode()
+    editada = b','.join(campos)
+    assert len(editada) == len(lineas[3]) and sum(map(len, lineas[4:])) > 4096
+    ruta.write_bytes(b''.join(lineas[:3] + [editada] + lineas[4:] + restantes))
+    main(argumentos)
+    salida, total = _total(capsys)
+    assert "cambió antes de la última posición leída" in salida
+    assert total == calcular_pretensiones(contrato, _desprendibles(ruta))["total_pretensiones"]
+
+
+def test_leer_filas_nuevas_detecta_archivo_truncado(csv_parcial):
+    ruta = csv_parcial[0]
+    df_nuevas, origen, completo = leer_filas_nuevas(str(ruta), advertir=_silencio)
+    assert completo and len(df_nuevas) == 120
+    assert leer_filas_nuevas(str(ruta), origen, advertir=_silencio) == (None, origen, False)
+
+    ruta.write_bytes(b''.join(ruta.read_bytes().splitlines(keepends=True)[:-1]))
+    df_nuevas, _, completo = leer_filas_nuevas(str(ruta), origen, advertir=_silencio)
+    assert completo and len(df_nuevas) == 119
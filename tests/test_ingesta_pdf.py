@@ -0,0 +1,70 @@
+import csv
+import os
+import shutil
+from datetime import date
+
+import pytest
+
+from liquidacion import ingesta_pdf
+from liquidacion.ingesta_pdf import AMOUNT_COLUMNS, _extraer_gmail, _extraer_heinsohn, ingerir_carpeta
+
+pypdf = pytest.importorskip('pypdf')
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(RAIZ, 'source')
+GMAIL = '2023 05 05 - Gmail - Nómina Final del 16 al 30 de Abril 2023.pdf'
+HEINSOHN = '2024 01 20 - ComprobanteDePago_ Nómina Final del 01 al 15 de Enero 2024.pdf'
+PRIMA = '2023 12 15 - ComprobanteDePago_ Diciembre 2023 - PRIMA LEGAL DE SERVICIOS.pdf'
+
+
+def _texto(nombre, paginas=1):
+    return '\n'.join(pagina.extract_text() for pagina in pypdf.PdfReader(os.path.join(SOURCE, nombre)).pages[:paginas])
+
+
+def _fila_csv(etiqueta):
+    """Montos de la fila de ``paystubs-summary.csv`` con esa etiqueta."""
+    with open(os.path.join(RAIZ, 'paystubs-summary.csv'), newline='', encoding='utf-8') as archivo:
+        fila = next(f for f in csv.DictReader(archivo) if f['label'] == etiqueta)
+    return {col: int(fila[col]) for col in AMOUNT_COLUMNS}
+
+
+def test_extraer_gmail_primera_pagina():
+    inicio, fin, desprendible = _extraer_gmail(_texto(GMAIL))
+    assert (inicio, fin) == (date(2023, 4, 16), date(2023, 4, 30))
+    esperado = _fila_csv('16 al 30 de Abril 2023')
+    # Los totales están en la segunda página
+    for col in ('base_salary', 'aux_transp', 'incentive_transp', 'sunday_bonus', 'other_bonuses'):
+        assert desprendible[col] == esperado[col]
+
+
+def test_extraer_gmail_documento_completo():
+    _, _, desprendible = _extraer_gmail(_texto(GMAIL, paginas=2))
+    assert desprendible == _fila_csv('16 al 30 de Abril 2023')
+
+
+def test_extraer_heinsohn():
+    inicio, fin, desprendible = _extraer_heinsohn(_texto(HEINSOHN))
+    assert (inicio, fin) == (date(2024, 1, 1), date(2024, 1, 15))
+    assert desprendible == _fila_csv('01 al 15 de Enero 2024')
+
+
+def test_comprobante_de_solo_prima_no_es_desprendible():
+    assert _extraer_heinsohn(_texto(PRIMA)) is None
+    assert _extraer_gmail(_texto(HEINSOHN)) is None
+
+
+def test_ingerir_carpeta_usa_la_cache(tmp_path, monkeypatch):
+    for nombre in (GMAIL, HEINSOHN, PRIMA):
+        shutil.copy(os.path.join(SOURCE, nombre), tmp_path / nombre)
+    desprendibles = ingerir_carpeta(str(tmp_path), procesos=1)
+    assert [d['label'] for d in desprendibles] == ['16 al 30 de Abril 2023', '01 al 15 de Enero 2024']
+    assert [d['pay_period_ends'] for d in desprendibles] == ['2023-04-30', '2024-01-15']
+    for desprendible in desprendibles:
+        assert {col: desprendible[col] for col in AMOUNT_COLUMNS} == _fila_csv(desprendible['label'])
+
+    # Sin cambios en los PDF no se vuelve a extraer nada
+    def no_extraer(ruta):
+        raise AssertionError(f"Se volvió a extraer '{ruta}'")
+
+    monkeypatch.setattr(ingesta_pdf, 'extraer_desprendibles', no_extraer)
+    assert ingerir_carpeta(str(tmp_path), procesos=1) == desprendibles
@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from liquidacion.calculo import calcular_pretensiones, resumen_pretensiones
+from liquidacion.lote import ejecutar_lote, leer_manifiesto, main, preparar_trabajos
+from liquidacion.sinteticos import generar_nomina
+
+
+def _silencio(texto):
+    pass
+
+
+@pytest.fixture(scope='module')
+def nomina(tmp_path_factory):
+    """Nómina sintética de varios empleados con su manifiesto, escritos como CSV."""
+    carpeta = tmp_path_factory.mktemp('lote')
+    df_nomina, df_contratos = generar_nomina(600, semilla=11)
+    df_nomina.to_csv(carpeta / 'nomina.csv', index=False)
+    df_contratos.to_csv(carpeta / 'manifiesto.csv', index=False, date_format='%Y-%m-%d')
+    return carpeta
+
+
+def _trabajos(nomina):
+    contratos = leer_manifiesto(nomina / 'manifiesto.csv', pd.Timestamp('2025-05-22').to_pydatetime())
+    return preparar_trabajos(contratos, str(nomina / 'nomina.csv'), advertir=_silencio)
+
+
+@pytest.mark.parametrize("procesos", [1, 2])
+def test_lote_igual_a_calcular_pretensiones(nomina, procesos):
+    trabajos = _trabajos(nomina)
+    filas, advertencias = ejecutar_lote(trabajos, procesos=procesos)
+    esperadas = [resumen_pretensiones(c, calcular_pretensiones(c, d)) for c, d in trabajos]
+    assert filas == esperadas
+    assert all(texto.startswith('[') for texto in advertencias)
+
+
+def test_archivo_propio_sin_employee_id(nomina, tmp_path):
+    contrato, desprendibles = _trabajos(nomina)[0]
+    df_nomina = pd.read_csv(nomina / 'nomina.csv', dtype={'employee_id': str})
+    propio = df_nomina[df_nomina['employee_id'] == contrato.employee_id].drop(columns='employee_id')
+    propio.to_csv(tmp_path / 'propio.csv', index=False)
+    (trabajo,) = preparar_trabajos([(contrato, str(tmp_path / 'propio.csv'))], advertir=_silencio)
+    assert [arreglo.tolist() for arreglo in trabajo[1]] == [arreglo.tolist() for arreglo in desprendibles]
+
+
+def test_manifiesto_con_empleado_repetido(nomina, tmp_path, capsys):
+    df_manifiesto = pd.read_csv(nomina / 'manifiesto.csv', dtype={'employee_id': str})
+    pd.concat([df_manifiesto, df_manifiesto.iloc[[0]]]).to_csv(tmp_path / 'manifiesto.csv', index=False)
+    with pytest.raises(ValueError, match=df_manifiesto['employee_id'][0]):
+        leer_manifiesto(tmp_path / 'manifiesto.csv', pd.Timestamp('2025-05-22').to_pydatetime())
+    codigo = main([str(tmp_path / 'manifiesto.csv'), '--paystubs', str(nomina / 'nomina.csv'),
+                   '--salida', str(tmp_path / 'resultados.csv')])
+    assert codigo == 1
+    assert "repetidos" in capsys.readouterr().out
+    assert not (tmp_path / 'resultados.csv').exists()
+
+    contratos = leer_manifiesto(nomina / 'manifiesto.csv', pd.Timestamp('2025-05-22').to_pydatetime())
+    with pytest.raises(ValueError, match="más de un contrato"):
+        preparar_trabajos([contratos[0], contratos[0]], str(nomina / 'nomina.csv'), advertir=_silencio)
+
+
+def test_main_escribe_una_fila_por_contrato(nomina, tmp_path):
+    salida = tmp_path / 'resultados.csv'
+    assert main([str(nomina / 'manifiesto.csv'), '--paystubs', str(nomina / 'nomina.csv'), '--procesos', '1',
+                 '--salida', str(salida)]) == 0
+    df_resultados = pd.read_csv(salida, dtype={'employee_id': str})
+    df_manifiesto = pd.read_csv(nomina / 'manifiesto.csv', dtype={'employee_id': str})
+    assert df_resultados['employee_id'].tolist() == df_manifiesto['employee_id'].tolist()
@@ -0,0 +1,66 @@
+from fractions import Fraction
+
+import pandas as pd
+import pytest
+
+from liquidacion.bloques import liquidar_por_bloques
+from liquidacion.datos import cargar_paystubs, desprendibles_por_empleado
+from liquidacion.lote import leer_manifiesto
+from liquidacion.mensual import TASA_PENSION_TOTAL, resumen_mensual, resumen_mensual_desprendibles
+from liquidacion.sinteticos import generar_nomina
+
+
+def _silencio(texto):
+    pass
+
+
+@pytest.fixture(scope='module')
+def nomina(tmp_path_factory):
+    carpeta = tmp_path_factory.mktemp('mensual')
+    df_nomina, df_contratos = generar_nomina(500, semilla=8)
+    df_nomina.to_csv(carpeta / 'nomina.csv', index=False)
+    df_contratos.to_csv(carpeta / 'manifiesto.csv', index=False, date_format='%Y-%m-%d')
+    contratos = {contrato.employee_id: contrato for contrato, _ in
+                 leer_manifiesto(carpeta / 'manifiesto.csv', pd.Timestamp('2025-05-22').to_pydatetime())}
+    df_paystubs = cargar_paystubs(carpeta / 'nomina.csv', advertir=_silencio)
+    df_paystubs['employee_id'] = df_paystubs['employee_id'].astype(str)
+    return carpeta, contratos, df_paystubs
+
+
+def _esperado(df_paystubs, contratos, tasa):
+    """Agrupación con pandas por (empleado, mes) y filtro por los meses de cada contrato."""
+    filas = []
+    grupos = df_paystubs.groupby(['employee_id', df_paystubs['Period_Start_Date'].dt.to_period('M')], sort=True)
+    for (empleado, mes), grupo in grupos:
+        contrato = contratos.get(empleado)
+        if contrato is None or not (pd.Period(contrato.fecha_inicio, 'M') <= mes <= pd.Period(contrato.fecha_fin, 'M')):
+            continue
+        base, extras, aux = (int(grupo[col].sum()) for col in ('base_salary', 'total_extras', 'aux_transp'))
+        ibc = base + extras + aux
+        aporte = int((Fraction(ibc) * Fraction(str(tasa)) + Fraction(1, 2)) // 1)
+        filas.append([empleado, str(mes), base, extras, base + extras, aux, ibc, aporte])
+    return filas
+
+
+@pytest.mark.parametrize("tasa", [0.12, TASA_PENSION_TOTAL])
+def test_resumen_por_empleado_igual_a_groupby(nomina, tasa):
+    _, contratos, df_paystubs = nomina
+    # Sin el primer empleado, cuyas filas se descartan
+    incluidos = dict(list(contratos.items())[1:])
+    obtenido = resumen_mensual(df_paystubs, tasa_pension=tasa, contratos=incluidos)
+    assert obtenido.values.tolist() == _esperado(df_paystubs, incluidos, tasa)
+    assert obtenido.columns[-1] == f"Aporte Pensión Referencia ({tasa * 100:g}%)"
+
+
+def test_un_empleado_por_dataframe_arreglos_y_bloques(nomina):
+    carpeta, contratos, df_paystubs = nomina
+    empleado, contrato = next(iter(contratos.items()))
+    esperado = [fila[1:] for fila in _esperado(df_paystubs, {empleado: contrato}, 0.12)]
+    propios = df_paystubs[df_paystubs['employee_id'] == empleado]
+    assert resumen_mensual(propios, contrato).values.tolist() == esperado
+    desprendibles = desprendibles_por_empleado(df_paystubs)[empleado]
+    assert resumen_mensual_desprendibles(desprendibles, contrato).values.tolist() == esperado
+
+    _, df_mensual = liquidar_por_bloques(list(contratos.values()), str(carpeta / 'nomina.csv'), 53,
+                                         advertir=_silencio)
+    assert df_mensual.values.tolist() == _esperado(df_paystubs, contratos, 0.12)
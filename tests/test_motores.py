@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.paridad_motores import MOTORES, REFERENCIA, comparar_filas, generar_caso
+from liquidacion.calculo import ESTADO_NO_PAGADA, calcular_pretensiones
+
+OPCIONES = {"procesos_lote": 2, "filas_por_bloque": 97}
+
+
+@pytest.fixture(scope='module', params=[0, 1])
+def caso(request, tmp_path_factory):
+    """Nómina sintética perturbada de cada semilla con las filas de la referencia fila a fila."""
+    carpeta = tmp_path_factory.mktemp(f'caso-{request.param}')
+    contratos, por_empleado, ruta_csv = generar_caso(request.param, 1500, str(carpeta))
+    referencia = MOTORES[REFERENCIA](contratos, por_empleado, ruta_csv, OPCIONES)
+    return request.param, contratos, por_empleado, ruta_csv, referencia
+
+
+@pytest.mark.parametrize("motor", [nombre for nombre in MOTORES if nombre != REFERENCIA])
+def test_motor_igual_a_la_referencia(motor, caso):
+    semilla, contratos, por_empleado, ruta_csv, referencia = caso
+    filas = MOTORES[motor](contratos, por_empleado, ruta_csv, OPCIONES)
+    assert comparar_filas(referencia, filas, contratos, semilla) == {}
+
+
+def test_total_es_la_suma_de_partidas_en_pesos(caso):
+    _, contratos, por_empleado, _, _ = caso
+    for contrato in contratos[:20]:
+        resultado = calcular_pretensiones(contrato, por_empleado[contrato.employee_id])
+        partidas = [p["Valor"] for p in resultado["liquidacion"] if p["Estado"] == ESTADO_NO_PAGADA]
+        assert all(type(valor) is int for valor in partidas)
+        assert resultado["total_liquidacion_no_pagada"] == sum(partidas)
+        assert resultado["total_pretensiones"] == (resultado["total_liquidacion_no_pagada"] +
+                                                   resultado["total_indemnizaciones"])
@@ -0,0 +1,75 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from liquidacion.calculo import Contrato, excluir_auxilio_no_elegible, salario_mora_liquidacion
+from liquidacion.dinero import CENTAVOS_POR_PESO
+from liquidacion.parametros import (AUXILIO_TRANSPORTE, SMMLV, TablaVigencias, auxilio_elegible, dias_comerciales,
+                                    salario_con_minimo)
+from liquidacion.ventanas import a_numero_de_dia
+
+
+def _dia(texto):
+    return int(a_numero_de_dia([np.datetime64(texto)])[0])
+
+
+def test_vigencia_por_fecha_escalar_y_arreglo():
+    dias = [_dia('2023-12-31'), _dia('2024-01-01'), _dia('2024-07-15'), _dia('2030-01-01')]
+    assert SMMLV.en(dias).tolist() == [1_160_000, 1_300_000, 1_300_000, 1_423_500]
+    assert [SMMLV.vigente(dia) for dia in dias] == [1_160_000, 1_300_000, 1_300_000, 1_423_500]
+    assert AUXILIO_TRANSPORTE.vigente(_dia('2024-03-01')) == 162_000
+
+
+def test_fechas_anteriores_a_la_tabla():
+    tabla = TablaVigencias("prueba", [('2020-01-01', 2), ('2010-01-01', 1)])
+    antes, desde = _dia('2009-12-31'), _dia('2010-01-01')
+    assert tabla.cubre([antes, desde]).tolist() == [False, True]
+    with pytest.raises(ValueError, match="prueba.*2009-12-31.*2010-01-01"):
+        tabla.en([antes, desde])
+    with pytest.raises(ValueError, match="prueba"):
+        tabla.vigente(antes)
+    assert tabla.en([]).size == 0
+
+
+def test_salario_con_minimo():
+    minimo = 1_300_000 * CENTAVOS_POR_PESO
+    dia = _dia('2024-06-30')
+    assert salario_con_minimo(900_000 * CENTAVOS_POR_PESO, dia) == minimo
+    assert salario_con_minimo(2_000_000 * CENTAVOS_POR_PESO, dia) == 2_000_000 * CENTAVOS_POR_PESO
+    # Antes de la tabla no se aplica el mínimo
+    assert salario_con_minimo(100, _dia('1999-06-30')) == 100
+    arreglo = salario_con_minimo(np.array([900_000, 2_000_000, 100]) * CENTAVOS_POR_PESO,
+                                 np.array([dia, dia, _dia('1999-06-30')]))
+    assert arreglo.tolist() == [minimo, 2_000_000 * CENTAVOS_POR_PESO, 100 * CENTAVOS_POR_PESO]
+
+    contrato = Contrato(datetime(2023, 1, 1), datetime(2024, 6, 30), 900_000, datetime(2025, 1, 1))
+    assert salario_mora_liquidacion(contrato) == minimo
+
+
+def test_tope_de_auxilio_en_dos_minimos():
+    tope = 2 * 1_300_000 * CENTAVOS_POR_PESO
+    inicio, fin = _dia('2024-06-01'), _dia('2024-06-30')
+    # Un mes de 30 días: el tope es exacto
+    assert auxilio_elegible([tope, tope + 1], [inicio, inicio], [fin, fin]).tolist() == [True, False]
+    # El mínimo es el vigente al cierre de la ventana
+    cierre_2025 = _dia('2025-01-15')
+    assert auxilio_elegible([tope + 1], [cierre_2025 - 29], [cierre_2025]).tolist() == [True]
+    # Antes de la tabla el auxilio se conserva
+    assert auxilio_elegible([10**15], [_dia('1999-01-01')], [_dia('1999-01-30')]).tolist() == [True]
+
+
+def test_tope_de_auxilio_con_dias_comerciales():
+    # Febrero de 2023: 28 días calendario, 30 comerciales. Un salario de 2,05 mínimos pagado
+    # por días comerciales supera el tope por días calendario pero no por comerciales
+    inicio, fin = _dia('2023-02-01'), _dia('2023-02-28')
+    assert dias_comerciales([inicio], [fin]).tolist() == [30]
+    total = 2 * 1_160_000 * CENTAVOS_POR_PESO * 28 // 30 + 1
+    assert auxilio_elegible([total], [inicio], [fin]).tolist() == [True]
+    assert auxilio_elegible([2 * 1_160_000 * CENTAVOS_POR_PESO + 1], [inicio], [fin]).tolist() == [False]
+
+    totales = {'base': np.array([total, 2 * 1_160_000 * CENTAVOS_POR_PESO + 1]), 'extras': np.zeros(2, np.int64),
+               'aux': np.array([140_606, 140_606]) * CENTAVOS_POR_PESO, 'dias': np.array([28, 28])}
+    sin_auxilio = excluir_auxilio_no_elegible(totales, np.array([inicio] * 2), np.array([fin] * 2))
+    assert sin_auxilio['aux'].tolist() == [140_606 * CENTAVOS_POR_PESO, 0]
+    assert sin_auxilio['base'] is totales['base']
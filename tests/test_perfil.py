@@ -0,0 +1,73 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from liquidacion import perfil
+from liquidacion.calculo import Contrato, calcular_pretensiones, periodos_liquidacion
+from liquidacion.datos import Desprendibles, preprocesar_paystubs
+from liquidacion.sinteticos import generar_nomina
+
+CONTRATO = Contrato(datetime(2023, 4, 17), datetime(2024, 2, 17), 2_100_000, datetime(2025, 5, 22))
+
+
+@pytest.fixture
+def perfil_activo():
+    medicion = perfil.activar()
+    yield medicion
+    perfil.desactivar()
+
+
+@pytest.fixture(scope='module')
+def desprendibles():
+    df_nomina, _ = generar_nomina(60, num_empleados=1, semilla=2)
+    return Desprendibles.desde_dataframe(preprocesar_paystubs(df_nomina, advertir=lambda texto: None))
+
+
+def test_etapas_del_calculo(perfil_activo, desprendibles):
+    resultado = calcular_pretensiones(CONTRATO, desprendibles)
+    medicion = perfil.desactivar()
+    assert medicion is perfil_activo and medicion.segundos is not None
+    assert perfil.etapa('fuera') is perfil.etapa('otra')
+
+    primas, cesantias, ventanas = periodos_liquidacion(CONTRATO)
+    etapas = {registro["etapa"]: registro for registro in medicion.como_dict()["etapas"]}
+    assert list(etapas) == ['indice_diario', 'totales_ventanas', 'liquidacion', 'auxilio_transporte', 'prima',
+                            'cesantias', 'intereses_cesantias', 'vacaciones', 'sanciones']
+    assert etapas['indice_diario']["filas"] == len(desprendibles.inicios)
+    assert etapas['totales_ventanas']["filas"] == len(ventanas)
+    # Prima y cesantías se miden por separado; la ventana de vacaciones va con cesantías
+    assert (etapas['prima']["filas"], etapas['cesantias']["filas"]) == (len(primas), len(cesantias) + 1)
+    assert etapas['prima']["nivel"] == etapas['liquidacion']["nivel"] + 1
+    assert all(registro["llamadas"] == 1 for registro in etapas.values())
+    assert medicion.contadores == {perfil.CONSULTAS_VENTANAS: 1,
+                                   perfil.CONSULTAS_VENTANAS + '.periodos': len(ventanas)}
+    assert resultado == calcular_pretensiones(CONTRATO, desprendibles)
+
+
+def test_etapas_anidadas_y_salidas(perfil_activo):
+    for _ in range(2):
+        with perfil.etapa('exterior'):
+            perfil.anotar_filas(3)
+            with perfil.etapa('interior'):
+                perfil.anotar_filas(5)
+                bytearray(200_000)
+    perfil.contar_consulta(4)
+    datos = json.loads(perfil_activo.como_json())
+    exterior, interior = datos["etapas"]
+    assert (exterior["llamadas"], exterior["filas"], exterior["nivel"]) == (2, 6, 0)
+    assert (interior["llamadas"], interior["filas"], interior["nivel"]) == (2, 10, 1)
+    assert exterior["memoria_pico_bytes"] >= interior["memoria_pico_bytes"] >= 200_000
+    assert datos["contadores"] == {"consultas_ventanas": 1, "consultas_ventanas.periodos": 4}
+    tabla = perfil_activo.como_tabla()
+    assert "\n  interior " in tabla and "consultas_ventanas.periodos: 4" in tabla
+
+
+def test_apagado_no_registra():
+    assert perfil.desactivar() is None
+    with perfil.etapa('nada'):
+        perfil.anotar_filas(10)
+        perfil.contar_consulta(1)
+    medicion = perfil.activar()
+    perfil.desactivar()
+    assert medicion.etapas == {} and medicion.contadores == {}
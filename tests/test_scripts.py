@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _ejecutar(*argumentos):
+    return subprocess.run([sys.executable, *argumentos], cwd=RAIZ, capture_output=True, text=True, check=True)
+
+
+def test_total_pretensiones():
+    salida = _ejecutar('pretensiones.py', '--total-only')
+    # Las advertencias van a stderr: stdout es solo el total
+    assert salida.stdout == "Monto total de las pretensiones: 69,787,008\n"
+
+
+def test_reporte_pretensiones():
+    assert "69,787,008" in _ejecutar('pretensiones.py').stdout
+
+
+def test_total_pretensiones_lite():
+    assert "TOTAL PRETENSIONES: $66917008" in _ejecutar('pretensiones-lite.py').stdout.splitlines()
+
@@ -0,0 +1,147 @@
+import http.client
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import pytest
+
+from liquidacion.calculo import Contrato, calcular_pretensiones
+from liquidacion.datos import Desprendibles, cargar_paystubs
+from liquidacion.servicio import ServicioPretensiones, crear_servidor
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONSULTA = {"inicio": "2023-04-17", "fin": "2024-02-17", "salario": 2100000, "fecha_calculo": "2025-05-22"}
+
+
+def _silencio(texto):
+    pass
+
+
+@pytest.fixture
+def ruta_csv(tmp_path):
+    ruta = tmp_path / 'nomina.csv'
+    shutil.copy(os.path.join(RAIZ, 'paystubs-summary.csv'), ruta)
+    return str(ruta)
+
+
+@pytest.fixture
+def servicio(ruta_csv):
+    return ServicioPretensiones(ruta_csv, advertir=_silencio)
+
+
+@pytest.fixture
+def servidor(servicio):
+    servidor = crear_servidor(servicio, puerto=0)
+    hilo = threading.Thread(target=servidor.serve_forever, daemon=True)
+    hilo.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def _solicitar(servidor, cuerpo, encabezados=None, metodo='POST', ruta='/pretensiones'):
+    conexion = http.client.HTTPConnection(*servidor.server_address, timeout=10)
+    try:
+        if isinstance(cuerpo, (dict, list)):
+            cuerpo = json.dumps(cuerpo)
+        conexion.request(metodo, ruta, body=cuerpo, headers=encabezados or {})
+        respuesta = conexion.getresponse()
+        return respuesta.status, json.loads(respuesta.read())
+    finally:
+        conexion.close()
+
+
+def test_respuesta_igual_a_calcular_pretensiones_y_caches(servicio, ruta_csv):
+    contrato = Contrato(datetime(2023, 4, 17), datetime(2024, 2, 17), 2_100_000, datetime(2025, 5, 22))
+    desprendibles = Desprendibles.desde_dataframe(cargar_paystubs(ruta_csv, advertir=_silencio))
+    esperado = calcular_pretensiones(contrato, desprendibles)
+    respuesta = servicio.calcular(CONSULTA)
+    assert respuesta["cache"] == "ninguna"
+    for clave in ["liquidacion", "indemnizaciones", "total_liquidacion_no_pagada", "total_indemnizaciones",
+                  "total_pretensiones"]:
+        assert respuesta[clave] == esperado[clave]
+
+    assert servicio.calcular(CONSULTA)["cache"] == "resultado"
+    otra_fecha = servicio.calcular({**CONSULTA, "fecha_calculo": "2025-09-01"})
+    assert otra_fecha["cache"] == "liquidacion"
+    contrato_nuevo = Contrato(contrato.fecha_inicio, contrato.fecha_fin, contrato.salario_base, datetime(2025, 9, 1))
+    esperado = calcular_pretensiones(contrato_nuevo, desprendibles)
+    assert otra_fecha["total_pretensiones"] == esperado["total_pretensiones"]
+    assert servicio.resultados.estado()["aciertos"] == 1
+
+
+def test_solo_acepta_los_csv_habilitados(servicio, tmp_path):
+    otro = tmp_path / 'otro' / 'nomina.csv'
+    otro.parent.mkdir()
+    shutil.copy(os.path.join(RAIZ, 'paystubs-summary.csv'), otro)
+    with pytest.raises(ValueError, match="no está habilitado"):
+        servicio.calcular({**CONSULTA, "paystubs": str(otro)})
+    with pytest.raises(ValueError, match="no está habilitado"):
+        servicio.calcular({**CONSULTA, "paystubs": '/etc/passwd'})
+    assert os.listdir(otro.parent) == ['nomina.csv']
+
+    habilitado = ServicioPretensiones(servicio.paystubs, advertir=_silencio, permitidos=[str(otro)])
+    assert habilitado.calcular({**CONSULTA, "paystubs": str(otro)})["total_pretensiones"] == \
+        servicio.calcular(CONSULTA)["total_pretensiones"]
+
+
+def test_http_exito_y_lote(servidor, servicio):
+    codigo, respuesta = _solicitar(servidor, CONSULTA)
+    assert codigo == 200
+    assert respuesta["total_pretensiones"] == servicio.calcular(CONSULTA)["total_pretensiones"]
+
+    codigo, respuestas = _solicitar(servidor, [CONSULTA, {**CONSULTA, "fecha_calculo": "2025-09-01"}])
+    assert codigo == 200 and [r["cache"] for r in respuestas] == ["resultado", "liquidacion"]
+
+    codigo, estado = _solicitar(servidor, None, metodo='GET', ruta='/estado')
+    assert codigo == 200 and estado["resultados"]["entradas"] == 2
+
+
+@pytest.mark.parametrize("cuerpo, encabezados, mensaje", [
+    (b'{}', {"Content-Length": "abc"}, "Content-Length"),
+    (b'{"inicio": ', None, "JSON inválido"),
+    ({**CONSULTA, "salario": 10 ** 17}, None, "int64"),
+    ({**CONSULTA, "salario": -5}, None, "positivo"),
+    ({**CONSULTA, "inicio": "2024-03-01"}, None, "posterior"),
+    ({**CONSULTA, "paystubs": "/etc/passwd"}, None, "no está habilitado"),
+])
+def test_http_consulta_invalida_responde_400(servidor, cuerpo, encabezados, mensaje):
+    codigo, respuesta = _solicitar(servidor, cuerpo, encabezados)
+    assert codigo == 400
+    assert mensaje in respuesta["error"]
+
+
+def test_http_csv_sin_columnas_y_directorio_responden_400(tmp_path):
+    malo = tmp_path / 'malo.csv'
+    malo.write_text('a,b\n1,2\n', encoding='utf-8')
+    carpeta = tmp_path / 'carpeta'
+    carpeta.mkdir()
+    servicio = ServicioPretensiones(str(malo), advertir=_silencio, permitidos=[str(carpeta)])
+    servidor = crear_servidor(servicio, puerto=0)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        codigo, respuesta = _solicitar(servidor, CONSULTA)
+        assert codigo == 400 and "pay_period_starts" in respuesta["error"]
+        codigo, respuesta = _solicitar(servidor, {**CONSULTA, "paystubs": str(carpeta)})
+        assert codigo == 400 and "No se pudo leer" in respuesta["error"]
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def test_http_error_inesperado_responde_500(servidor, servicio, monkeypatch, capsys):
+    def fallar(datos):
+        raise RuntimeError("falla de prueba")
+
+    monkeypatch.setattr(servicio, 'calcular', fallar)
+    codigo, respuesta = _solicitar(servidor, CONSULTA)
+    assert codigo == 500
+    assert respuesta["error"] == "Error interno: RuntimeError: falla de prueba"
+    assert "falla de prueba" in capsys.readouterr().err
+
+
+def test_http_ruta_desconocida(servidor):
+    assert _solicitar(servidor, CONSULTA, ruta='/otra')[0] == 404
+    assert _solicitar(servidor, None, metodo='GET', ruta='/otra')[0] == 404
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from liquidacion.sinteticos import DIAS_MAXIMOS_IRREGULAR, FECHA_CALCULO, _etiquetas, generar_nomina
+
+
+def _fechas(columna):
+    return pd.to_datetime(columna, format='%m/%d/%Y')
+
+
+def test_periodos_irregulares_seguidos_y_contratos_hasta_la_fecha_de_calculo():
+    df_nomina, df_contratos = generar_nomina(5000, semilla=6)
+    inicios, fines = _fechas(df_nomina['pay_period_starts']), _fechas(df_nomina['pay_period_ends'])
+    dias = (fines - inicios).dt.days + 1
+    assert dias.min() >= 1 and dias.max() == DIAS_MAXIMOS_IRREGULAR
+    # Quincenas, meses completos y periodos de más de un mes
+    assert {15, 16, 28, 30, 31} <= set(dias) and (dias > 31).any()
+
+    siguiente = inicios.shift(-1) - fines
+    mismo_empleado = df_nomina['employee_id'] == df_nomina['employee_id'].shift(-1)
+    assert (siguiente[mismo_empleado] == pd.Timedelta(days=1)).all()
+
+    assert (df_contratos['fecha_fin'] <= pd.Timestamp(FECHA_CALCULO)).all()
+    assert (df_contratos['fecha_calculo'] == pd.Timestamp(FECHA_CALCULO)).all()
+    assert (df_contratos['fecha_inicio'] <= df_contratos['fecha_fin']).all()
+    ultimos = fines.groupby(df_nomina['employee_id']).max()
+    terminaciones = df_contratos.set_index('employee_id').loc[ultimos.index, 'fecha_fin']
+    assert (ultimos.to_numpy() == terminaciones.to_numpy()).all()
+
+
+def test_fecha_de_calculo_acota_las_terminaciones():
+    _, df_contratos = generar_nomina(3000, semilla=2, fecha_calculo='2022-08-10')
+    assert df_contratos['fecha_fin'].max() <= pd.Timestamp('2022-08-10')
+
+
+def test_etiquetas_de_periodos_largos():
+    dias = np.datetime64('2023-04-16').astype(np.int64)
+    inicios = np.array([dias, dias, dias - 30], dtype=np.int64)
+    fines = np.array([dias + 14, dias + 50, dias + 14], dtype=np.int64)
+    assert _etiquetas(inicios, fines).tolist() == [
+        '16 al 30 de Abril 2023', '16 de Abril 2023 al 05 de Junio 2023', '17 de Marzo 2023 al 30 de Abril 2023']
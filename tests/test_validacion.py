@@ -0,0 +1,85 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from liquidacion.calculo import Contrato
+from liquidacion.sinteticos import generar_nomina
+from liquidacion.validacion import revisar_periodos, validar_arreglos, validar_paystubs
+from liquidacion.ventanas import a_numero_de_dia
+
+
+def _dias(*fechas):
+    return a_numero_de_dia(list(fechas)).tolist()
+
+
+def _hallazgos(periodos):
+    return {clave: valor.tolist() for clave, valor in periodos.items()}
+
+
+def test_barrido_de_la_linea_de_tiempo():
+    # 0: 01-15 ene, 1: 16-31 ene, 2: duplicado de 1, 3: 25 ene-09 feb (solapa con 1),
+    # 4: 16-29 feb tras un hueco de 6 días, 5: 01-15 mar que paga 5 días fuera del contrato
+    inicios = _dias('2024-01-01', '2024-01-16', '2024-01-16', '2024-01-25', '2024-02-16', '2024-03-01')
+    fines = _dias('2024-01-15', '2024-01-31', '2024-01-31', '2024-02-09', '2024-02-29', '2024-03-15')
+    contrato_inicio, contrato_fin = _dias('2024-01-01', '2024-03-10')
+    periodos = _hallazgos(revisar_periodos(inicios, fines, None, contrato_inicio, contrato_fin))
+    assert periodos["duplicados"] == [2]
+    assert periodos["solapados"] == [3]
+    assert (periodos["huecos"], periodos["dias_hueco"]) == ([4], [6])
+    assert (periodos["fuera_contrato"], periodos["dias_fuera_contrato"]) == ([5], [5])
+    assert periodos["sin_cubrir_al_final"] == []
+
+    # Sin contrato no hay días fuera ni cobertura al final; un contrato más largo queda sin cubrir
+    sin_contrato = _hallazgos(revisar_periodos(inicios, fines))
+    assert sin_contrato["fuera_contrato"] == [] and sin_contrato["huecos"] == [4]
+    mas_largo = _hallazgos(revisar_periodos(inicios, fines, None, contrato_inicio, _dias('2024-03-31')[0]))
+    assert (mas_largo["sin_cubrir_al_final"], mas_largo["dias_sin_cubrir_al_final"]) == ([0], [16])
+
+
+def test_barrido_por_empleado_igual_que_por_separado():
+    df_nomina, df_contratos = generar_nomina(2000, semilla=7)
+    rng = np.random.default_rng(7)
+    # Filas mezcladas entre empleados, con duplicados y huecos
+    faltantes = df_nomina.sample(60, random_state=2).index
+    df_nomina = pd.concat([df_nomina, df_nomina.sample(40, random_state=1)]).drop(faltantes)
+    df_nomina = df_nomina.iloc[rng.permutation(len(df_nomina))].reset_index(drop=True)
+    inicios = a_numero_de_dia(pd.to_datetime(df_nomina['pay_period_starts'])).astype(np.int64)
+    fines = a_numero_de_dia(pd.to_datetime(df_nomina['pay_period_ends'])).astype(np.int64)
+    codigos, nombres = pd.factorize(df_nomina['employee_id'])
+    contratos = df_contratos.set_index('employee_id').loc[nombres]
+    contrato_inicios = a_numero_de_dia(contratos['fecha_inicio'])
+    contrato_fines = a_numero_de_dia(contratos['fecha_fin'])
+
+    juntos = revisar_periodos(inicios, fines, codigos, contrato_inicios, contrato_fines)
+    assert len(juntos["duplicados"]) > 0 and len(juntos["huecos"]) > 0
+    for codigo in range(len(nombres)):
+        filas = np.flatnonzero(codigos == codigo)
+        separado = revisar_periodos(inicios[filas], fines[filas], None, contrato_inicios[codigo],
+                                    contrato_fines[codigo])
+        for clave in ("duplicados", "solapados", "huecos", "fuera_contrato"):
+            assert np.isin(juntos[clave], filas).sum() == len(separado[clave])
+            assert sorted(filas[separado[clave]].tolist()) == \
+                sorted(juntos[clave][np.isin(juntos[clave], filas)].tolist())
+
+
+def test_advertencias_citan_filas_y_totales():
+    df = pd.DataFrame({
+        'Period_Start_Date': pd.to_datetime(['2024-01-01', '2024-01-16', '2024-01-16']),
+        'Period_End_Date': pd.to_datetime(['2024-01-15', '2024-01-31', '2024-01-31']),
+        'gross_earnings': [1000, 1000, 1200], 'base_salary': [1000, 1000, 1000],
+        'total_deductions': [80, 80, 80], 'net_pay': [920, 920, 920],
+    })
+    contrato = Contrato(datetime(2024, 1, 1), datetime(2024, 1, 31), 2_000, datetime(2024, 2, 1))
+    mensajes = []
+    advertencias = validar_paystubs(df, contrato=contrato, advertir=mensajes.append)
+    assert advertencias == mensajes
+    assert any("duplicado" in texto and "fila 2 (2024-01-16 a 2024-01-31)" in texto for texto in advertencias)
+    assert any("'gross_earnings' distinto de la suma" in texto and "diferencia 200" in texto
+               for texto in advertencias)
+    assert any("'net_pay' distinto" in texto for texto in advertencias)
+
+    # Los números de fila citados pueden ser los del archivo original
+    citadas = validar_arreglos(_dias('2024-01-01', '2024-01-01'), _dias('2024-01-15', '2024-01-15'),
+                               advertir=lambda texto: None, numeros_fila=np.array([40, 41]))
+    assert citadas and "fila 41" in citadas[0]
@@ -0,0 +1,126 @@
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.paridad_motores import ganancias_periodo_fila_a_fila
+from liquidacion.calculo import Contrato, periodos_liquidacion
+from liquidacion.datos import Desprendibles, preprocesar_paystubs
+from liquidacion.dinero import CENTAVOS_POR_PESO
+from liquidacion.indice_diario import IndiceDiario
+from liquidacion.sinteticos import generar_nomina
+from liquidacion.ventanas import a_numero_de_dia, get_proportional_earnings_for_periods
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _silencio(texto):
+    pass
+
+
+def _dias(inicio, fin):
+    return 0 if inicio > fin else (fin - inicio).days + 1
+
+
+def get_proportional_earnings_for_period(df_paystubs, period_start_date, period_end_date):
+    """El bucle fila a fila del script original, sin cambios de aritmética."""
+    total_base = total_extras = total_aux = 0.0
+    num_dias = _dias(period_start_date, period_end_date)
+    if num_dias == 0:
+        return {"avg_monthly_salary_for_formula": 0.0, "avg_monthly_aux_for_formula": 0.0,
+                "avg_monthly_base_salary_only_for_formula": 0.0, "worked_days_in_period": 0}
+    for _, row in df_paystubs.iterrows():
+        inicio, fin = row['Period_Start_Date'], row['Period_End_Date']
+        solape_inicio, solape_fin = max(period_start_date, inicio), min(period_end_date, fin)
+        if solape_inicio <= solape_fin:
+            dias_desprendible = _dias(inicio, fin)
+            if dias_desprendible == 0:
+                continue
+            ratio = _dias(solape_inicio, solape_fin) / dias_desprendible
+            total_base += row['base_salary'] * ratio
+            total_extras += row['total_extras'] * ratio
+            total_aux += row['aux_transp'] * ratio
+    return {"avg_monthly_salary_for_formula": (total_base + total_extras) / num_dias * 30,
+            "avg_monthly_aux_for_formula": total_aux / num_dias * 30,
+            "avg_monthly_base_salary_only_for_formula": total_base / num_dias * 30,
+            "worked_days_in_period": num_dias}
+
+
+@pytest.fixture(scope='module')
+def df_real():
+    return preprocesar_paystubs(pd.read_csv(os.path.join(RAIZ, 'paystubs-summary.csv')), advertir=_silencio)
+
+
+@pytest.fixture(scope='module')
+def df_sintetico():
+    df_nomina, _ = generar_nomina(200, num_empleados=1, semilla=5)
+    return preprocesar_paystubs(df_nomina, advertir=_silencio)
+
+
+@pytest.fixture(scope='module')
+def df_irregular():
+    """Desprendibles de 1 a 60 días: el mínimo común múltiplo de las longitudes no cabe en int64."""
+    rng = np.random.default_rng(7)
+    inicios = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.integers(0, 700, 600), unit='D')
+    duraciones = np.tile(np.arange(1, 61), 10)
+    return pd.DataFrame({
+        'Period_Start_Date': inicios,
+        'Period_End_Date': inicios + pd.to_timedelta(duraciones - 1, unit='D'),
+        'base_salary': rng.integers(0, 9_000_000, 600),
+        'total_extras': rng.integers(0, 900_000, 600),
+        'aux_transp': rng.integers(0, 200_000, 600),
+    })
+
+
+def _periodos(df_paystubs, cantidad, semilla):
+    """Ventanas del contrato de ``pretensiones.py`` más ventanas al azar alrededor de los desprendibles."""
+    contrato = Contrato(datetime(2023, 4, 17), datetime(2024, 2, 17), 2_100_000, datetime(2025, 5, 22))
+    periodos = list(periodos_liquidacion(contrato)[2])
+    rng = np.random.default_rng(semilla)
+    primero = df_paystubs['Period_Start_Date'].min() - timedelta(days=20)
+    ultimo = df_paystubs['Period_End_Date'].max() + timedelta(days=20)
+    for _ in range(cantidad):
+        inicio = primero + timedelta(days=int(rng.integers(0, (ultimo - primero).days)))
+        # Incluye ventanas vacías (fin antes del inicio) y de un solo día
+        periodos.append((inicio, inicio + timedelta(days=int(rng.integers(-2, 400)))))
+    return periodos
+
+
+@pytest.mark.parametrize("datos", ['df_real', 'df_sintetico'])
+def test_ventanas_igual_al_bucle_original(datos, request):
+    df_paystubs = request.getfixturevalue(datos)
+    periodos = _periodos(df_paystubs, 40, semilla=1)
+    esperado = [get_proportional_earnings_for_period(df_paystubs, inicio, fin) for inicio, fin in periodos]
+    assert get_proportional_earnings_for_periods(df_paystubs, periodos) == esperado
+
+
+@pytest.mark.parametrize("datos", ['df_real', 'df_sintetico', 'df_irregular'])
+def test_indice_exacto_al_centavo(datos, request):
+    df_paystubs = request.getfixturevalue(datos)
+    desprendibles = Desprendibles.desde_dataframe(df_paystubs)
+    indice = IndiceDiario(*desprendibles)
+    periodos = _periodos(df_paystubs, 60, semilla=2)
+    inicios = a_numero_de_dia([inicio for inicio, _ in periodos])
+    fines = a_numero_de_dia([fin for _, fin in periodos])
+    totales = indice.totales_centavos(inicios, fines)
+
+    filas = list(zip(*(columna.tolist() for columna in desprendibles)))
+    for i, (inicio, fin) in enumerate(zip(inicios.tolist(), fines.tolist())):
+        exactos = ganancias_periodo_fila_a_fila(filas, inicio, fin)
+        # Un solo redondeo al centavo, mitad al par, desde el valor exacto
+        assert [round(total * CENTAVOS_POR_PESO) for total in exactos] == \
+            [int(totales[columna][i]) for columna in ('base', 'extras', 'aux')]
+        assert totales['dias'][i] == max(fin - inicio + 1, 0)
+
+
+def test_indice_compatible_con_ventanas(df_real):
+    periodos = _periodos(df_real, 20, semilla=3)
+    indice = IndiceDiario.desde_paystubs(df_real)
+    esperado = get_proportional_earnings_for_periods(df_real, periodos)
+    for obtenido, original in zip(indice.get_proportional_earnings_for_periods(periodos), esperado):
+        assert obtenido["worked_days_in_period"] == original["worked_days_in_period"]
+        for clave in ("avg_monthly_salary_for_formula", "avg_monthly_aux_for_formula",
+                      "avg_monthly_base_salary_only_for_formula"):
+            assert obtenido[clave] == pytest.approx(original[clave], rel=1e-12, abs=1e-6)